@@ -11,9 +11,17 @@ However, it is often more convenient to use the `geometry` module of generativep
 of most of the primitive drawing functions.
 """
 
+import collections
+import multiprocessing
+import struct
+import zlib
 import cairo
 import generativepy.utils
 import numpy as np
+from generativepy.geometry import _tracked_states
+
+TILE_HEIGHT = 512  # Default height of each tile, in pixels, for make_tiled_image
+PNG_COMPRESSION = 6  # zlib compression level for make_tiled_image
 
 
 def setup(ctx, pixel_width, pixel_height, width=None, height=None, startx=0, starty=0, background=None, flip=False):
@@ -55,6 +63,10 @@ def setup(ctx, pixel_width, pixel_height, width=None, height=None, startx=0, sta
     if background:
         ctx.set_source_rgba(*background)
         ctx.paint()
+        # The source has been set directly, so any state tracking on the context no longer knows the source
+        tracking = _tracked_states.get(id(ctx))
+        if tracking is not None:
+            tracking.values.pop('source', None)
 
 
 
@@ -65,6 +77,8 @@ def make_image(outfile, draw, width, height, channels=3):
 
     The draw function must have the signature described for `example_draw_function`.
 
+    For very large images, use `make_tiled_image` instead.
+
     Args:
         outfile: str - The path and filename for the output PNG file. The '.png' extension is optional, it will be added
                     if it isn't present.
@@ -82,7 +96,223 @@ def make_image(outfile, draw, width, height, channels=3):
     surface.write_to_png(outfile + '.png')
 
 
-def make_images(outfile, draw, width, height, count, channels=3):
+def _unpremultiply(a):
+    """
+    Convert an RGBA array from Pycairo premultiplied alpha to straight alpha, in place.
+    """
+    alpha = a[:, :, 3:4].astype(np.uint32)
+    colors = a[:, :, :3].astype(np.uint32)
+    np.floor_divide(colors * 255 + alpha // 2, alpha, out=colors, where=alpha > 0)
+    a[:, :, :3] = np.minimum(colors, 255)
+    return a
+
+
+def _compress_rows(rows):
+    """
+    Compress image rows as part of the PNG image data stream. Each tile is compressed separately, so that tiles can be
+    compressed in parallel, then joined by `_PngWriter`.
+
+    Args:
+        rows: (height, width, channels) uint8 NumPy array - the pixel data.
+
+    Returns:
+        Tuple of (compressed data, adler32 checksum, uncompressed length)
+    """
+    height = rows.shape[0]
+    data = np.empty((height, rows.shape[1]*rows.shape[2] + 1), dtype=np.uint8)
+    data[:, 0] = 0  # No filter
+    data[:, 1:] = rows.reshape(height, -1)
+    data = data.tobytes()
+    compressor = zlib.compressobj(PNG_COMPRESSION, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH), zlib.adler32(data), len(data)
+
+
+def _adler32_combine(adler1, adler2, length2):
+    """
+    Combine the adler32 checksums of two blocks of data, given the length of the second block.
+    """
+    base = 65521
+    remainder = length2 % base
+    sum1 = adler1 & 0xffff
+    sum2 = (remainder * sum1) % base
+    sum1 = (sum1 + (adler2 & 0xffff) + base - 1) % base
+    sum2 = (sum2 + ((adler1 >> 16) & 0xffff) + ((adler2 >> 16) & 0xffff) + base - remainder) % base
+    return (sum2 << 16) | sum1
+
+
+class _PngWriter:
+    """
+    Writes a PNG file one tile at a time, so the whole image is never held in memory. Tiles must be written in order,
+    from the top of the image, as compressed by `_compress_rows`.
+    """
+
+    def __init__(self, file, width, height, channels):
+        self.file = file
+        self.adler = 1
+        self.file.write(b'\x89PNG\r\n\x1a\n')
+        color_type = 6 if channels == 4 else 2
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0))
+        self._chunk(b'IDAT', b'\x78\x9c')  # zlib header
+
+    def _chunk(self, chunk_type, data):
+        self.file.write(struct.pack('>I', len(data)))
+        self.file.write(chunk_type)
+        self.file.write(data)
+        self.file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(chunk_type))))
+
+    def write(self, tile):
+        compressed, adler, length = tile
+        self._chunk(b'IDAT', compressed)
+        self.adler = _adler32_combine(self.adler, adler, length)
+
+    def close(self):
+        end = zlib.compressobj(PNG_COMPRESSION, zlib.DEFLATED, -15).flush()  # Final empty deflate block
+        self._chunk(b'IDAT', end + struct.pack('>I', self.adler))
+        self._chunk(b'IEND', b'')
+
+
+def _render_tile(draw, width, height, channels, y, tile_height):
+    """
+    Draw one horizontal tile of a tiled image, and compress it. This runs in a worker process for
+    `make_tiled_image`.
+    """
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32 if channels == 4 else cairo.FORMAT_RGB24, width, tile_height)
+    ctx = cairo.Context(surface)
+    ctx.translate(0, -y)
+    ctx.rectangle(0, y, width, tile_height)
+    ctx.clip()
+    draw(ctx, width, height, 0, 1)
+    surface.flush()
+    a = np.ndarray(shape=(tile_height, width, 4), dtype=np.uint8, buffer=surface.get_data(),
+                   strides=(surface.get_stride(), 4, 1)).copy()
+    if channels == 4:
+        a = _unpremultiply(generativepy.utils.correct_pycairo_byte_order(a, 4))
+    else:
+        a = generativepy.utils.correct_pycairo_byte_order(a, 3)[:, :, :3]
+    return _compress_rows(a)
+
+
+def make_tiled_image(outfile, draw, width, height, channels=3, tile_height=TILE_HEIGHT, processes=None):
+    """
+    Creates a PNG image in the same way as `make_image`, but draws it one tile at a time. This can be used to create
+    very large images, for example prints that are tens of thousands of pixels wide, which would need too much memory,
+    or exceed the Pycairo surface size limits, if they were drawn in one piece.
+
+    The image is divided into horizontal tiles of `tile_height` pixels. The `draw` function is called once for each
+    tile, with a context that is translated and clipped so that the drawing code is exactly the same as for
+    `make_image`. The `pixel_width` and `pixel_height` passed to `draw` are the `width` and `height` of the whole
+    image. The tiles are
+    drawn in parallel worker processes, and each tile is written to the PNG file as soon as it is ready, so the
+    whole image is never held in memory.
+
+    Since `draw` is called in worker processes, it must be a function defined at the top level of a module, so that it
+    can be passed to the workers. The draw function must have the signature described for `example_draw_function`.
+
+    Args:
+        outfile: str - The path and filename for the output PNG file. The '.png' extension is optional, it will be added
+                    if it isn't present.
+        draw: function - A drawing function object, see below.
+        width: int - The width of the image that will be created, in pixels.
+        height: int - The height of the image that will be created, in pixels.
+        channels: int - The number of colour channels. 3 for RGB, 4 for RGBA.
+        tile_height: int - The height of each tile, in pixels.
+        processes: int - The number of worker processes. None to use one process per CPU, 1 to draw every tile
+                    in the current process.
+    """
+    if not outfile.lower().endswith('.png'):
+        outfile = outfile + '.png'
+    tiles = [(draw, width, height, channels, y, min(tile_height, height - y)) for y in range(0, height, tile_height)]
+    with open(outfile, 'wb') as f:
+        writer = _PngWriter(f, width, height, channels)
+        if processes == 1:
+            for tile in tiles:
+                writer.write(_render_tile(*tile))
+        else:
+            with multiprocessing.Pool(processes) as pool:
+                # Limit the number of tiles in progress, so that finished tiles don't build up in memory
+                window = 2*(processes or multiprocessing.cpu_count())
+                pending = collections.deque()
+                for tile in tiles:
+                    pending.append(pool.apply_async(_render_tile, tile))
+                    if len(pending) >= window:
+                        writer.write(pending.popleft().get())
+                while pending:
+                    writer.write(pending.popleft().get())
+        writer.close()
+
+
+def record(draw, width, height):
+    """
+    Records the drawing operations of a `draw` function, so that they can be replayed later onto any context using
+    `replay`. This is useful for parts of an image that are expensive to calculate but don't change, for example a
+    static background in an animation. The geometry is calculated once, when the drawing is recorded.
+
+    The draw function is called once, on a Pycairo `RecordingSurface` context of the given size, with `frame_no` 0
+    and `frame_count` 1. The draw function must have the signature described for `example_draw_function`.
+
+    Args:
+        draw: function - A drawing function object, see below.
+        width: int - The width of the recording, in pixels.
+        height: int - The height of the recording, in pixels.
+
+    Returns:
+        Pycairo RecordingSurface holding the drawing operations.
+    """
+    surface = cairo.RecordingSurface(cairo.CONTENT_COLOR_ALPHA, cairo.Rectangle(0, 0, width, height))
+    ctx = cairo.Context(surface)
+    draw(ctx, width, height, 0, 1)
+    return surface
+
+
+def replay(ctx, recording, matrix=None):
+    """
+    Replays a recording created by `record` onto a context. Pixel coordinates of the recording are mapped to the current
+    user space of the context, so a recording can be replayed at a different position, scale or rotation by
+    replaying it inside a `geometry.Transform` block, or by passing a `matrix`.
+
+    The recording is replayed as vector drawing operations, so it remains sharp if it is scaled up.
+
+    Args:
+        ctx: Pycairo context - The context to draw on.
+        recording: Pycairo RecordingSurface - The recording to replay.
+        matrix: `generativepy.math.Matrix` - Optional transform applied to the recording.
+    """
+    ctx.save()
+    if matrix is not None:
+        ctx.transform(matrix.to_cairo())
+    ctx.set_source_surface(recording, 0, 0)
+    ctx.paint()
+    ctx.restore()
+
+
+def _make_background(background_draw, fmt, width, height):
+    """
+    Draws the static background used by `make_images` and `make_image_frames`.
+
+    Returns:
+        Pycairo ImageSurface, or None if there is no background draw function.
+    """
+    if background_draw is None:
+        return None
+    surface = cairo.ImageSurface(fmt, width, height)
+    ctx = cairo.Context(surface)
+    background_draw(ctx, width, height, 0, 1)
+    return surface
+
+
+def _create_frame_context(surface, background):
+    """
+    Creates a context for a frame, copying the static background onto the frame surface if there is one.
+    """
+    ctx = cairo.Context(surface)
+    if background is not None:
+        ctx.set_source_surface(background, 0, 0)
+        ctx.paint()
+        ctx.new_path()
+    return ctx
+
+
+def make_images(outfile, draw, width, height, count, channels=3, background_draw=None):
     """
     Used to create a sequence of PNG images. These can be combined into an animated GIF or video. This is similar to
     `make_image` except it creates `count` files instead of just one.
@@ -104,18 +334,21 @@ def make_images(outfile, draw, width, height, count, channels=3):
         pixel_height: int - The height of the image that will be created, in pixels.
         count: int - the number of images to create
         channels: int - The number of colour channels. 1 for greyscale, 3 for RGB, 4 for RGBA.
+        background_draw: function - Optional drawing function for the parts of the image that are the same on every
+                    frame. It is drawn once, and copied onto each frame before `draw` is called.
     """
     if outfile.lower().endswith('.png'):
         outfile = outfile[:-4]
+    fmt = cairo.FORMAT_ARGB32 if channels==4 else cairo.FORMAT_RGB24
+    background = _make_background(background_draw, fmt, width, height)
     for i in range(count):
-        fmt = cairo.FORMAT_ARGB32 if channels==4 else cairo.FORMAT_RGB24
         surface = cairo.ImageSurface(fmt, width, height)
-        ctx = cairo.Context(surface)
+        ctx = _create_frame_context(surface, background)
         draw(ctx, width, height, i, count)
         surface.write_to_png(outfile + str(i).zfill(8) + '.png')
 
 
-def make_image_frames(draw, width, height, count, channels=3):
+def make_image_frames(draw, width, height, count, channels=3, background_draw=None):
     """
     Used to create a single image as a frame. A frame is a NumPy array with shape (pixel_height, pixel_width, channels).
 
@@ -132,14 +365,17 @@ def make_image_frames(draw, width, height, count, channels=3):
         pixel_width: int - The width of the image that will be created, in pixels.
         pixel_height: int - The height of the image that will be created, in pixels.
         channels: int - The number of colour channels. 1 for greyscale, 3 for RGB, 4 for RGBA.
+        background_draw: function - Optional drawing function for the parts of the image that are the same on every
+                    frame. It is drawn once, before the first frame, and copied onto each frame before `draw` is called.
 
     Yields:
         A frame.
     """
     fmt = cairo.FORMAT_ARGB32 if channels==4 else cairo.FORMAT_RGB24
+    background = _make_background(background_draw, fmt, width, height)
     for i in range(count):
         surface = cairo.ImageSurface(fmt, width, height)
-        ctx = cairo.Context(surface)
+        ctx = _create_frame_context(surface, background)
         draw(ctx, width, height, i, count)
         buf = surface.get_data()
         a = np.frombuffer(buf, np.uint8)
@@ -9,18 +9,23 @@ The geometry module provides classes for drawing shapes. There are several class
 be filled, stroked, or both, using any `Pattern`. It is possible to create compound shapes, for example shapes with holes
 in them. Shapes can also be used to set clipping regions, and a shape can be stored as a path object that can be
 reused.
-* `Pattern` is an abstract base class for classes that provide area fills. Currently only the `LinearGradient` pattern is
-supported.
+* `Pattern` is an abstract base class for classes that provide area fills. The `LinearGradient`, `RadialGradient` and
+`MeshGradient` patterns are supported.
 * `Image` provides a simple way to render an image from a PNG file.
 * `Transform` allows user space to be transformed, to implement translation, scaling, rotation, mirroring, shearing, and
 general affine transformations.
 * `Turtle` provides a simple implementation of turtle graphics.
 """
+import copy
 import itertools
+import os
+from collections import OrderedDict
 import cairo
 import math
+import numpy as np
 from dataclasses import dataclass
-from generativepy.math import Vector as V
+from generativepy.math import (Vector as V, Matrix, Points, VectorArray, simplify_polyline,
+                               decimate_polyline_columns, regular_polygons, hex_grid, _to_array)
 from generativepy.color import Color
 
 # Text align
@@ -57,6 +62,12 @@ SEGMENT = 0
 RAY = 1
 LINE = 2
 
+## Polyline decimation
+
+DECIMATE_NONE = 0     # Draw every point
+DECIMATE_SIMPLIFY = 1 # Ramer–Douglas–Peucker simplification, for general curves
+DECIMATE_COLUMNS = 2  # Min/max per pixel column, for time series
+
 ## Font styles
 
 FONT_WEIGHT_NORMAL = 0
@@ -66,37 +77,308 @@ FONT_SLANT_NORMAL = 0
 FONT_SLANT_ITALIC = 1
 FONT_SLANT_OBLIQUE = 2
 
+## Text caching
+
+TEXT_EXTENTS_CACHE_SIZE = 4096  # Maximum number of text extents held in the text extents cache
+
+# Pycairo font face objects, keyed on (font, slant, weight)
+_font_faces = {}
+
+TEXT_PATH_CACHE_CHARS = 65536  # Maximum total length of the strings held in the text path cache
+
+# Text extents, keyed on (font, weight, slant, size, text, ctx matrix)
+_text_extents_cache = OrderedDict()
+
+# Text outline paths relative to the text origin, keyed on (font, weight, slant, size, text, flip, ctx linear matrix)
+_text_path_cache = OrderedDict()
+_text_path_cache_chars = 0
+
+# Context used to create text paths for the text path cache
+_text_path_ctx = None
+
+
+## Context state tracking
+
+# Tracked state values for contexts inside a StateTracking block, keyed on id(ctx)
+_tracked_states = {}
+
+
+class StateTracking():
+    """
+    The StateTracking class records the drawing state (colour, line style and font) that has been set on a context by
+    `FillParameters`, `StrokeParameters` and `FontParameters`, and skips any Pycairo calls that would set a value that
+    is already in force. This speeds up drawing large numbers of shapes that use the same style.
+
+    The StateTracking object is a context manager, intended to be used in a `with` block. Tracking applies to anything
+    drawn on the context within the block:
+
+    ```
+    with StateTracking(ctx):
+        for p in points:
+            Circle(ctx).of_center_radius(p, 2).fill(Color('red'))
+    ```
+
+    `Transform` blocks, and nested `StateTracking` blocks on the same context, inside the tracking block are handled
+    correctly. If you change the colour, line style or
+    font of the context by calling Pycairo functions directly (including `save` and `restore`) within the block, call
+    `invalidate` afterwards so that the next style is applied in full.
+
+    Gradient patterns are always applied, because a pattern is fixed to user space at the time it is set.
+    """
+
+    def __init__(self, ctx):
+        """
+        Args:
+
+        * ctx: Pycairo drawing context - The context to track.
+
+        Returns:
+            self
+        """
+        self.ctx = ctx
+        self.values = {}
+        self.stack = []
+        self.previous = None
+
+    def __enter__(self):
+        self.previous = _tracked_states.get(id(self.ctx))
+        _tracked_states[id(self.ctx)] = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.previous is None:
+            del _tracked_states[id(self.ctx)]
+        else:
+            # The styles set inside this block are still in force, so the outer block's tracked state is out of date
+            self.previous.invalidate()
+            _tracked_states[id(self.ctx)] = self.previous
+
+    def invalidate(self):
+        """
+        Forget the tracked state, so that the next style applied to the context is set in full.
+
+        Returns:
+            self
+        """
+        self.values.clear()
+        return self
+
+
+def _changed(values, key, value):
+    """
+    Check if a state value differs from the tracked value, and record the new value.
+
+    Args:
+        values: dict - tracked state values, or None if the context isn't tracked.
+        key: str - name of the value.
+        value: the new value.
+
+    Returns:
+        True if the value must be set on the context.
+    """
+    if values is None:
+        return True
+    if key in values and values[key] == value:
+        return False
+    values[key] = value
+    return True
+
+
+def _save_context(ctx):
+    """
+    Save the context state, including any tracked state.
+
+    Args:
+        ctx: Pycairo context - the context.
+    """
+    ctx.save()
+    tracking = _tracked_states.get(id(ctx))
+    if tracking is not None:
+        tracking.stack.append(dict(tracking.values))
+
+
+def _restore_context(ctx):
+    """
+    Restore the context state saved by `_save_context`, including any tracked state.
+
+    Args:
+        ctx: Pycairo context - the context.
+    """
+    ctx.restore()
+    tracking = _tracked_states.get(id(ctx))
+    if tracking is not None:
+        # If the state was saved before tracking started, the restored state is unknown
+        tracking.values = tracking.stack.pop() if tracking.stack else {}
+
+
+def _apply_source(ctx, pattern, values):
+    if isinstance(pattern, Color):
+        if _changed(values, 'source', pattern.color):
+            ctx.set_source_rgba(*pattern)
+    else:
+        if values is not None:
+            values.pop('source', None)
+        ctx.set_source(pattern.get_pattern())
+
+
+PATTERN_CACHE_SIZE = 1024  # Maximum number of Pycairo patterns held in the pattern cache
+
+# Pycairo pattern objects, keyed on the pattern definition
+_pattern_cache = OrderedDict()
+
+
+def clear_pattern_cache():
+    """
+    Discard all the Pycairo patterns held in the pattern cache.
+    """
+    _pattern_cache.clear()
+
 
 class Pattern:
     """
     Base class for all patterns.
 
-    In generativepy, shapes can be filled or stroked (outline) using solid colours or patterns. Currently, the only pattern
-    supported is linear gradient. More patterns will be supported in future versions.
+    In generativepy, shapes can be filled or stroked (outline) using solid colours or patterns. The patterns supported
+    are `LinearGradient`, `RadialGradient` and `MeshGradient`.
 
     Patterns all work in s similar way:
 
     * The pattern is first constructed using the constructor and any required builder methods.
-    * The build method is then called to create the pattern.
+    * The build method is then called to create the pattern. This is optional, the pattern will be built when it is
+      first used.
 
     The object returned by get_pattern can be used in place of a Color object when setting a stroke or fill.
+
+    The generativepy pattern classes are immutable. Each builder method returns a new pattern object, so the
+    builder methods must be chained, or their result assigned. Patterns with the same definition are equal, and can be
+    used as dictionary keys. The Pycairo pattern objects are held in a cache, so identical patterns created on each frame
+    of an animation, or for each of many shapes, share one Pycairo pattern rather than each creating a new one.
     """
 
     def __init__(self):
         self.pattern = None
 
+    def _key(self):
+        """
+        Hashable definition of the pattern. Returns None for patterns that don't support caching, which are compared by
+        identity.
+        """
+        return None
+
+    def _create(self):
+        """
+        Create the Pycairo pattern object.
+        """
+        raise NotImplementedError()
+
+    def _replace(self, **changes):
+        pattern = copy.copy(self)
+        pattern.__dict__.update(changes)
+        pattern.pattern = None
+        return pattern
+
+    def __eq__(self, other):
+        key = self._key()
+        if key is None or not isinstance(other, Pattern):
+            return self is other
+        return key == other._key()
+
+    def __hash__(self):
+        key = self._key()
+        return id(self) if key is None else hash(key)
 
-    def get_pattern(self):
+    def build(self):
+        """
+        Build the pattern. This creates the Pycairo Pattern object that will be returned by get_pattern, or fetches it
+        from the pattern cache.
+
+        Returns:
+            self
+        """
+        key = self._key()
+        pattern = _pattern_cache.get(key)
+        if pattern is None:
+            pattern = self._create()
+            _pattern_cache[key] = pattern
+            if len(_pattern_cache) > PATTERN_CACHE_SIZE:
+                _pattern_cache.popitem(last=False)
+        else:
+            _pattern_cache.move_to_end(key)
+        self.pattern = pattern
+        return self
+
+    def get_pattern(self, mutable=False):
         """
         Get the Pycairo pattern object associated with this Pattern
 
+        The Pycairo pattern is held in the pattern cache and shared by every equal Pattern, so it must not be modified
+        (for example by calling `set_matrix`, `set_extend` or `add_color_stop_rgba` on it), otherwise the change will
+        affect every equal gradient. Pass `mutable=True` to get a new Pycairo pattern, which is not cached and can be
+        modified freely.
+
+        Args:
+            mutable: bool - True to return a new Pycairo pattern that can be modified.
+
         Returns:
             Pycairo pattern object
         """
+        if mutable:
+            return self._create()
+        if self.pattern is None and self._key() is not None:
+            self.build()
         return self.pattern
 
 
-class LinearGradient(Pattern):
+def _color_key(color):
+    return tuple(color.color)
+
+
+class _Gradient(Pattern):
+    """
+    Base class for gradient patterns, which have a set of colour stops.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.stops = ()
+
+    def with_start_end(self, color1, color2):
+        """
+        Set up a simple gradient, with a start color at position 0 and an end color at position 1.
+        This is equivalent to calling with_stops with ((0, color1), (1, color2)
+
+        Args:
+            color1: `Color` - The start colour (ie the colour at the start point).
+            color2: `Color` - The end colour (ie the colour at the end point).
+
+        Returns:
+            New pattern object
+        """
+        return self._replace(stops=((0, color1), (1, color2)))
+
+    def with_stops(self, stops):
+        """
+        Set the gradient stops. There should be 2 or more stops in the sequence.
+
+        Args:
+            stops: tuple of numbers - Each stop tuple (position, color) where `position` is a number indicating the position of the stop between
+                    the start and end points, and `color`is the `Color` of the stop.
+
+        Returns:
+            New pattern object
+        """
+        return self._replace(stops=tuple((pos, color) for pos, color in stops))
+
+    def _stops_key(self):
+        return tuple((pos, _color_key(color)) for pos, color in self.stops)
+
+    def _add_stops(self, pattern):
+        for position, color in self.stops:
+            pattern.add_color_stop_rgba(position, color.r, color.g, color.b, color.a)
+        return pattern
+
+
+class LinearGradient(_Gradient):
     """
     Defines a linear gradient `pattern`
     """
@@ -105,7 +387,6 @@ class LinearGradient(Pattern):
         super().__init__()
         self.start = (0, 0)
         self.end = (0, 0)
-        self.stops = []
 
     def of_points(self, start, end):
         """
@@ -116,53 +397,110 @@ class LinearGradient(Pattern):
             end: Sequence of 2 numbers - The end point, (x, y)
 
         Returns:
-            self
+            New pattern object
         """
-        self.start = start
-        self.end = end
-        return self
+        return self._replace(start=tuple(start), end=tuple(end))
 
-    def with_start_end(self, color1, color2):
+    def _key(self):
+        return 'linear', self.start, self.end, self._stops_key()
+
+    def _create(self):
+        return self._add_stops(cairo.LinearGradient(self.start[0], self.start[1], self.end[0], self.end[1]))
+
+
+class RadialGradient(_Gradient):
+    """
+    Defines a radial gradient `pattern`. The gradient blends between two circles. Stop position 0 is the start circle,
+    and stop position 1 is the end circle.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.start_center = (0, 0)
+        self.start_radius = 0
+        self.end_center = (0, 0)
+        self.end_radius = 0
+
+    def of_circles(self, start_center, start_radius, end_center, end_radius):
         """
-        Set up a simple linear gradient, with a start color at position 0 and an end color at position 1.
-        This is equivalent to calling with_stops with ((0, color1), (1, color2)
+        Set the start and end circles of the gradient.
 
         Args:
-            color1: `Color` - The start colour (ie the colour at the start point).
-            color2: `Color` - The end colour (ie the colour at the end point).
+            start_center: Sequence of 2 numbers - The centre of the start circle, (x, y)
+            start_radius: number - The radius of the start circle
+            end_center: Sequence of 2 numbers - The centre of the end circle, (x, y)
+            end_radius: number - The radius of the end circle
 
         Returns:
-            self
+            New pattern object
         """
-        self.stops = [(0, color1), (1, color2)]
-        return self
+        return self._replace(start_center=tuple(start_center), start_radius=start_radius,
+                             end_center=tuple(end_center), end_radius=end_radius)
 
-    def with_stops(self, stops):
+    def of_center_radius(self, center, radius):
         """
-        Set the gradient stops. There should be 2 or more stops in the sequence.
+        Set up a simple radial gradient, which blends from the centre point to a circle of the given radius.
+        This is equivalent to calling of_circles with (center, 0, center, radius)
 
         Args:
-            stops: tuple of numbers - Each stop tuple (position, color) where `position` is a number indicating the position of the stop between
-                    the start and end points, and `color`is the `Color` of the stop.
+            center: Sequence of 2 numbers - The centre, (x, y)
+            radius: number - The radius
 
         Returns:
-            self
+            New pattern object
         """
-        self.stops = [(pos, color) for pos, color in stops]
-        return self
+        return self.of_circles(center, 0, center, radius)
 
-    def build(self):
+    def _key(self):
+        return ('radial', self.start_center, self.start_radius, self.end_center, self.end_radius,
+                self._stops_key())
+
+    def _create(self):
+        return self._add_stops(cairo.RadialGradient(self.start_center[0], self.start_center[1], self.start_radius,
+                                                    self.end_center[0], self.end_center[1], self.end_radius))
+
+
+class MeshGradient(Pattern):
+    """
+    Defines a mesh gradient `pattern`. The mesh is made of patches. Each patch is a triangle or quadrilateral with
+    a colour at each corner, and the colour is blended smoothly across the patch. Areas outside all the patches are
+    transparent.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.patches = ()
+
+    def with_patch(self, points, colors):
         """
-        Build the pattern. This must be called after all the stops have been added. It creates the Pycairo
-        Pattern object that will be returned by get_pattern
+        Add a patch to the mesh.
+
+        Args:
+            points: Sequence of 3 or 4 points - The corners of the patch, each (x, y)
+            colors: Sequence of 3 or 4 `Color` objects - The colour at each corner
 
         Returns:
-            self
+            New pattern object
         """
-        self.pattern = cairo.LinearGradient(self.start[0], self.start[1], self.end[0], self.end[1])
-        for position, color in self.stops:
-            self.pattern.add_color_stop_rgba(position, color.r, color.g, color.b, color.a)
-        return self
+        if len(points) not in (3, 4) or len(colors) != len(points):
+            raise ValueError("A mesh patch requires 3 or 4 points, and one color for each point")
+        patch = tuple(tuple(p) for p in points), tuple(colors)
+        return self._replace(patches=self.patches + (patch,))
+
+    def _key(self):
+        return 'mesh', tuple((points, tuple(_color_key(c) for c in colors)) for points, colors in self.patches)
+
+    def _create(self):
+        pattern = cairo.MeshPattern()
+        for points, colors in self.patches:
+            pattern.begin_patch()
+            pattern.move_to(*points[0])
+            for p in points[1:]:
+                pattern.line_to(*p)
+            for i, color in enumerate(colors):
+                pattern.set_corner_color_rgba(i, color.r, color.g, color.b, color.a)
+            pattern.end_patch()
+        return pattern
 
 
 @dataclass
@@ -198,15 +536,15 @@ class FillParameters:
         Args:
             ctx: The context to apply the settings to.
         """
-        if isinstance(self.pattern, Color):
-            ctx.set_source_rgba(*self.pattern)
-        else:
-            ctx.set_source(self.pattern.get_pattern())
+        tracking = _tracked_states.get(id(ctx))
+        values = tracking.values if tracking is not None else None
+        _apply_source(ctx, self.pattern, values)
 
-        if self.fill_rule == WINDING:
-            ctx.set_fill_rule(cairo.FillRule.WINDING)
-        else:
-            ctx.set_fill_rule(cairo.FillRule.EVEN_ODD)
+        if _changed(values, 'fill_rule', self.fill_rule):
+            if self.fill_rule == WINDING:
+                ctx.set_fill_rule(cairo.FillRule.WINDING)
+            else:
+                ctx.set_fill_rule(cairo.FillRule.EVEN_ODD)
 
 
 @dataclass
@@ -271,30 +609,34 @@ class StrokeParameters:
         Args:
             ctx: The context to apply the settings to.
         """
-        if isinstance(self.pattern, Color):
-            ctx.set_source_rgba(*self.pattern)
-        else:
-            ctx.set_source(self.pattern.get_pattern())
+        tracking = _tracked_states.get(id(ctx))
+        values = tracking.values if tracking is not None else None
+        _apply_source(ctx, self.pattern, values)
 
-        ctx.set_line_width(self.line_width)
+        if _changed(values, 'line_width', self.line_width):
+            ctx.set_line_width(self.line_width)
 
-        ctx.set_dash(self.dash)
+        if _changed(values, 'dash', tuple(self.dash)):
+            ctx.set_dash(self.dash)
 
-        if self.cap == ROUND:
-            ctx.set_line_cap(cairo.LineCap.ROUND)
-        elif self.cap == BUTT:
-            ctx.set_line_cap(cairo.LineCap.BUTT)
-        else:
-            ctx.set_line_cap(cairo.LineCap.SQUARE)
+        if _changed(values, 'cap', self.cap):
+            if self.cap == ROUND:
+                ctx.set_line_cap(cairo.LineCap.ROUND)
+            elif self.cap == BUTT:
+                ctx.set_line_cap(cairo.LineCap.BUTT)
+            else:
+                ctx.set_line_cap(cairo.LineCap.SQUARE)
 
-        if self.join == ROUND:
-            ctx.set_line_join(cairo.LineJoin.ROUND)
-        elif self.join == BEVEL:
-            ctx.set_line_join(cairo.LineJoin.BEVEL)
-        else:
-            ctx.set_line_join(cairo.LineJoin.MITER)
+        if _changed(values, 'join', self.join):
+            if self.join == ROUND:
+                ctx.set_line_join(cairo.LineJoin.ROUND)
+            elif self.join == BEVEL:
+                ctx.set_line_join(cairo.LineJoin.BEVEL)
+            else:
+                ctx.set_line_join(cairo.LineJoin.MITER)
 
-        ctx.set_miter_limit(self.miter_limit)
+        if _changed(values, 'miter_limit', self.miter_limit):
+            ctx.set_miter_limit(self.miter_limit)
 
 
 @dataclass
@@ -334,8 +676,301 @@ class FontParameters:
         elif self.slant == FONT_SLANT_OBLIQUE:
             c_slant = cairo.FONT_SLANT_OBLIQUE
 
-        ctx.select_font_face(self.font, c_slant, c_weight)
-        ctx.set_font_size(self.size)
+        tracking = _tracked_states.get(id(ctx))
+        values = tracking.values if tracking is not None else None
+
+        key = (self.font, c_slant, c_weight)
+        if _changed(values, 'font_face', key):
+            face = _font_faces.get(key)
+            if face is None:
+                face = cairo.ToyFontFace(self.font, c_slant, c_weight)
+                _font_faces[key] = face
+            ctx.set_font_face(face)
+        if _changed(values, 'font_size', self.size):
+            ctx.set_font_size(self.size)
+
+
+def _font_options(ctx):
+    """
+    Get the font options that apply to text drawn on a context. These are the context's own font options merged over
+    the default options of its target surface, so for example they differ between image and SVG surfaces. The options
+    control hinting, so they affect text extents and outlines.
+
+    Args:
+        ctx: Pycairo context - the context.
+
+    Returns:
+        Tuple of (Pycairo FontOptions, hashable key for the options)
+    """
+    options = ctx.get_target().get_font_options()
+    options.merge(ctx.get_font_options())
+    key = (options.get_antialias(), options.get_hint_metrics(), options.get_hint_style(),
+           options.get_subpixel_order(), options.get_variations())
+    return options, key
+
+
+def _text_extents(ctx, params, text, apply=True):
+    """
+    Get the extents of a string of text, using the text extents cache. The result depends on the current transform
+    and font options of the context as well as the font, because cairo adjusts the font metrics to fit the device
+    pixel grid.
+
+    Args:
+        ctx: Pycairo context - the context.
+        params: `FontParameters` - the font to use.
+        text: str - the text.
+        apply: bool - if True the font is applied to the context before measuring the text, so the font is left
+               selected in the context even if the extents are cached. If False the font must already have been
+               applied.
+
+    Returns:
+        Pycairo text extents, (x_bearing, y_bearing, width, height, x_advance, y_advance)
+    """
+    if apply:
+        params.apply(ctx)
+    key = (params.font, params.weight, params.slant, params.size, text, tuple(ctx.get_matrix()),
+           _font_options(ctx)[1])
+    extents = _text_extents_cache.get(key)
+    if extents is None:
+        extents = ctx.text_extents(text)
+        _text_extents_cache[key] = extents
+        if len(_text_extents_cache) > TEXT_EXTENTS_CACHE_SIZE:
+            _text_extents_cache.popitem(last=False)
+    else:
+        _text_extents_cache.move_to_end(key)
+    return extents
+
+
+def _text_path(ctx, params, text, flip):
+    """
+    Get the outline path of a string of text, with its origin at (0, 0), using the text path cache. The path only
+    depends on the scale, rotation and shear of the context transform and the font options of the context, so it can
+    be reused at any position by appending it to the context under a translation.
+
+    The cache holds paths for strings up to a total length of `TEXT_PATH_CACHE_CHARS` characters. The least
+    recently used paths are discarded first.
+
+    Args:
+        ctx: Pycairo context - the context the path will be drawn on.
+        params: `FontParameters` - the font to use.
+        text: str - the text.
+        flip: bool - True if the text is flipped vertically.
+
+    Returns:
+        Pycairo path object
+    """
+    global _text_path_ctx, _text_path_cache_chars
+
+    xx, yx, xy, yy, _, _ = ctx.get_matrix()
+    options, options_key = _font_options(ctx)
+    key = (params.font, params.weight, params.slant, params.size, text, flip, (xx, yx, xy, yy), options_key)
+    path = _text_path_cache.get(key)
+    if path is not None:
+        _text_path_cache.move_to_end(key)
+        return path
+
+    if _text_path_ctx is None:
+        _text_path_ctx = cairo.Context(cairo.ImageSurface(cairo.FORMAT_A8, 1, 1))
+    _text_path_ctx.set_matrix(cairo.Matrix(xx, yx, xy, yy, 0, 0))
+    _text_path_ctx.set_font_options(options)
+    _text_path_ctx.new_path()
+    params.apply(_text_path_ctx)
+    _text_path_ctx.move_to(0, 0)
+    if flip:
+        _text_path_ctx.save()
+        _text_path_ctx.scale(1, -1)
+        _text_path_ctx.text_path(text)
+        _text_path_ctx.restore()
+    else:
+        _text_path_ctx.text_path(text)
+    path = _text_path_ctx.copy_path()
+    _text_path_ctx.new_path()
+
+    if len(text) <= TEXT_PATH_CACHE_CHARS:
+        _text_path_cache[key] = path
+        _text_path_cache_chars += len(text)
+        while _text_path_cache_chars > TEXT_PATH_CACHE_CHARS:
+            old_key, _ = _text_path_cache.popitem(last=False)
+            _text_path_cache_chars -= len(old_key[4])
+    return path
+
+
+def clear_text_caches():
+    """
+    Discard all the cached text extents, text paths and font faces.
+    """
+    global _text_path_cache_chars
+    _text_extents_cache.clear()
+    _text_path_cache.clear()
+    _text_path_cache_chars = 0
+    _font_faces.clear()
+
+
+def _decimate(ctx, points, mode, tolerance):
+    """
+    Decimate an (N, 2) array of user space points, based on their positions in device space. Used internally by
+    shapes that support the `decimate` method.
+
+    Args:
+        ctx: Pycairo context - the context, used to get the current user to device transform.
+        points: (N, 2) array - the points.
+        mode: `DECIMATE_SIMPLIFY` or `DECIMATE_COLUMNS`.
+        tolerance: number - maximum error in device pixels for `DECIMATE_SIMPLIFY`, column width in device pixels
+                   for `DECIMATE_COLUMNS`.
+
+    Returns:
+        New (N, 2) array containing a subset of the points.
+    """
+    device_points = Matrix.of_cairo(ctx.get_matrix()).apply(points)
+    if mode == DECIMATE_COLUMNS:
+        return points[decimate_polyline_columns(device_points, tolerance)]
+    return points[simplify_polyline(device_points, tolerance)]
+
+
+# Number of points used by each path element type
+_PATH_ELEMENT_POINTS = {cairo.PATH_MOVE_TO: 1, cairo.PATH_LINE_TO: 1, cairo.PATH_CURVE_TO: 3, cairo.PATH_CLOSE_PATH: 0}
+
+# Context used to create context independent shape paths
+_shape_path_ctx = None
+
+
+def _add_polyline(ctx, points, move=True):
+    """
+    Add straight line segments joining an (N, 2) array of points to the current path. Used internally by shapes
+    that have straight sides.
+
+    Args:
+        ctx: Pycairo context - the context.
+        points: (N, 2) array - the points.
+        move: bool - If true, move to the first point. Otherwise, draw a line to the first point, extending the
+              current path.
+    """
+    points = points.tolist()
+    if not points:
+        return
+    line_to = ctx.line_to
+    if move:
+        ctx.move_to(*points[0])
+    else:
+        line_to(*points[0])
+    for x, y in points[1:]:
+        line_to(x, y)
+
+
+class PathData():
+    """
+    An immutable path that is independent of any context. A `PathData` object is created by calling the `path_data`
+    method of any shape, or from a Pycairo path using `of_cairo_path`.
+
+    The path is stored as an array of element types (the Pycairo `PATH_MOVE_TO`, `PATH_LINE_TO`, `PATH_CURVE_TO` and
+    `PATH_CLOSE_PATH` values) and an (N, 2) array of points, in the user space of the shape. Move and line elements
+    use one point, curve elements use three points, and close elements use no points.
+
+    A `PathData` object can be drawn on any context, with an optional transform, using a `Path` shape or the `replay`
+    method. It can be reused across frames, and it can be pickled, so geometry can be calculated once and passed to
+    worker processes.
+
+    Iterating over a `PathData` object yields `(type, points)` tuples in the same way as iterating over a Pycairo path.
+    """
+
+    def __init__(self, codes, points):
+        """
+        Args:
+            codes: sequence of int - the element types.
+            points: (N, 2) array or sequence of points - the points used by the elements.
+
+        Returns:
+            self
+        """
+        codes = np.array(codes, dtype=np.uint8).reshape(-1)
+        points = _to_array(points, 2, "PathData").copy()
+        if any(code not in _PATH_ELEMENT_POINTS for code in np.unique(codes)):
+            raise ValueError("PathData contains an invalid element type")
+        if sum(_PATH_ELEMENT_POINTS[code] for code in codes.tolist()) != len(points):
+            raise ValueError("PathData points do not match the element types")
+        codes.flags.writeable = False
+        points.flags.writeable = False
+        self.codes = codes
+        self.points = points
+
+    @staticmethod
+    def of_cairo_path(path):
+        """
+        Create a `PathData` object from a Pycairo path object, for example the result of `ctx.copy_path()`.
+
+        Args:
+            path: Pycairo path object.
+
+        Returns:
+            New `PathData` object
+        """
+        codes = []
+        points = []
+        for code, coords in path:
+            codes.append(code)
+            points.extend(zip(coords[::2], coords[1::2]))
+        return PathData(codes, points)
+
+    def __reduce__(self):
+        return PathData, (self.codes, self.points)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        i = 0
+        for code in self.codes.tolist():
+            n = _PATH_ELEMENT_POINTS[code]
+            yield code, tuple(self.points[i:i + n].reshape(-1).tolist())
+            i += n
+
+    def __eq__(self, other):
+        if not isinstance(other, PathData):
+            return NotImplemented
+        return np.array_equal(self.codes, other.codes) and np.array_equal(self.points, other.points)
+
+    def __hash__(self):
+        return hash((self.codes.tobytes(), self.points.tobytes()))
+
+    def transformed(self, matrix):
+        """
+        Create a transformed copy of the path.
+
+        Args:
+            matrix: `generativepy.math.Matrix` - the transform.
+
+        Returns:
+            New `PathData` object
+        """
+        return PathData(self.codes, matrix.apply(self.points))
+
+    def replay(self, ctx, matrix=None):
+        """
+        Append the path to the current path of a context.
+
+        The points are transformed by `matrix` before they are drawn. Unlike drawing the path inside a `Transform`
+        block, this only changes the shape of the path, it doesn't affect the line width or dash pattern when
+        the path is stroked.
+
+        Args:
+            ctx: Pycairo context - the context to draw on.
+            matrix: `generativepy.math.Matrix` - optional transform applied to the path.
+        """
+        points = self.points if matrix is None else matrix.apply(self.points)
+        points = points.tolist()
+        i = 0
+        for code in self.codes.tolist():
+            if code == cairo.PATH_MOVE_TO:
+                ctx.move_to(*points[i])
+                i += 1
+            elif code == cairo.PATH_LINE_TO:
+                ctx.line_to(*points[i])
+                i += 1
+            elif code == cairo.PATH_CURVE_TO:
+                ctx.curve_to(*points[i], *points[i + 1], *points[i + 2])
+                i += 3
+            else:
+                ctx.close_path()
 
 
 class Shape():
@@ -534,23 +1169,61 @@ class Shape():
             self.added = True
         return self.ctx.copy_path_flat()
 
+    def path_data(self, flat=False, tolerance=0.1):
+        """
+        Get the shape as a `PathData` object. Unlike `path`, this doesn't use or change the shape's context, so it
+        can be called on a shape created with `None` in place of the context.
+
+        The path is created in the user space of the shape, so the result doesn't depend on the transform of any
+        context. It can be drawn many times, on any context, using a `Path` shape.
+
+        Args:
+            flat: bool - If true, curves are converted to straight line segments. If false, curves are kept, so the
+                  path can be drawn at any scale without distortion.
+            tolerance: number - Maximum error, in user space units, when curves are converted to line segments.
+
+        Returns:
+            New `PathData` object
+        """
+        global _shape_path_ctx
+
+        if _shape_path_ctx is None:
+            _shape_path_ctx = cairo.Context(cairo.ImageSurface(cairo.FORMAT_A8, 1, 1))
+        ctx, sub_path = self.ctx, self.sub_path
+        _shape_path_ctx.identity_matrix()
+        _shape_path_ctx.set_tolerance(tolerance)
+        _shape_path_ctx.new_path()
+        self.ctx = _shape_path_ctx
+        self.sub_path = False
+        try:
+            self.add()
+            path = _shape_path_ctx.copy_path_flat() if flat else _shape_path_ctx.copy_path()
+        finally:
+            self.ctx = ctx
+            self.sub_path = sub_path
+            _shape_path_ctx.new_path()
+        return PathData.of_cairo_path(path)
+
 
 class Path(Shape):
     """
     The Path class creates a shape based on a path object.
 
-    A path object can be obtained using the path method of any Shape object - a Rectangle, Circle, or even a
-    Text object can be used to create a path.
+    A path object can be obtained using the path or path_data method of any Shape object - a Rectangle, Circle, or
+    even a Text object can be used to create a path.
     """
 
     def __init__(self, ctx):
         super().__init__(ctx)
         self.path = None
+        self.matrix = None
         self.height = 0
 
     def add(self):
         self._do_path_()
-        if self.path:
+        if isinstance(self.path, PathData):
+            self.path.replay(self.ctx, self.matrix)
+        elif self.path:
             self.ctx.append_path(self.path)
         return self
 
@@ -573,8 +1246,11 @@ class Path(Shape):
 
         This is useful if you want to reuse a path, drawing it multiple times, or if you need to create a path is one part of your code but store it for use somewhere else. Paths also have advanced applications such as drawing text along a curve.
 
+        A `PathData` object, obtained by calling the path_data method of another shape, can be used in the same way.
+        It can be drawn on any context, for example on each frame of an animation.
+
         Args:
-            path:  Pycairo path object that defines the shape
+            path:  Pycairo path object or `PathData` object that defines the shape
 
         Returns:
             self
@@ -582,6 +1258,19 @@ class Path(Shape):
         self.path = path
         return self
 
+    def with_matrix(self, matrix):
+        """
+        Transform the path before it is drawn. This only applies to `PathData` paths.
+
+        Args:
+            matrix: `generativepy.math.Matrix` - the transform, or None for no transform.
+
+        Returns:
+            self
+        """
+        self.matrix = matrix
+        return self
+
 class Rectangle(Shape):
     """
     The Rectangle class represents a rectangle shape.
@@ -710,12 +1399,13 @@ class Text(Shape):
 
     def add(self):
         self._do_path_()
-        FontParameters(font=self._font, size=self._size, weight=self._weight, slant=self._slant).apply(self.ctx)
+        params = self._font_parameters()
+        params.apply(self.ctx)
 
         x, y = self.position
         x += self._offset[0]
         y += self._offset[1]
-        xb, yb, width, height, _, dy = self.ctx.text_extents(self.text)
+        xb, yb, width, height, _, dy = _text_extents(self.ctx, params, self.text, apply=False)
 
         x -= xb
         if self.alignx == CENTER:
@@ -730,34 +1420,34 @@ class Text(Shape):
         elif self.aligny == TOP:
             dy = -yb
 
-        if self._flip:
-            self.ctx.move_to(x, y - dy)
-            self.ctx.save()
-            self.ctx.scale(1, -1)
-            self.ctx.text_path(self.text)
-            self.ctx.restore()
-        else:
-            self.ctx.move_to(x, y + dy)
-            self.ctx.text_path(self.text)
+        # The text outline is taken from the text path cache, and appended at the text position
+        path = _text_path(self.ctx, params, self.text, self._flip)
+        self.ctx.save()
+        self.ctx.translate(x, y - dy if self._flip else y + dy)
+        self.ctx.append_path(path)
+        self.ctx.restore()
         return self
 
     def get_metrics(self):
         """
         Get the metrics of the text. This is a tuple (x_bearing, y_bearing, width, height, x_advance, y_advance), see the Pycairo
         documentation for a description of those terms
+
+        Text metrics are cached, so measuring the same text with the same font and transform is fast.
         """
-        FontParameters(font=self._font, size=self._size, weight=self._weight, slant=self._slant).apply(self.ctx)
-        return self.ctx.text_extents(self.text)
+        return _text_extents(self.ctx, self._font_parameters(), self.text)
 
     def get_size(self):
         """
         Get the size of the text. This is a tuple (width, height) giving the width and height of the part of the page
         marked by the text, in user units.
         """
-        FontParameters(font=self._font, size=self._size, weight=self._weight, slant=self._slant).apply(self.ctx)
-        extents = self.ctx.text_extents(self.text)
+        extents = _text_extents(self.ctx, self._font_parameters(), self.text)
         return extents[2], extents[3]
 
+    def _font_parameters(self):
+        return FontParameters(font=self._font, size=self._size, weight=self._weight, slant=self._slant)
+
     def of(self, text, position):
         """
         Sets the text to be displayed, and the position.
@@ -1196,20 +1886,37 @@ class Polygon(Shape):
         super().__init__(ctx)
         self.points = []
         self.closed = True
+        self.decimation = DECIMATE_NONE
+        self.decimation_tolerance = 0.5
 
     def add(self):
         self._do_path_()
-        first = True
-        for p in self.points:
-            if first:
+        points = self.points
+        if isinstance(points, (Points, VectorArray)):
+            points = points.array
+        if self.decimation != DECIMATE_NONE and len(points) > 2:
+            if isinstance(points, np.ndarray):
+                points = _decimate(self.ctx, points, self.decimation, self.decimation_tolerance)
+            elif all(len(p) == 2 for p in points):
+                points = _decimate(self.ctx, np.array([tuple(p) for p in points], dtype=np.float64),
+                                   self.decimation, self.decimation_tolerance)
+        if isinstance(points, np.ndarray):
+            if len(points):
                 if not self.extend:
-                    self.ctx.move_to(*p)
-                first = False
-            else:
-                if len(p) == 6:
-                    self.ctx.curve_to(*p)
+                    self.ctx.move_to(*points[0].tolist())
+                _add_polyline(self.ctx, points[1:], move=False)
+        else:
+            first = True
+            for p in points:
+                if first:
+                    if not self.extend:
+                        self.ctx.move_to(*p)
+                    first = False
                 else:
-                    self.ctx.line_to(*p)
+                    if len(p) == 6:
+                        self.ctx.curve_to(*p)
+                    else:
+                        self.ctx.line_to(*p)
         if self.closed or self.final_close:
             self.ctx.close_path()
         return self
@@ -1234,6 +1941,10 @@ class Polygon(Shape):
 
         The polygon will be closed by default. To create an open polygon, call the open method.
 
+        `points` can also be a `Points` or `VectorArray` object from the `math` module, or an (N, 2) NumPy array, for
+        polygons with straight sides. Array points are added to the path in bulk, which is much faster for polygons
+        with very many points.
+
         Args:
             points:  sequence of number tuples - A sequence of line or curve specifiers.
 
@@ -1260,6 +1971,28 @@ class Polygon(Shape):
         self.closed = not open_polygon
         return self
 
+    def decimate(self, mode=DECIMATE_SIMPLIFY, tolerance=0.5):
+        """
+        Reduce the number of points that are drawn, for polygons with very many points.
+
+        Points are removed if removing them makes no visible difference, based on the current device transform of the
+        context. For example, if a polyline has 100,000 points but is only 1000 pixels wide, most of the points will
+        fall in the same device pixel as their neighbours. Decimation only applies to polygons with straight sides.
+
+        Args:
+            mode: `DECIMATE_SIMPLIFY` to simplify general curves, keeping the result within `tolerance` device pixels of
+                  the original. `DECIMATE_COLUMNS` for time series data, keeping the first, last, lowest and highest
+                  point in each device pixel column, where `tolerance` is the column width. `DECIMATE_NONE` to
+                  draw every point.
+            tolerance: number - see `mode`.
+
+        Returns:
+            self
+        """
+        self.decimation = mode
+        self.decimation_tolerance = tolerance
+        return self
+
 
 class Circle(Shape):
     """
@@ -1398,20 +2131,14 @@ class RegularPolygon(Shape):
         self.centre = (0, 0)
         self.numsides = 3
         self.radius = 1
-        self.points = None
+        self.points = np.empty((0, 2), dtype=np.float64)
 
     def add(self):
         self._do_path_()
-        centre_angle = math.pi*2/self.numsides
-        angle = math.pi/2 - centre_angle/2
-        first = True
-        for p in self.points:
-            if first:
-                if not self.extend:
-                    self.ctx.move_to(*p)
-                first = False
-            else:
-                self.ctx.line_to(*p)
+        if len(self.points):
+            if not self.extend:
+                self.ctx.move_to(*self.points[0].tolist())
+            _add_polyline(self.ctx, self.points[1:], move=False)
         if self.closed or self.final_close:
             self.ctx.close_path()
         return self
@@ -1439,14 +2166,7 @@ class RegularPolygon(Shape):
         self.centre = centre
         self.numsides = numsides
         self.radius = radius
-        centre_angle = math.pi*2/self.numsides
-        angle = math.pi/2 - centre_angle/2 + angle
-        p = []
-        for i in range(self.numsides):
-            p.append((self.centre[0]+self.radius*math.cos(angle),
-                      self.centre[1] + self.radius * math.sin(angle)))
-            angle += centre_angle
-        self.points = tuple(p)
+        self.points = regular_polygons(numsides, (centre,), radius, angle=angle)[0]
         return self
 
     def open(self, open_polygon=True):
@@ -1516,6 +2236,14 @@ class RegularPolygon(Shape):
         vertex is stored as a tuple (x, y), so vertices is a tuple of tuples. This is a readonly property
         calculated from the centre, radius, and numsides.
         """
+        return tuple(map(tuple, self.points.tolist()))
+
+    @property
+    def vertex_array(self):
+        """
+        The vertex_array property contains the positions of the vertices of the polygon as an (N, 2) NumPy array.
+        This is a readonly property, the array should not be modified.
+        """
         return self.points
 
 
@@ -2007,6 +2735,333 @@ class AngleMarker(Shape):
         shape.add()
 
 
+class _ShapeBatch(Shape):
+    """
+    Base class for shapes that draw many similar items as a single compound path. The whole batch is filled or
+    stroked in one operation, rather than one operation per item.
+
+    Subclasses implement `_add_items` to add a selection of the items to the path, and `__len__`.
+    """
+
+    def add(self):
+        self._do_path_()
+        self._add_items(slice(None))
+        return self
+
+    def _add_items(self, indices):
+        raise NotImplementedError()
+
+    def _color_groups(self, colors):
+        """
+        Group the items by colour.
+
+        Args:
+            colors: sequence of `Color` - one colour per item.
+
+        Returns:
+            List of (color, indices) tuples, in order of first use of each colour.
+        """
+        if len(colors) != len(self):
+            raise ValueError("colors must contain one color per item")
+        groups = {}
+        for i, color in enumerate(colors):
+            groups.setdefault(color.color, (color, []))[1].append(i)
+        return list(groups.values())
+
+    def fill_by_color(self, colors, fill_rule=None):
+        """
+        Fill each item with its own colour. Items of the same colour are grouped into a single path, so the
+        number of fill operations is equal to the number of distinct colours.
+
+        Args:
+            colors: sequence of `Color` - one colour per item.
+            fill_rule: the fill rule to use, None for default.
+
+        Returns:
+            self
+        """
+        for color, indices in self._color_groups(colors):
+            self.ctx.new_path()
+            self._add_items(indices)
+            FillParameters(color, fill_rule).apply(self.ctx)
+            self.ctx.fill()
+        return self
+
+    def stroke_by_color(self, colors, line_width=1, dash=None, cap=SQUARE, join=MITER, miter_limit=None):
+        """
+        Outline each item with its own colour. Items of the same colour are grouped into a single path, so the
+        number of stroke operations is equal to the number of distinct colours.
+
+        Other parameters are as described for `StrokeParameters`.
+
+        Args:
+            colors: sequence of `Color` - one colour per item.
+            line_width: width of stroke line. None for default
+            dash: sequence, dash patter of line. None for default
+            cap: line end style, None for default.
+            join: line join style, None for default.
+            miter_limit: mitre limit, number, None for default
+
+        Returns:
+            self
+        """
+        for color, indices in self._color_groups(colors):
+            self.ctx.new_path()
+            self._add_items(indices)
+            StrokeParameters(color, line_width, dash, cap, join, miter_limit).apply(self.ctx)
+            self.ctx.stroke()
+        return self
+
+
+class Circles(_ShapeBatch):
+    """
+    The Circles class draws many circles as a single path.
+    """
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.centers = np.empty((0, 2), dtype=np.float64)
+        self.radii = np.empty((0,), dtype=np.float64)
+
+    def __len__(self):
+        return len(self.centers)
+
+    def _add_items(self, indices):
+        centers = self.centers[indices].tolist()
+        radii = self.radii[indices].tolist()
+        for (x, y), r in zip(centers, radii):
+            self.ctx.move_to(x + r, y)
+            self.ctx.arc(x, y, r, 0, 2*math.pi)
+            self.ctx.close_path()
+
+    def of_centers_radii(self, centers, radii):
+        """
+        Creates circles based on their centres and radii.
+
+        Args:
+            centers: sequence of (number, number), `Points`, `VectorArray` or (N, 2) NumPy array - the centre of each circle.
+            radii: number or sequence of N numbers - the radius of every circle, or of each circle.
+
+        Returns:
+            self
+        """
+        self.centers = _to_array(centers, 2, "Circles")
+        self.radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (len(self.centers),))
+        return self
+
+
+class Rectangles(_ShapeBatch):
+    """
+    The Rectangles class draws many rectangles as a single path.
+    """
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.rects = np.empty((0, 4), dtype=np.float64)
+
+    def __len__(self):
+        return len(self.rects)
+
+    def _add_items(self, indices):
+        for x, y, width, height in self.rects[indices].tolist():
+            self.ctx.rectangle(x, y, width, height)
+
+    def of_rects(self, rects):
+        """
+        Creates rectangles based on their positions and sizes.
+
+        Args:
+            rects: sequence of (x, y, width, height) tuples or (N, 4) NumPy array - (x, y) is the top left corner of
+                   each rectangle.
+
+        Returns:
+            self
+        """
+        self.rects = _to_array(rects, 4, "Rectangles")
+        return self
+
+    def of_corners_sizes(self, corners, widths, heights):
+        """
+        Creates rectangles based on their corners and sizes.
+
+        Args:
+            corners: sequence of (number, number), `Points`, `VectorArray` or (N, 2) NumPy array - the top left
+                     corner of each rectangle.
+            widths: number or sequence of N numbers - the width of every rectangle, or of each rectangle.
+            heights: number or sequence of N numbers - the height of every rectangle, or of each rectangle.
+
+        Returns:
+            self
+        """
+        corners = _to_array(corners, 2, "Rectangles")
+        n = len(corners)
+        self.rects = np.column_stack((corners,
+                                      np.broadcast_to(np.asarray(widths, dtype=np.float64), (n,)),
+                                      np.broadcast_to(np.asarray(heights, dtype=np.float64), (n,))))
+        return self
+
+
+class RegularPolygons(_ShapeBatch):
+    """
+    The RegularPolygons class draws many regular polygons, with the same number of sides, as a single path. For
+    example, it can draw the cells of a hexagonal grid.
+    """
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.vertices = np.empty((0, 3, 2), dtype=np.float64)
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def _add_items(self, indices):
+        move_to = self.ctx.move_to
+        line_to = self.ctx.line_to
+        close_path = self.ctx.close_path
+        for polygon in self.vertices[indices].tolist():
+            move_to(*polygon[0])
+            for x, y in polygon[1:]:
+                line_to(x, y)
+            close_path()
+
+    def of_centres_sides_radius(self, centres, numsides, radius, angle=0):
+        """
+        Creates regular polygons based on their parameters. The polygons are oriented in the same way as
+        `RegularPolygon`.
+
+        Args:
+            centres: sequence of (number, number), `Points`, `VectorArray` or (N, 2) NumPy array - the centre of
+                     each polygon.
+            numsides: int - The number of sides of every polygon.
+            radius: number or sequence of N numbers - The distance from the centre to the vertices, for every
+                    polygon or for each polygon.
+            angle: number or sequence of N numbers - Angle to rotate every polygon, or each polygon.
+
+        Returns:
+            self
+        """
+        self.vertices = regular_polygons(numsides, centres, radius, angle=angle)
+        return self
+
+    def of_hex_grid(self, origin, rows, columns, radius):
+        """
+        Creates the cells of a hexagonal grid. The hexagons have a flat base, and touch their neighbours. Cells are
+        ordered row by row, see `math.hex_grid`.
+
+        Args:
+            origin: (number, number) - The centre of the first cell.
+            rows: int - The number of rows.
+            columns: int - The number of columns.
+            radius: number - The distance from the centre of each cell to its vertices.
+
+        Returns:
+            self
+        """
+        return self.of_centres_sides_radius(hex_grid(rows, columns, radius, origin), 6, radius)
+
+
+class Lines(_ShapeBatch):
+    """
+    The Lines class draws many separate straight lines as a single path.
+    """
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.starts = np.empty((0, 2), dtype=np.float64)
+        self.ends = np.empty((0, 2), dtype=np.float64)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _add_items(self, indices):
+        for (x0, y0), (x1, y1) in zip(self.starts[indices].tolist(), self.ends[indices].tolist()):
+            self.ctx.move_to(x0, y0)
+            self.ctx.line_to(x1, y1)
+
+    def of_starts_ends(self, starts, ends):
+        """
+        Creates lines based on their start and end points.
+
+        Args:
+            starts: sequence of (number, number), `Points`, `VectorArray` or (N, 2) NumPy array - the start of each line.
+            ends: sequence of (number, number), `Points`, `VectorArray` or (N, 2) NumPy array - the end of each line.
+
+        Returns:
+            self
+        """
+        starts = _to_array(starts, 2, "Lines")
+        ends = _to_array(ends, 2, "Lines")
+        if len(starts) != len(ends):
+            raise ValueError("Lines requires the same number of start and end points")
+        self.starts = starts
+        self.ends = ends
+        return self
+
+
+## Image caching
+
+IMAGE_CACHE_BYTES = 256*1024*1024  # Maximum total size of the decoded images held in the image cache
+
+# Decoded image surfaces, keyed on (path, mtime, mip level)
+_image_cache = OrderedDict()
+_image_cache_bytes = 0
+
+
+def _cache_image(key, surface):
+    global _image_cache_bytes
+    _image_cache[key] = surface
+    _image_cache_bytes += surface.get_stride()*surface.get_height()
+    while _image_cache_bytes > IMAGE_CACHE_BYTES and len(_image_cache) > 1:
+        _, old = _image_cache.popitem(last=False)
+        _image_cache_bytes -= old.get_stride()*old.get_height()
+
+
+def _cached_image(path, level=0):
+    """
+    Get a decoded PNG image from the image cache, loading it if necessary. The cache key includes the modification
+    time of the file, so an image is reloaded if the file changes.
+
+    Mip levels are reduced size copies of the image, each half the size of the previous level, used when the image is
+    painted at a small scale. Level 0 is the full size image.
+
+    Args:
+        path: str - the image file path.
+        level: int - the mip level.
+
+    Returns:
+        Pycairo ImageSurface
+    """
+    key = (path, os.path.getmtime(path), level)
+    surface = _image_cache.get(key)
+    if surface is not None:
+        _image_cache.move_to_end(key)
+        return surface
+
+    if level == 0:
+        surface = cairo.ImageSurface.create_from_png(path)
+    else:
+        source = _cached_image(path, level - 1)
+        width = max((source.get_width() + 1)//2, 1)
+        height = max((source.get_height() + 1)//2, 1)
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        ctx = cairo.Context(surface)
+        ctx.scale(width/source.get_width(), height/source.get_height())
+        ctx.set_source_surface(source, 0, 0)
+        ctx.get_source().set_filter(cairo.FILTER_GOOD)
+        ctx.paint()
+    _cache_image(key, surface)
+    return surface
+
+
+def clear_image_cache():
+    """
+    Discard all the images held in the image cache.
+    """
+    global _image_cache_bytes
+    _image_cache.clear()
+    _image_cache_bytes = 0
+
+
 class Image():
     """
     The Image class renders an image on a drawing context.
@@ -2060,26 +3115,81 @@ class Image():
         By default, the image will be rendered with its top left corner at `position`. If user space is mirrored or
         rotated, it may appear differently on the page.
 
-        There are two ways to pass an image into this function:
+        There are several ways to pass an image into this function:
 
         * `image` can specify the filepath to a PNG file.
         * `image` can specify a Pycairo ImageSurface containing an image.
+        * `image` can be a NumPy array or a PIL image, as described for `surface_from_array`. This avoids saving an
+          image to a file and reading it back, for example when compositing frames created with NumPy.
 
-        The first method is usually used. However, if you need to render the same image many times, this method
-        can be quite slow because it reads the file every time. In that case, you can use the `load_image` mathod to
-        preload an image into an ImageSurface, and then pass that into this function.
+        The first method is usually used. Images loaded from files are held in a cache, so if you render the same
+        image many times each file is normally only read once. The cache is limited to
+        `IMAGE_CACHE_BYTES` of image data, and a file is read again if it has been modified. When an image file is
+        painted at less than half its original size, a reduced size copy of the image is created and cached, so that
+        the full size image doesn't need to be resampled each time it is painted.
 
         Args:
-            image: str or Pycairo ImageSurface - The iamge.
+            image: str, Pycairo ImageSurface, NumPy array or PIL image - The iamge.
             position:  (number, number) - A tuple of two numbers, giving the required (x, y) position the image.
 
         Returns:
             self
         """
+        if isinstance(image, np.ndarray):
+            image = Image.surface_from_array(image)
+        elif hasattr(image, 'mode') and hasattr(image, 'convert'):
+            # PIL image
+            image = Image.surface_from_array(np.asarray(image if image.mode in ('L', 'RGB', 'RGBA')
+                                                        else image.convert('RGBA')))
         self.image = image
         self.position = position
         return self
 
+    @staticmethod
+    def surface_from_array(array):
+        """
+        Create an image surface from a NumPy array. This is a static helper method. The array can be:
+
+        * An (height, width) array of uint8, a greyscale image.
+        * An (height, width, 3) array of uint8, an RGB image.
+        * An (height, width, 4) array of uint8, an RGBA image, with alpha that is not premultiplied (the same format
+          as the frames created by `drawing.make_image_frames` with 4 channels, and PIL RGBA images).
+        * An (height, width) array of uint32, holding pixels in Pycairo ARGB32 format (premultiplied alpha, native
+          byte order). If the array is C contiguous and writable, the surface uses the array data directly, without
+          copying it, so later changes to the array will affect the image.
+
+        Args:
+            array: NumPy array - the image data.
+
+        Returns:
+            Pycairo ImageSurface object containing the image.
+        """
+        if array.dtype == np.uint32 and array.ndim == 2:
+            if not (array.flags['C_CONTIGUOUS'] and array.flags['WRITEABLE']):
+                array = np.ascontiguousarray(array).copy()
+            height, width = array.shape
+            return cairo.ImageSurface.create_for_data(array, cairo.FORMAT_ARGB32, width, height, width*4)
+
+        if array.dtype != np.uint8 or not (array.ndim == 2 or (array.ndim == 3 and array.shape[2] in (3, 4))):
+            raise ValueError("Image array must be (height, width), (height, width, 3) or (height, width, 4) uint8, "
+                             "or (height, width) uint32")
+        if array.ndim == 2:
+            r = g = b = array.astype(np.uint32)
+            fmt = cairo.FORMAT_RGB24
+            a = np.uint32(255)
+        elif array.shape[2] == 3:
+            r, g, b = (array[:, :, i].astype(np.uint32) for i in range(3))
+            fmt = cairo.FORMAT_RGB24
+            a = np.uint32(255)
+        else:
+            a = array[:, :, 3].astype(np.uint32)
+            # Cairo uses premultiplied alpha
+            r, g, b = ((array[:, :, i].astype(np.uint32)*a + 127)//255 for i in range(3))
+            fmt = cairo.FORMAT_ARGB32
+        pixels = (a << 24) | (r << 16) | (g << 8) | b
+        height, width = pixels.shape
+        return cairo.ImageSurface.create_for_data(pixels, fmt, width, height, width*4)
+
     def scale(self, scale_factor):
         """
         Sets the image scale factor.
@@ -2105,10 +3215,22 @@ class Image():
         Returns:
             self
         """
-        image = cairo.ImageSurface.create_from_png(self.image) if isinstance(self.image, str) else self.image
         self.ctx.save()
         self.ctx.translate(*self.position)
         self.ctx.scale(self.scale_factor, self.scale_factor)
+        if isinstance(self.image, str):
+            image = _cached_image(self.image)
+            # Use a reduced size copy of the image if it is drawn at less than half size on the device
+            xx, yx, xy, yy, _, _ = self.ctx.get_matrix()
+            device_scale = math.sqrt(abs(xx*yy - xy*yx))
+            if 0 < device_scale < 0.5:
+                level = min(int(math.log2(1/device_scale)), int(math.log2(max(image.get_width(), image.get_height()))))
+                if level > 0:
+                    width, height = image.get_width(), image.get_height()
+                    image = _cached_image(self.image, level)
+                    self.ctx.scale(width/image.get_width(), height/image.get_height())
+        else:
+            image = self.image
         pattern = cairo.SurfacePattern(image)
         self.ctx.set_source(pattern)
         self.ctx.rectangle(0, 0, image.get_width(), image.get_height())
@@ -2116,6 +3238,53 @@ class Image():
         self.ctx.restore()
         return self
 
+def _turtle_segments(commands, x, y, heading, distance, angle, stack=None):
+    """
+    Interpret a string of turtle commands, as described for `Turtle.execute`.
+
+    Args:
+        commands: str - the command string.
+        x: number - start x position.
+        y: number - start y position.
+        heading: number - start heading.
+        distance: number - distance moved by each move command.
+        angle: number - angle turned by each turn command.
+        stack: list - the push/pop stack. This allows a long command sequence to be interpreted in several parts,
+               passing the same list each time. None to use a new stack.
+
+    Returns:
+        Tuple of ((N, 4) array of line segments, final x, final y, final heading)
+    """
+    segments = []
+    append = segments.append
+    stack = [] if stack is None else stack
+    cos = math.cos(heading)
+    sin = math.sin(heading)
+    for c in commands:
+        if c == 'F' or c == 'G':
+            x1 = x + distance*cos
+            y1 = y + distance*sin
+            append((x, y, x1, y1))
+            x, y = x1, y1
+        elif c == '+':
+            heading -= angle
+            cos, sin = math.cos(heading), math.sin(heading)
+        elif c == '-':
+            heading += angle
+            cos, sin = math.cos(heading), math.sin(heading)
+        elif c == '[':
+            stack.append((x, y, heading))
+        elif c == ']':
+            if not stack:
+                raise ValueError("Unmatched ']' in turtle commands")
+            x, y, heading = stack.pop()
+            cos, sin = math.cos(heading), math.sin(heading)
+        elif c == 'f':
+            x += distance*cos
+            y += distance*sin
+    return np.array(segments, dtype=np.float64).reshape((-1, 4)), x, y, heading
+
+
 class Turtle():
     """
     The Turtle class implements a simple turtle graphics system.
@@ -2134,6 +3303,13 @@ class Turtle():
     It is possible to change the colour, thickness and dash style of the lines the turtle draws.
 
     More than one turtle can be active at the same time, simply by creating more than one turtle object.
+
+    By default, each line is drawn as soon as the turtle moves. For drawings with very many lines (for example
+    L-systems), buffered mode is much faster. In buffered mode, consecutive lines with the same style are collected into
+    a single path, which is drawn in one operation when the style changes or when `flush` is called. The lines are
+    always drawn using the user space that was in effect when they were added, so buffered mode can be mixed freely
+    with `Transform`. A turtle can be used as a context manager, in a `with` block, to flush it automatically at the
+    end of the block.
     """
 
     def __init__(self, ctx):
@@ -2154,6 +3330,51 @@ class Turtle():
         self.dash = []
         self.cap = SQUARE
         self.stack = []
+        self.buffered = False
+        self.buffer = []
+        self.buffer_style = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
+
+    def set_buffered(self, buffered=True):
+        """
+        Turns buffered mode on or off. In buffered mode, consecutive lines with the same style are drawn as a single path.
+        Any buffered lines are drawn when buffered mode is turned off.
+
+        Args:
+            buffered: bool - True to turn on buffered mode.
+
+        Returns:
+            self
+        """
+        if not buffered:
+            self.flush()
+        self.buffered = buffered
+        return self
+
+    def flush(self):
+        """
+        Draws any lines held in the buffer. This only needs to be called in buffered mode.
+
+        Returns:
+            self
+        """
+        if self.buffer:
+            color, line_width, dash, cap, matrix = self.buffer_style
+            segments = np.array(self.buffer, dtype=np.float64)
+            # Draw in the user space the lines were added in, which may have been changed by a Transform since
+            _save_context(self.ctx)
+            self.ctx.set_matrix(cairo.Matrix(*matrix))
+            Lines(self.ctx).of_starts_ends(segments[:, :2], segments[:, 2:]) \
+                .stroke(color, line_width=line_width, dash=dash, cap=cap)
+            _restore_context(self.ctx)
+            self.buffer = []
+        self.buffer_style = None
+        return self
 
     def push(self):
         """
@@ -2190,8 +3411,73 @@ class Turtle():
         p1 = self.x, self.y
         self.x += distance*math.cos(self.heading)
         self.y += distance*math.sin(self.heading)
-        Line(self.ctx).of_start_end(p1, (self.x, self.y)) \
-            .stroke(next(self.color), line_width=self.line_width, dash=self.dash, cap=self.cap)
+        color = next(self.color)
+        if self.buffered:
+            style = color, self.line_width, self.dash, self.cap, tuple(self.ctx.get_matrix())
+            if self.buffer_style is not None and not self._same_style(style, self.buffer_style):
+                self.flush()
+            self.buffer_style = style
+            self.buffer.append((p1[0], p1[1], self.x, self.y))
+        else:
+            Line(self.ctx).of_start_end(p1, (self.x, self.y)) \
+                .stroke(color, line_width=self.line_width, dash=self.dash, cap=self.cap)
+        return self
+
+    @staticmethod
+    def _same_style(a, b):
+        return (a[0].color == b[0].color and a[1] == b[1] and list(a[2]) == list(b[2]) and a[3] == b[3]
+                and a[4] == b[4])
+
+    def execute(self, commands, distance, angle):
+        """
+        Executes a string of L-system style turtle commands. The commands are interpreted in a single pass to create
+        an array of line segments, which are then drawn as a single path for each colour, so this is much faster than
+        calling `forward`, `left` etc for each command.
+
+        The commands are:
+
+        * `F` or `G` - move forward by `distance`, drawing a line.
+        * `f` - move forward by `distance` without drawing a line.
+        * `+` - turn left by `angle`.
+        * `-` - turn right by `angle`.
+        * `[` - push the turtle position and heading.
+        * `]` - pop the turtle position and heading.
+
+        Any other characters are ignored. The turtle starts from its current position, heading and style, and is left
+        at its final position and heading. If the colour is a sequence, successive lines cycle through the colours.
+
+        Args:
+            commands: str - The command string.
+            distance: number - The distance moved by each `F`, `G` or `f` command.
+            angle: number - The angle turned by each `+` or `-` command, in radians.
+
+        Returns:
+            self
+        """
+        segments, self.x, self.y, self.heading = _turtle_segments(commands, self.x, self.y, self.heading,
+                                                                  distance, angle)
+        self.draw_segments(segments)
+        return self
+
+    def draw_segments(self, segments):
+        """
+        Draws an (N, 4) array of line segments, each row (x0, y0, x1, y1), in the current turtle style. All the lines
+        of the same colour are drawn as a single path. This can be used to redraw the segments created by an L-system
+        without recalculating them.
+
+        The turtle position and heading are not changed.
+
+        Args:
+            segments: (N, 4) NumPy array - the line segments.
+
+        Returns:
+            self
+        """
+        self.flush()
+        if len(segments):
+            lines = Lines(self.ctx).of_starts_ends(segments[:, :2], segments[:, 2:])
+            colors = [next(self.color) for _ in range(len(segments))]
+            lines.stroke_by_color(colors, line_width=self.line_width, dash=self.dash, cap=self.cap)
         return self
 
     def move(self, distance):
@@ -2328,7 +3614,7 @@ class Transform():
             self
         """
         self.ctx = ctx
-        self.ctx.save()
+        _save_context(self.ctx)
         self.active = True
 
     def __enter__(self):
@@ -2336,7 +3622,7 @@ class Transform():
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.active:
-            self.ctx.restore()
+            _restore_context(self.ctx)
             self.active = False
         else:
             raise RuntimeError('Transform exit called twice')
@@ -4,6 +4,8 @@
 # License: MIT
 import dataclasses
 import itertools
+from collections import OrderedDict
+from functools import lru_cache
 
 import cairo
 import math
@@ -11,11 +13,12 @@ import numpy as np
 import copy
 from dataclasses import dataclass
 
-from generativepy.geometry import (Text, Shape, FillParameters, StrokeParameters, FontParameters, Circle, Polygon, Line,
-                                   BUTT, FONT_WEIGHT_BOLD, FONT_SLANT_NORMAL, WINDING, SQUARE, MITER, RIGHT, TOP, BOTTOM, LEFT)
+from generativepy.geometry import (Text, Shape, FillParameters, StrokeParameters, FontParameters, Circle, Polygon,
+                                   BUTT, FONT_WEIGHT_BOLD, FONT_SLANT_NORMAL, WINDING, SQUARE, MITER, RIGHT, TOP, BOTTOM, LEFT,
+                                   DECIMATE_NONE, DECIMATE_SIMPLIFY, _decimate, _save_context, _restore_context)
 from generativepy.color import Color
 from generativepy import drawing
-from generativepy.math import Vector as V
+from generativepy.math import Vector as V, Matrix
 
 # Point styles for graphs
 POINT_CIRCLE = 0  # Circular points
@@ -25,6 +28,12 @@ SCATTER_NO_LINE = 0  # All points on scatter chart are left unconnected
 SCATTER_STALK = 1  # Stalk chart style
 SCATTER_CONNECTED = 2  # Points are joined one to the next
 
+# Maximum number of times an interval is halved by adaptive plotting
+ADAPTIVE_MAX_DEPTH = 12
+
+# Maximum number of static axes layers held by the static layer cache
+STATIC_LAYER_CACHE_SIZE = 8
+
 # Axis positions
 AXIS_NONE = 0
 AXIS_ZERO = 1
@@ -44,6 +53,7 @@ class AxesAppearance:
     axislines: any = dataclasses.field(default_factory=lambda: StrokeParameters(Color(0.2), line_width=2, cap=BUTT))
     featurescale: any = 1
     divisions: any = (1, 1)
+    autodivisions: any = None
     subdivisionfactor: any = None
     x_div_formatter: any = None
     y_div_formatter: any = None
@@ -58,6 +68,126 @@ class AxesAppearance:
     ticklabeloffset: any = 1.1
 
 
+# Relative tolerance used when deciding whether a tick lies inside the axes range
+TICK_TOLERANCE = 1e-9
+
+
+@lru_cache(maxsize=256)
+def _tick_indices(start, extent, spacing):
+    """
+    Find the range of integer indices i for which i*spacing lies within start to start + extent.
+
+    Args:
+        start: start of range
+        extent: length of range
+        spacing: tick spacing
+
+    Returns:
+        range of indices
+    """
+    first = math.ceil(start/spacing - TICK_TOLERANCE)
+    last = math.floor((start + extent)/spacing + TICK_TOLERANCE)
+    return range(first, last + 1)
+
+
+@lru_cache(maxsize=256)
+def get_divisions(start, extent, div):
+    """
+    Calculate the positions of the divisions of an axis. Each position is calculated directly as a multiple of `div`, so
+    there is no accumulated rounding error. If `start` and `div` are integers, the positions will also be integers.
+
+    Args:
+        start: start value of the axis
+        extent: length of the axis
+        div: division spacing
+
+    Returns:
+        Tuple of division positions
+    """
+    return tuple(i*div for i in _tick_indices(start, extent, div))
+
+
+@lru_cache(maxsize=256)
+def get_subdivisions(start, extent, div, factor):
+    """
+    Calculate the positions of the subdivisions of an axis. Subdivision positions that coincide with a division
+    are not included.
+
+    Args:
+        start: start value of the axis
+        extent: length of the axis
+        div: division spacing
+        factor: int, number of subdivisions per division
+
+    Returns:
+        Tuple of subdivision positions
+    """
+    factor = int(factor)
+    indices = _tick_indices(start, extent, div/factor)
+    subdivs = set(indices) - set(range(math.ceil(indices.start/factor)*factor, indices.stop, factor))
+    return tuple(j*div/factor for j in sorted(subdivs))
+
+
+def nice_division(extent, count=10):
+    """
+    Choose a division spacing of 1, 2 or 5 times a power of 10, giving approximately `count` divisions
+    across `extent`.
+
+    Args:
+        extent: length of the axis
+        count: target number of divisions
+
+    Returns:
+        Division spacing. This is an int if the spacing is a whole number.
+    """
+    raw = abs(extent)/count
+    exponent = math.floor(math.log10(raw))
+    fraction = raw/10**exponent
+    if fraction < 1.5:
+        nice = 1
+    elif fraction < 3.5:
+        nice = 2
+    elif fraction < 7.5:
+        nice = 5
+    else:
+        nice = 10
+    if exponent >= 0:
+        return nice*10**exponent
+    return nice/10**-exponent
+
+
+# Rendered static axes layers, keyed on appearance, geometry and device transform
+_static_layer_cache = OrderedDict()
+
+
+def _static_layer_key(value):
+    '''
+    Convert an appearance value into a hashable key. Colors, patterns and parameter objects are compared by value,
+    formatter functions are compared by identity.
+
+    Args:
+        value: the value to convert
+
+    Returns:
+        Hashable key
+    '''
+    if isinstance(value, Color):
+        return tuple(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_static_layer_key(v) for v in value)
+    if isinstance(value, (AxesAppearance, FillParameters, StrokeParameters, FontParameters)):
+        return (type(value),) + tuple((k, _static_layer_key(v)) for k, v in sorted(vars(value).items())
+                                      if k != 'text_height')
+    return value
+
+
+def clear_static_layer_cache():
+    '''
+    Discard all the static axes layers held by the static layer cache.
+    '''
+    _static_layer_cache.clear()
+
+
 class Axes:
     '''
     Controls the range and appearance of a set of Cartesian axes
@@ -70,6 +200,7 @@ class Axes:
         self.width = width
         self.height = height
         self.appearance = dataclasses.replace(appearance) if appearance is not None else AxesAppearance()
+        self.cache_static_layer = False
 
     def of_start(self, start):
         '''
@@ -124,6 +255,21 @@ class Axes:
         self.appearance.divisions = divisions
         return self
 
+    def with_auto_divisions(self, count=(10, 10)):
+        '''
+        Set divisions spacing automatically. In each direction the spacing is chosen to be 1, 2 or 5 times a power
+        of 10, to give approximately the requested number of divisions over the extent of the axes. The spacing is
+        calculated when the axes are drawn.
+
+        Args:
+            count: (x, y) target number of divisions in each direction
+
+        Returns:
+            self
+        '''
+        self.appearance.autodivisions = count
+        return self
+
     def with_axis_positions(self, x_axis_pos, y_axis_pos):
         '''
         Set axis positions
@@ -189,6 +335,28 @@ class Axes:
         self.appearance.ticklabeloffset = ticklabeloffset
         return self
 
+    def with_static_layer_cache(self, cached=True):
+        '''
+        Cache the static layer of the axes (background, grid lines, axes and tick labels). This is useful for
+        animations, where the axes are usually identical on every frame but the plotted data changes.
+
+        The first time the axes are drawn they are rendered to an image, and each subsequent time axes with the same
+        appearance, position and size are drawn with the same transform, the image is painted instead.
+        Colors, gradient patterns and line, fill and font parameters are compared by value, but division
+        formatter functions are compared by identity, so they should be created once rather than on every frame.
+
+        The cache only applies when drawing on an image surface. Axes drawn on vector surfaces such as SVG are
+        always drawn in full.
+
+        Args:
+            cached: Boolean, True to cache the static layer.
+
+        Returns:
+            self
+        '''
+        self.cache_static_layer = cached
+        return self
+
     def background(self, pattern):
         '''
         Sets the entire graph background
@@ -290,6 +458,70 @@ class Axes:
         Draw the axes
         '''
 
+        if self.appearance.autodivisions:
+            self.appearance.divisions = (nice_division(self.appearance.extent[0], self.appearance.autodivisions[0]),
+                                         nice_division(self.appearance.extent[1], self.appearance.autodivisions[1]))
+
+        if self.cache_static_layer and isinstance(self.ctx.get_target(), cairo.ImageSurface):
+            self._draw_cached()
+        else:
+            self._draw_static()
+
+    def _render_static(self, ctx):
+        # Draw the static layer on another context, leaving self.ctx unchanged
+        original_ctx = self.ctx
+        self.ctx = ctx
+        try:
+            self._draw_static()
+        finally:
+            self.ctx = original_ctx
+
+    def _draw_cached(self):
+        target = self.ctx.get_target()
+        matrix = self.ctx.get_matrix()
+        width, height = target.get_width(), target.get_height()
+        key = (_static_layer_key(self.appearance), _static_layer_key(self.position), self.width, self.height,
+               tuple(matrix), width, height)
+
+        entry = _static_layer_cache.get(key)
+        if entry is None:
+            # Find the device space bounds of the static layer, so the cached image only covers the axes, their
+            # labels and a margin for antialiasing, rather than the whole target
+            recording = cairo.RecordingSurface(cairo.CONTENT_COLOR_ALPHA, None)
+            ctx = cairo.Context(recording)
+            ctx.set_font_options(self.ctx.get_font_options())
+            ctx.set_matrix(matrix)
+            self._render_static(ctx)
+            x, y, w, h = recording.ink_extents()
+            x0, y0 = max(math.floor(x) - 2, 0), max(math.floor(y) - 2, 0)
+            x1, y1 = min(math.ceil(x + w) + 2, width), min(math.ceil(y + h) + 2, height)
+
+            surface = None
+            if w > 0 and h > 0 and x1 > x0 and y1 > y0:
+                surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, x1 - x0, y1 - y0)
+                ctx = cairo.Context(surface)
+                ctx.set_font_options(self.ctx.get_font_options())
+                ctx.translate(-x0, -y0)
+                ctx.transform(matrix)
+                self._render_static(ctx)
+            entry = (surface, x0, y0, self.appearance.text_height)
+            _static_layer_cache[key] = entry
+            while len(_static_layer_cache) > STATIC_LAYER_CACHE_SIZE:
+                _static_layer_cache.popitem(last=False)
+        else:
+            _static_layer_cache.move_to_end(key)
+
+        surface, x0, y0, self.appearance.text_height = entry
+        if surface is not None:
+            self.ctx.save()
+            self.ctx.identity_matrix()
+            self.ctx.set_source_surface(surface, x0, y0)
+            self.ctx.rectangle(x0, y0, surface.get_width(), surface.get_height())
+            self.ctx.fill()
+            self.ctx.restore()
+        self.ctx.new_path()
+
+    def _draw_static(self):
         self.ctx.new_path()
         # Get the text height using the selected font. This is used to control text offset and other sizes.
         _, self.appearance.text_height = Text(self.ctx).of('0', (0, 0)) \
@@ -416,7 +648,7 @@ class Axes:
         The height clip allows a region above and below the graph to be painted
         '''
         self.ctx.rectangle(self.position[0], self.position[1] - self.height, self.width, 3*self.height)
-        self.ctx.save()
+        _save_context(self.ctx)
         self.ctx.clip()
 
     def clip_y(self):
@@ -425,7 +657,7 @@ class Axes:
         The width clip allows a region toe the left and right of the graph to be painted
         '''
         self.ctx.rectangle(self.position[0] - self.width, self.position[1], 3*self.width, self.height)
-        self.ctx.save()
+        _save_context(self.ctx)
         self.ctx.clip()
 
     def clip(self):
@@ -433,50 +665,20 @@ class Axes:
         Set the clip region to the axes area.
         '''
         self.ctx.rectangle(*self.position, self.width, self.height)
-        self.ctx.save()
+        _save_context(self.ctx)
         self.ctx.clip()
 
     def unclip(self):
         '''
         Undo a previous clip()
         '''
-        self.ctx.restore()
+        _restore_context(self.ctx)
 
     def _get_divs(self, start, extent, div):
-        divs = []
-        n = math.ceil(start/div)*div
-        while n <= start + extent:
-            divs.append(n)
-            n += div
-        return divs
-
-    def _contains(self, values, value, tolerance):
-        '''
-        Return true if the sequence values contains the value to within a given tolerance
-
-        Args:
-            values
-            value
-            tolerance
-
-        Returns:
-            Result
-        '''
-        for v in values:
-            if abs(value - v) < tolerance:
-                return True
-        return False
+        return get_divisions(start, extent, div)
 
     def _get_subdivs(self, start, extent, div, factor):
-        subdiv = div/factor
-        divs = self._get_divs(start, extent, div)
-        subdivs = []
-        n = math.ceil(start/subdiv)*subdiv
-        while n <= start + extent:
-            if not self._contains(divs, subdiv, extent/100000):
-                subdivs.append(n)
-            n += subdiv
-        return subdivs
+        return get_subdivisions(start, extent, div, factor)
 
     def _format_div(self, value, div, formatter):
         """
@@ -503,30 +705,85 @@ class Axes:
         '''
         Coverts a point/list of points defined in axes coordinates to the equivalent vector(s) in user space
 
+        An (N, 2) NumPy array of points is transformed in a single operation, and the result is returned as an (N, 2)
+        array. This is the fastest way to transform large numbers of points.
+
         Args:
-            point: Either a single point (a sequence of 2 numbers), or a sequence of points
+            point: Either a single point (a sequence of 2 numbers), a sequence of points, or an (N, 2) NumPy array
 
         Returns:
-            User space vector
+            User space vector, list of vectors, or (N, 2) NumPy array, depending on the type of point
         '''
 
-        def _transform_point(point): # Transform a single point
-            if not (hasattr(point, "__getitem__") and hasattr(point, "__iter__") and hasattr(point, "__len__")):
-                raise TypeError("point must be a List, Tuple or Vector")
-            if len(point) != 2:
-                raise ValueError("point must have 2 elements")
-            x = ((point[0] - self.appearance.start [0]) * self.width / self.appearance.extent[0]) + self.position[0]
-            y = self.height + self.position[1] - ((point[1] - self.appearance.start [1]) * self.height / self.appearance.extent[1])
-            return V(x, y)
-
+        if isinstance(point, np.ndarray) and point.ndim == 2:
+            return self._transform_array(point)
         if not (hasattr(point, "__getitem__") and hasattr(point, "__iter__") and hasattr(point, "__len__")):
             raise TypeError("point must be a List, Tuple or Vector")
         if len(point) > 0 and isinstance(point[0], (int, float)):
             # If there is at least one element and it is a number, assume it is a single point
-            return _transform_point(point)
+            if len(point) != 2:
+                raise ValueError("point must have 2 elements")
+            return V(self._transform_array(np.array((point,), dtype=np.float64))[0].tolist())
         else:
             # All other cases assume it is a list of (zero or more) points
-            return [_transform_point(p) for p in point]
+            if len(point) == 0:
+                return []
+            return [V(p) for p in self._transform_array(_points_array(point)).tolist()]
+
+    def _transform_array(self, points):
+        '''
+        Transform an (N, 2) array of points from axes coordinates to user space, in a single operation
+
+        Args:
+            points: (N, 2) array of points
+
+        Returns:
+            New (N, 2) array of points
+        '''
+        points = np.asarray(points, dtype=np.float64)
+        if points.ndim != 2 or points.shape[1] != 2:
+            raise ValueError("point must have 2 elements")
+        scale_x = self.width / self.appearance.extent[0]
+        scale_y = self.height / self.appearance.extent[1]
+        offset_x = self.position[0] - self.appearance.start[0] * scale_x
+        offset_y = self.height + self.position[1] + self.appearance.start[1] * scale_y
+        return points * (scale_x, -scale_y) + (offset_x, offset_y)
+
+
+def _sample(fn, values, vectorized):
+    '''
+    Evaluate fn at every value in a 1D array of sample values.
+
+    If vectorized is true, fn is called once with the whole array (for example a function built from NumPy ufuncs).
+    A function that returns a constant is broadcast to the sample size. If fn doesn't accept an array, or returns a
+    result of the wrong shape, it is called once per sample instead, as it is when vectorized is false, using
+    np.vectorize.
+
+    Returns:
+        1D float64 array of results, the same length as values
+    '''
+    if vectorized:
+        try:
+            result = np.asarray(fn(values), dtype=np.float64)
+        except (TypeError, ValueError):
+            result = None
+        if result is not None and (result.ndim == 0 or result.shape == values.shape):
+            return np.broadcast_to(result, values.shape)
+    return np.vectorize(fn, otypes=[np.float64])(values)
+
+
+def _points_array(points):
+    '''
+    Convert a sequence of points to an (N, 2) float64 array. Arrays are passed through unchanged.
+    '''
+    if isinstance(points, np.ndarray):
+        return points
+    if len(points) == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    array = np.array([tuple(p) for p in points], dtype=np.float64)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError("point must have 2 elements")
+    return array
 
 
 class Plot(Shape):
@@ -537,17 +794,164 @@ class Plot(Shape):
     def __init__(self, axes):
         super().__init__(axes.ctx)
         self.axes = axes
-        self.points = []
+        self.points = np.empty((0, 2), dtype=np.float64)
         self.closed = False
+        self.decimation = DECIMATE_NONE
+        self.decimation_tolerance = 0.5
+
+    def _set_points(self, points, close):
+        # Store the plot points in user space. points is an (N, 2) array in axes coordinates
+        if close:
+            points = np.concatenate((points, _points_array(close)))
+            self.closed = True
+        points = self.axes.transform_from_graph(points)
+        points[~np.isfinite(points).all(axis=1)] = np.nan
+        self.points = points
+
+    def _plot_curve(self, curve, start, end, precision, close, adaptive, tolerance):
+        # curve is a function that accepts a 1D array of parameter values and returns an (N, 2) array of points in
+        # axes coordinates
+        if adaptive:
+            points = self._adaptive_sample(curve, start, end, precision, tolerance)
+        else:
+            points = curve(np.linspace(start, end, precision))
+        self._set_points(points, close)
+
+    def _adaptive_sample(self, curve, start, end, precision, tolerance):
+        '''
+        Sample a curve so that, in device space, the straight line between any two adjacent samples is within
+        `tolerance` pixels of the curve.
+
+        The curve is first sampled at `precision` evenly spaced parameter values. Every interval is then tested by
+        evaluating the curve at its midpoint and quarter points. If any of these is more than `tolerance` pixels from
+        the corresponding point of the straight line joining the ends of the interval, the interval is split in two,
+        and so on up to ADAPTIVE_MAX_DEPTH times. Each level is evaluated for all the intervals at once. The quarter
+        points catch features that are symmetrical about the midpoint, such as a steep step, which would pass a
+        midpoint only test.
+
+        Intervals that still fail the test after ADAPTIVE_MAX_DEPTH splits are treated as discontinuities (eg a jump
+        or an asymptote), as are intervals where the curve is not finite at one end. The path is broken at those
+        points. A break is represented by a row of NaN values.
+
+        Returns:
+            (N, 2) array of points in axes coordinates
+        '''
+        to_device = Matrix.of_cairo(self.ctx.get_matrix())
+
+        def device(points):
+            # Non-finite points mark breaks in the curve, so they don't need a warning
+            with np.errstate(invalid='ignore', over='ignore'):
+                return to_device.apply(self.axes.transform_from_graph(points))
+
+        # Visible area of the axes in device space, with a margin
+        corners = to_device.apply(((self.axes.position[0], self.axes.position[1]),
+                                   (self.axes.position[0] + self.axes.width, self.axes.position[1] + self.axes.height)))
+        low, high = corners.min(axis=0), corners.max(axis=0)
+        margin = (high - low) / 10
+        low, high = low - margin, high + margin
+
+        def outside(*point_arrays):
+            # True for intervals that lie entirely beyond one edge of the visible area, so can't be seen
+            with np.errstate(invalid='ignore'):
+                return (np.logical_and.reduce([p < low for p in point_arrays]).any(axis=1)
+                        | np.logical_and.reduce([p > high for p in point_arrays]).any(axis=1))
+
+        ts = np.linspace(start, end, max(precision, 2))
+        points = curve(ts)
+        all_t = [ts]
+        all_points = [points]
+        device_points = device(points)
+        a_t, b_t = ts[:-1], ts[1:]
+        a_d, b_d = device_points[:-1], device_points[1:]
+        for depth in range(ADAPTIVE_MAX_DEPTH):
+            if not len(a_t):
+                break
+            n = len(a_t)
+            m_t = (a_t + b_t) / 2
+            q_t = np.concatenate((m_t, (3 * a_t + b_t) / 4, (a_t + 3 * b_t) / 4))
+            q_points = curve(q_t)
+            m_points = q_points[:n]
+            all_t.append(m_t)
+            all_points.append(m_points)
+            q_d = device(q_points)
+            m_d, q1_d, q3_d = q_d[:n], q_d[n:2 * n], q_d[2 * n:]
+
+            with np.errstate(invalid='ignore', over='ignore'):
+                deviation = np.max((np.hypot(*(m_d - (a_d + b_d) / 2).T),
+                                    np.hypot(*(q1_d - (3 * a_d + b_d) / 4).T),
+                                    np.hypot(*(q3_d - (a_d + 3 * b_d) / 4).T)), axis=0)
+                finite = np.isfinite(a_d).all(axis=1) | np.isfinite(b_d).all(axis=1)
+                refine = ((deviation > tolerance) | (np.isnan(deviation) & finite)) \
+                         & ~outside(a_d, q1_d, m_d, q3_d, b_d)
+            if depth == ADAPTIVE_MAX_DEPTH - 1:
+                # Break the curve in the half of each failing interval that has the longest chord
+                with np.errstate(invalid='ignore', over='ignore'):
+                    left = np.hypot(*(m_d - a_d).T)
+                    right = np.hypot(*(b_d - m_d).T)
+                    in_left = ~(right > left)
+                break_t = np.where(in_left, (a_t + m_t) / 2, (m_t + b_t) / 2)[refine]
+                all_t.append(break_t)
+                all_points.append(np.full((len(break_t), 2), np.nan))
+                break
+
+            a_t, m_t, b_t = a_t[refine], m_t[refine], b_t[refine]
+            a_d, m_d, b_d = a_d[refine], m_d[refine], b_d[refine]
+            a_t, b_t = np.concatenate((a_t, m_t)), np.concatenate((m_t, b_t))
+            a_d, b_d = np.concatenate((a_d, m_d)), np.concatenate((m_d, b_d))
+
+        order = np.argsort(np.concatenate(all_t), kind='stable')
+        points = np.concatenate(all_points)[order]
+        # A single break is enough between two sections of the curve
+        missing = ~np.isfinite(points).all(axis=1)
+        return points[~(missing & np.concatenate(([False], missing[:-1])))]
+
+    def decimate(self, mode=DECIMATE_SIMPLIFY, tolerance=0.5):
+        '''
+        Reduce the number of points that are drawn, for plots with very many points. This works in the same way as
+        `Polygon.decimate`. Each section of the curve between breaks is decimated separately.
+
+        Args:
+            mode: `DECIMATE_SIMPLIFY`, `DECIMATE_COLUMNS` or `DECIMATE_NONE`, see `Polygon.decimate`.
+            tolerance: number - see `Polygon.decimate`.
+
+        Returns:
+            self
+        '''
+        self.decimation = mode
+        self.decimation_tolerance = tolerance
+        return self
+
+    def _decimated_points(self):
+        # Decimate each section of the curve between NaN breaks, keeping one break between sections
+        points = self.points
+        if self.decimation == DECIMATE_NONE or len(points) < 3:
+            return points
+        breaks = np.flatnonzero(np.isnan(points).any(axis=1))
+        sections = []
+        for section in np.split(points, breaks):
+            if len(section) and np.isnan(section[0]).any():
+                sections.append(section[:1])
+                section = section[1:]
+            if len(section):
+                sections.append(_decimate(self.ctx, section, self.decimation, self.decimation_tolerance))
+        return np.concatenate(sections)
 
     def add(self):
         self._do_path_()
         first = True
-        for p in self.points:
-            if first:
+        broken = False
+        for p in self._decimated_points().tolist():
+            if math.isnan(p[0]) or math.isnan(p[1]):
+                # NaN marks a break in the curve, eg a discontinuity
+                broken = True
+            elif first:
                 if not self.extend:
                     self.ctx.move_to(*p)
                 first = False
+                broken = False
+            elif broken:
+                self.ctx.move_to(*p)
+                broken = False
             else:
                 self.ctx.line_to(*p)
         if self.closed or self.final_close:
@@ -573,7 +977,7 @@ class Plot(Shape):
         super().stroke(pattern, line_width, dash, cap, join, miter_limit)
 
 
-    def of_function(self, fn, extent=None, precision=100, close=()):
+    def of_function(self, fn, extent=None, precision=100, close=(), vectorized=False, adaptive=False, tolerance=0.5):
         '''
         Plot a function y = fn(x)
 
@@ -583,23 +987,27 @@ class Plot(Shape):
             precision: number of points to plot. Defaults to 100. This can be increased if needed for hi res plots
             close: sequence of (x, y) points. One or more additional points, defined in axes coordinates, that will be added
                     to the plot path to create a polygon. The polygon will also be closed. This allows an area under the curve to be filled.
+            vectorized: if True, `fn` is called once with a NumPy array containing all the sample values, and must return
+                an array of results. This is much faster for large `precision` values, provided `fn` is written using
+                NumPy functions (eg `np.sin` rather than `math.sin`). Otherwise `fn` is called once per sample.
+            adaptive: if True, `precision` points are used as a starting point, and extra points are added wherever the
+                curve bends, until it is accurate to within `tolerance` device pixels. The curve is broken at any
+                discontinuities, such as jumps or asymptotes.
+            tolerance: maximum error in device pixels when `adaptive` is True.
 
         Returns:
             self
         '''
-        self.points = []
         start = self.axes.appearance.start[0]
         end = self.axes.appearance.start[0] + self.axes.appearance.extent[0]
         if extent:
             start = max(start, extent[0])
             end = min(end, extent[1])
-        self.points += [self.axes.transform_from_graph((x, fn(x))) for x in np.linspace(start, end, precision)]
-        if close:
-            self.points += [self.axes.transform_from_graph(p) for p in close]
-            self.closed = True
+        self._plot_curve(lambda xs: np.column_stack((xs, _sample(fn, xs, vectorized))),
+                         start, end, precision, close, adaptive, tolerance)
         return self
 
-    def of_xy_function(self, fn, extent=None, precision=100, close=()):
+    def of_xy_function(self, fn, extent=None, precision=100, close=(), vectorized=False, adaptive=False, tolerance=0.5):
         '''
         Plot a function x = fn(y)
 
@@ -609,23 +1017,27 @@ class Plot(Shape):
             precision: number of points to plot. Defaults to 100. This can be increased if needed for hi res plots
             close: sequence of (x, y) points. One or more additional points, defined in axes coordinates, that will be added
                 to the plot path to create a polygon. The polygon will also be closed. This allows an area under the curve to be filled.
+            vectorized: if True, `fn` is called once with a NumPy array containing all the sample values, and must return
+                an array of results. This is much faster for large `precision` values, provided `fn` is written using
+                NumPy functions (eg `np.sin` rather than `math.sin`). Otherwise `fn` is called once per sample.
+            adaptive: if True, `precision` points are used as a starting point, and extra points are added wherever the
+                curve bends, until it is accurate to within `tolerance` device pixels. The curve is broken at any
+                discontinuities, such as jumps or asymptotes.
+            tolerance: maximum error in device pixels when `adaptive` is True.
 
         Returns:
             self
         '''
-        self.points = []
         start = self.axes.appearance.start[1]
         end = self.axes.appearance.start[1] + self.axes.appearance.extent[1]
         if extent:
             start = max(start, extent[0])
             end = min(end, extent[1])
-        self.points += [self.axes.transform_from_graph((fn(y), y)) for y in np.linspace(start, end, precision)]
-        if close:
-            self.points += [self.axes.transform_from_graph(p) for p in close]
-            self.closed = True
+        self._plot_curve(lambda ys: np.column_stack((_sample(fn, ys, vectorized), ys)),
+                         start, end, precision, close, adaptive, tolerance)
         return self
 
-    def of_polar_function(self, fn, extent=(0, 2*math.pi), precision=100, close=()):
+    def of_polar_function(self, fn, extent=(0, 2*math.pi), precision=100, close=(), vectorized=False, adaptive=False, tolerance=0.5):
         '''
         Plot a polar function r = fn(theta). theta is measured in radians
 
@@ -635,20 +1047,25 @@ class Plot(Shape):
             precision: number of points to plot. Defaults to 100. This can be increased if needed for hi res plots
             close: sequence of (x, y) points. One or more additional points, defined in axes coordinates, that will be added
                 to the plot path to create a polygon. The polygon will also be closed. This allows an area under the curve to be filled.
+            vectorized: if True, `fn` is called once with a NumPy array containing all the sample values, and must return
+                an array of results. This is much faster for large `precision` values, provided `fn` is written using
+                NumPy functions (eg `np.sin` rather than `math.sin`). Otherwise `fn` is called once per sample.
+            adaptive: if True, `precision` points are used as a starting point, and extra points are added wherever the
+                curve bends, until it is accurate to within `tolerance` device pixels. The curve is broken at any
+                discontinuities, such as jumps or asymptotes.
+            tolerance: maximum error in device pixels when `adaptive` is True.
 
         Returns:
             self
         '''
-        self.points = []
-        for theta in np.linspace(extent[0], extent[1], precision):
-            r = fn(theta)
-            self.points.append(self.axes.transform_from_graph((r*math.cos(theta), r*math.sin(theta))))
-        if close:
-            self.points += [self.axes.transform_from_graph(p) for p in close]
-            self.closed = True
+        def curve(thetas):
+            rs = _sample(fn, thetas, vectorized)
+            return np.column_stack((rs*np.cos(thetas), rs*np.sin(thetas)))
+
+        self._plot_curve(curve, extent[0], extent[1], precision, close, adaptive, tolerance)
         return self
 
-    def of_parametric_function(self, fx, fy, extent=(0, 1), precision=100, close=()):
+    def of_parametric_function(self, fx, fy, extent=(0, 1), precision=100, close=(), vectorized=False, adaptive=False, tolerance=0.5):
         '''
         Plot a parametric function x = fx(t), y = ft(t).
 
@@ -659,18 +1076,19 @@ class Plot(Shape):
             precision: number of points to plot. Defaults to 100. This can be increased if needed for hi res plots
             close: sequence of (x, y) points. One or more additional points, defined in axes coordinates, that will be added
                 to the plot path to create a polygon. The polygon will also be closed. This allows an area under the curve to be filled.
+            vectorized: if True, `fx` and `fy` are each called once with a NumPy array containing all the t values, and must
+                return arrays of results. This is much faster for large `precision` values, provided the functions are
+                written using NumPy functions (eg `np.sin` rather than `math.sin`). Otherwise they are called once per sample.
+            adaptive: if True, `precision` points are used as a starting point, and extra points are added wherever the
+                curve bends, until it is accurate to within `tolerance` device pixels. The curve is broken at any
+                discontinuities, such as jumps or asymptotes.
+            tolerance: maximum error in device pixels when `adaptive` is True.
 
         Returns:
             self
         '''
-        self.points = []
-        for t in np.linspace(extent[0], extent[1], precision):
-            x = fx(t)
-            y = fy(t)
-            self.points.append(self.axes.transform_from_graph((x, y)))
-        if close:
-            self.points += [self.axes.transform_from_graph(p) for p in close]
-            self.closed = True
+        self._plot_curve(lambda ts: np.column_stack((_sample(fx, ts, vectorized), _sample(fy, ts, vectorized))),
+                         extent[0], extent[1], precision, close, adaptive, tolerance)
         return self
 
 
@@ -747,16 +1165,36 @@ class Scatter:
             self
         '''
 
-        graph_points = [self.axes.transform_from_graph(p) for p in self.points]
+        points = _points_array(self.points)
+        graph_points = self.axes.transform_from_graph(points)
         if self.line_style == SCATTER_CONNECTED:
             Polygon(self.ctx).of_points(graph_points).open().stroke(self.stroke_params)
         if self.line_style == SCATTER_STALK:
-            x_values = [p[0] for p in self.points]
-            bases = [self.axes.transform_from_graph((x, 0)) for x in x_values]
-            for p, b in zip(graph_points, bases):
-                Line(self.ctx).of_start_end(b, p).stroke(self.stroke_params)
-        for p in graph_points:
-            Circle(self.ctx).of_center_radius(p, self.point_size).fill(self.fill.pattern, self.fill.fill_rule)
+            # All the stalks are added to a single path, and stroked in one operation
+            bases = self.axes.transform_from_graph(np.column_stack((points[:, 0], np.zeros(len(points)))))
+            self.ctx.new_path()
+            for p, b in zip(graph_points.tolist(), bases.tolist()):
+                self.ctx.move_to(*b)
+                self.ctx.line_to(*p)
+            self.stroke_params.apply(self.ctx)
+            self.ctx.stroke()
+
+        if self.fill.fill_rule != WINDING:
+            # With other fill rules, overlapping points in a single path would cancel out, so fill them one at a time
+            for p in graph_points.tolist():
+                Circle(self.ctx).of_center_radius(p, self.point_size).fill(self.fill.pattern, self.fill.fill_rule)
+            return self
+
+        # All the points are added to a single path, and filled in one operation. With the winding rule, overlapping
+        # points are filled solid, as if they were filled one at a time.
+        radius = self.point_size
+        self.ctx.new_path()
+        for x, y in graph_points.tolist():
+            self.ctx.move_to(x + radius, y)
+            self.ctx.arc(x, y, radius, 0, 2 * math.pi)
+            self.ctx.close_path()
+        self.fill.apply(self.ctx)
+        self.ctx.fill()
         return self
 
 
@@ -0,0 +1,186 @@
+# Author:  Martin McBride
+# Created: 2026-10-19
+# Copyright (C) 2026, Martin McBride
+# License: MIT
+"""
+The lsystem module expands L-system rules and draws the result using a `geometry.Turtle`.
+
+After many iterations an L-system string can be hundreds of megabytes long. The `LSystem` class never creates the
+full string. It expands the rules depth first, producing the result as a sequence of strings of moderate length, so
+that the memory used depends on the number of iterations rather than the length of the result.
+"""
+
+import numpy as np
+
+from generativepy.geometry import _turtle_segments
+
+# Target length of each string produced by LSystem.chunks
+LSYSTEM_CHUNK_SIZE = 65536
+
+
+class LSystem:
+    """
+    An L-system, defined by an axiom (the initial string) and a set of rules. Each iteration replaces every character
+    that has a rule with the rule's replacement string. Characters without a rule are left unchanged.
+
+    The result can be drawn with a turtle, using the commands described for `geometry.Turtle.execute`.
+    """
+
+    def __init__(self, axiom, rules):
+        """
+        Args:
+            axiom: str - The initial string.
+            rules: dict - Maps single characters to their replacement strings, for example `{'F': 'F+F--F+F'}`.
+
+        Returns:
+            self
+        """
+        self.axiom = axiom
+        self.rules = dict(rules)
+        self._lengths = {}
+        self._expansions = {}
+
+    def _length(self, c, iterations):
+        """
+        Length of the expansion of character `c` after `iterations` iterations, without expanding it.
+        """
+        if iterations == 0 or c not in self.rules:
+            return 1
+        key = (c, iterations)
+        length = self._lengths.get(key)
+        if length is None:
+            length = sum(self._length(r, iterations - 1) for r in self.rules[c])
+            self._lengths[key] = length
+        return length
+
+    def _expansion(self, c, iterations):
+        """
+        Expansion of character `c` after `iterations` iterations. Only used for expansions that are no longer than
+        `LSYSTEM_CHUNK_SIZE`, so the stored expansions have bounded size.
+        """
+        if iterations == 0 or c not in self.rules:
+            return c
+        key = (c, iterations)
+        expansion = self._expansions.get(key)
+        if expansion is None:
+            expansion = ''.join([self._expansion(r, iterations - 1) for r in self.rules[c]])
+            self._expansions[key] = expansion
+        return expansion
+
+    def length(self, iterations):
+        """
+        Calculate the length of the expanded string, without expanding it.
+
+        Args:
+            iterations: int - Number of iterations.
+
+        Returns:
+            Length of the string.
+        """
+        return sum(self._length(c, iterations) for c in self.axiom)
+
+    def chunks(self, iterations):
+        """
+        Expand the L-system, as a sequence of strings. Joining the strings would give the full expanded string. Each
+        string is approximately `LSYSTEM_CHUNK_SIZE` characters long, apart from the last.
+
+        Args:
+            iterations: int - Number of iterations.
+
+        Yields:
+            str - the next part of the expanded string.
+        """
+        parts = []
+        size = 0
+        stack = [(iter(self.axiom), iterations)]
+        while stack:
+            chars, remaining = stack[-1]
+            c = next(chars, None)
+            if c is None:
+                stack.pop()
+                continue
+            length = self._length(c, remaining)
+            if length <= LSYSTEM_CHUNK_SIZE:
+                parts.append(self._expansion(c, remaining))
+                size += length
+                if size >= LSYSTEM_CHUNK_SIZE:
+                    yield ''.join(parts)
+                    parts = []
+                    size = 0
+            else:
+                stack.append((iter(self.rules[c]), remaining - 1))
+        if parts:
+            yield ''.join(parts)
+
+    def expand(self, iterations):
+        """
+        Expand the L-system, one character at a time.
+
+        Args:
+            iterations: int - Number of iterations.
+
+        Yields:
+            str - the next character of the expanded string.
+        """
+        for chunk in self.chunks(iterations):
+            yield from chunk
+
+    def string(self, iterations):
+        """
+        Expand the L-system into a single string. This should only be used if the string is reasonably short, see
+        `length`.
+
+        Args:
+            iterations: int - Number of iterations.
+
+        Returns:
+            str - the expanded string.
+        """
+        return ''.join(self.chunks(iterations))
+
+    def segments(self, iterations, distance, angle, start=(0, 0), heading=0):
+        """
+        Calculate the line segments drawn by a turtle following the expanded L-system. The segments can be drawn on
+        each frame of an animation using `Turtle.draw_segments`, without expanding the L-system again.
+
+        Args:
+            iterations: int - Number of iterations.
+            distance: number - The distance moved by each `F`, `G` or `f` command.
+            angle: number - The angle turned by each `+` or `-` command, in radians.
+            start: (number, number) - the start position of the turtle.
+            heading: number - the start heading of the turtle.
+
+        Returns:
+            (N, 4) NumPy array of segments, each row (x0, y0, x1, y1).
+        """
+        x, y = start
+        stack = []
+        arrays = []
+        for chunk in self.chunks(iterations):
+            segments, x, y, heading = _turtle_segments(chunk, x, y, heading, distance, angle, stack)
+            arrays.append(segments)
+        if not arrays:
+            return np.empty((0, 4), dtype=np.float64)
+        return np.concatenate(arrays)
+
+    def draw(self, turtle, iterations, distance, angle):
+        """
+        Draw the expanded L-system using a turtle, starting at the turtle's current position and heading, in the
+        turtle's current style. The commands are streamed to the turtle in parts, and each part is drawn as a
+        batch, so the full string and the full set of segments are never held in memory.
+
+        Args:
+            turtle: `geometry.Turtle` - the turtle.
+            iterations: int - Number of iterations.
+            distance: number - The distance moved by each `F`, `G` or `f` command.
+            angle: number - The angle turned by each `+` or `-` command, in radians.
+
+        Returns:
+            self
+        """
+        stack = []
+        for chunk in self.chunks(iterations):
+            segments, turtle.x, turtle.y, turtle.heading = _turtle_segments(chunk, turtle.x, turtle.y, turtle.heading,
+                                                                            distance, angle, stack)
+            turtle.draw_segments(segments)
+        return self
@@ -3,6 +3,8 @@
 # Copyright (C) 2023, Martin McBride
 # License: MIT
 import math
+import numbers
+import numpy as np
 """
 The math module provides basic implementation of 2D vectors and matrices.
 
@@ -26,6 +28,30 @@ def isclose(a, b, rel_tol=1e-09, abs_tol=1e-12):
     return abs(a - b) <= max(rel_tol * max(abs(a), abs(b)), abs_tol)
 
 
+def _to_array(values, dims, name):
+    """
+    Convert a sequence of vectors/points, an array based object from this module, or an array like object to an
+    (N, dims) float64 array.
+    """
+    if isinstance(values, (Points, _VectorArrayBase)):
+        values = values.array
+    elif not isinstance(values, np.ndarray):
+        values = [tuple(v) for v in values]
+    array = np.asarray(values, dtype=np.float64)
+    if array.size == 0:
+        return np.empty((0, dims), dtype=np.float64)
+    if array.ndim != 2 or array.shape[1] != dims:
+        raise ValueError("{} requires a sequence of items, each with {} elements".format(name, dims))
+    return array
+
+
+def _array_isclose(a, b):
+    """
+    Vectorised equivalent of `isclose` applied to every element of two arrays. Returns a single bool.
+    """
+    return bool(np.all(np.abs(a - b) <= np.maximum(1e-09 * np.maximum(np.abs(a), np.abs(b)), 1e-12)))
+
+
 class Matrix():
     """
     Class to represent a 2D transform matrix:
@@ -111,9 +137,76 @@ class Matrix():
         f = p[3] * q[2] + p[4] * q[5] + p[5]
         return Matrix(a, b, c, d, e, f)
 
+    @staticmethod
+    def of_cairo(cairo_matrix):
+        """
+        Create a matrix from a Pycairo matrix, for example the value returned by `ctx.get_matrix()`.
+
+        Note that a Pycairo matrix stores its elements in a different order to a generativepy matrix.
+
+        Args:
+            cairo_matrix: cairo.Matrix - the Pycairo matrix
+
+        Returns:
+            New matrix
+        """
+        xx, yx, xy, yy, xt, yt = cairo_matrix
+        return Matrix(xx, xy, xt, yx, yy, yt)
+
     def __init__(self, xx, xy, xt, yx, yy, yt):
         self.matrix = (xx, xy, xt, yx, yy, yt)
 
+    @property
+    def determinant(self):
+        """
+        Read-only property returns the determinant of the 2 by 2 linear part of the matrix.
+        """
+        return self[0] * self[4] - self[1] * self[3]
+
+    def inverse(self):
+        """
+        Calculate the inverse of this matrix. Transforming a point by a matrix and then by its inverse gives the
+        original point.
+
+        Returns:
+            New matrix
+
+        Raises:
+            ValueError if the matrix is not invertible
+        """
+        xx, xy, xt, yx, yy, yt = self
+        det = xx * yy - xy * yx
+        if det == 0:
+            raise ValueError("Matrix is not invertible")
+        return Matrix(yy / det, -xy / det, (xy * yt - yy * xt) / det,
+                      -yx / det, xx / det, (yx * xt - xx * yt) / det)
+
+    def apply(self, points):
+        """
+        Transform an array of points by this matrix, in a single operation. Each point is pre-multiplied by the matrix.
+
+        Args:
+            points: (N, 2) array, `Points` object, or sequence of points - the points to transform.
+
+        Returns:
+            New (N, 2) NumPy array of transformed points.
+        """
+        points = _to_array(points, 2, "Matrix.apply")
+        linear = np.array(((self[0], self[3]), (self[1], self[4])), dtype=np.float64)
+        return points @ linear + (self[2], self[5])
+
+    def to_cairo(self):
+        """
+        Convert this matrix to a Pycairo matrix. The Pycairo matrix can be applied to a context, for example using
+        `ctx.transform(m.to_cairo())`, so that drawing operations are transformed in the same way as `m * point`.
+
+        Returns:
+            New cairo.Matrix
+        """
+        import cairo
+        xx, xy, xt, yx, yy, yt = self
+        return cairo.Matrix(xx, yx, xy, yy, xt, yt)
+
     def __iter__(self):
         return iter(self.matrix)
 
@@ -170,6 +263,160 @@ class Matrix():
         return repr(self)
 
 
+class AffineMatrix(Matrix):
+    """
+    A mutable version of `Matrix`, for building up chains of transforms without creating a new matrix at each step.
+
+    The `compose_xxx` methods update the matrix in place and return self, so they can be chained. Each one
+    post-multiplies the matrix, in the same way that Pycairo `ctx.translate`, `ctx.rotate` etc update the current
+    transform. So this code:
+
+    ```
+    m = AffineMatrix().compose_translate(100, 50).compose_rotate(angle)
+    ```
+
+    creates a matrix that rotates points by `angle` and then translates them by (100, 50).
+
+    An `AffineMatrix` can be used anywhere a `Matrix` can be used. Operators such as `*` and `+` return new immutable
+    `Matrix` objects.
+    """
+
+    def __init__(self, xx=1, xy=0, xt=0, yx=0, yy=1, yt=0):
+        """
+        Create a matrix. With no parameters, creates a unit matrix.
+
+        Args:
+            xx, xy, xt, yx, yy, yt: numbers - the matrix elements
+        """
+        self.matrix = [xx, xy, xt, yx, yy, yt]
+
+    @staticmethod
+    def of_matrix(m):
+        """
+        Create an affine matrix with the same values as an existing matrix
+
+        Args:
+            m: `Matrix` or sequence of 6 numbers
+
+        Returns:
+            New affine matrix
+        """
+        return AffineMatrix(*m)
+
+    def copy(self):
+        """
+        Create a copy of this matrix
+
+        Returns:
+            New affine matrix
+        """
+        return AffineMatrix(*self.matrix)
+
+    def to_matrix(self):
+        """
+        Create an immutable `Matrix` with the same values as this matrix
+
+        Returns:
+            New matrix
+        """
+        return Matrix(*self.matrix)
+
+    def reset(self):
+        """
+        Set this matrix to the unit matrix
+
+        Returns:
+            self
+        """
+        self.matrix[:] = (1, 0, 0, 0, 1, 0)
+        return self
+
+    def compose(self, other):
+        """
+        Multiply this matrix by other, in place. The result transforms points by other, then by the original matrix.
+
+        Args:
+            other: `Matrix` - the matrix to compose.
+
+        Returns:
+            self
+        """
+        p = self.matrix
+        p0, p1, p3, p4 = p[0], p[1], p[3], p[4]
+        p[0], p[1], p[2] = p0 * other[0] + p1 * other[3], p0 * other[1] + p1 * other[4], p0 * other[2] + p1 * other[5] + p[2]
+        p[3], p[4], p[5] = p3 * other[0] + p4 * other[3], p3 * other[1] + p4 * other[4], p3 * other[2] + p4 * other[5] + p[5]
+        return self
+
+    def compose_translate(self, x, y):
+        """
+        Compose a translation with this matrix, in place.
+
+        Args:
+            x: Translation in x direction
+            y: Translation in y direction
+
+        Returns:
+            self
+        """
+        p = self.matrix
+        p[2] += p[0] * x + p[1] * y
+        p[5] += p[3] * x + p[4] * y
+        return self
+
+    def compose_scale(self, scale_x, scale_y=None):
+        """
+        Compose a scaling with this matrix, in place.
+
+        Args:
+            scale_x: Scale factor in x direction
+            scale_y: Scale factor in y direction, defaults to scale_x
+
+        Returns:
+            self
+        """
+        if scale_y is None:
+            scale_y = scale_x
+        p = self.matrix
+        p[0] *= scale_x
+        p[3] *= scale_x
+        p[1] *= scale_y
+        p[4] *= scale_y
+        return self
+
+    def compose_rotate(self, angle):
+        """
+        Compose a rotation with this matrix, in place.
+
+        Args:
+            angle: Angle in radians, measured counterclockwise from positive x direction
+
+        Returns:
+            self
+        """
+        c = math.cos(angle)
+        s = math.sin(angle)
+        p = self.matrix
+        p[0], p[1] = p[0] * c + p[1] * s, p[1] * c - p[0] * s
+        p[3], p[4] = p[3] * c + p[4] * s, p[4] * c - p[3] * s
+        return self
+
+    def invert(self):
+        """
+        Replace this matrix with its inverse, in place.
+
+        Returns:
+            self
+
+        Raises:
+            ValueError if the matrix is not invertible
+        """
+        self.matrix[:] = self.inverse()
+        return self
+
+    def __repr__(self):
+        return "AffineMatrix({0}, {1}, {2}, {3}, {4}, {5})".format(*self.matrix)
+
+
 class Vector():
     """
     Class to represent a 2-vector including most of its common operations
@@ -315,6 +562,8 @@ class Vector():
         return self * -1
 
     def __add__(self, other):
+        if isinstance(other, _VectorArrayBase):
+            return NotImplemented
         return Vector(self.x + other.x, self.y + other.y)
 
     def __sub__(self, other):
@@ -465,6 +714,8 @@ class Vector3:
         return self * -1
 
     def __add__(self, other):
+        if isinstance(other, _VectorArrayBase):
+            return NotImplemented
         return Vector3(self.x + other.x, self.y + other.y, self.z + other.z)
 
     def __sub__(self, other):
@@ -530,9 +781,13 @@ class Vector3:
 
 class Points:
     """
-    Points array stores a list of `Vector` objects.
+    Points array stores a list of 2D points.
+
+    The points are held in an (N, 2) NumPy array of float64 values, available as the `array` property. Iterating over a
+    `Points` object, or indexing it, returns `Vector` objects, so it can be used anywhere a sequence of points is expected.
 
     It provides various ways to transform all the points in the list, and static methods to create new sets of points.
+    Each transform is applied to the whole array in a single operation.
 
     It also implements pre-multiplication by a matrix. To transform all the points in list `p` by matrix `m`, use:
 
@@ -540,7 +795,7 @@ class Points:
     """
 
     @staticmethod
-    def regular_polygon(sides, centre=(0, 0), radius=1, flat_base=True):
+    def regular_polygon(sides, centre=(0, 0), radius=1, flat_base=True, angle=0):
         """
         Create the points for a regular polygon.
 
@@ -549,23 +804,35 @@ class Points:
             centre: tuple - position of polygon centre.
             radius: number - Outer radius (distance from centre to any vertex).
             flat_base: bool - ff true, the polygon will have a flat base. Otherwise, vertex 0 will be on +ve x-axis.
+            angle: number - Angle to rotate the polygon about its centre.
 
         Returns:
             A new `Points` item containing the vertices.
         """
-        centre_angle = math.pi * 2 / sides
-        angle = math.pi / 2 - centre_angle / 2 if flat_base else 0
-        angles = [angle + centre_angle * i for i in range(sides)]
-
-        return Points(((radius * math.cos(a) + centre[0], radius * math.sin(a) + centre[1]) for a in angles))
+        return Points(regular_polygons(sides, (centre,), radius, flat_base, angle)[0])
 
     def __init__(self, points):
         """
         Initialise a new points object.
         Args:
-            points: tuple of tuples - the points to include.
+            points: tuple of tuples, `Points` or `VectorArray` object, or (N, 2) array - the points to include.
         """
-        self.points = tuple(Vector(p) for p in points)
+        self._array = _to_array(points, 2, "Points")
+
+    @property
+    def array(self):
+        """
+        Read-only property returns the points as an (N, 2) NumPy array. The array should not be modified.
+        """
+        return self._array
+
+    @property
+    def points(self):
+        """
+        Read-only property returns the points as a tuple of `Vector` objects. This creates a new `Vector` for every
+        point, so `array` should be used where possible.
+        """
+        return tuple(Vector(*p) for p in self._array.tolist())
 
     def transform(self, m):
         """
@@ -578,13 +845,15 @@ class Points:
         """
         return m*self
 
-    def scale(self, scale_x, scale_y=0):
+    def scale(self, scale_x, scale_y=None):
         """
         Apply scale transform to every point.
 
         Args:
             scale_x: number - x scale factor
-            scale_y: number - y scale factor
+            scale_y: number - y scale factor. If this is None, scale by scale_x in both directions. Earlier versions
+                     defaulted to 0, which moved every point onto the x-axis. The default is now None, to match
+                     `Vector.scale`.
 
         Returns:
             New transformed `Points` object.
@@ -619,27 +888,695 @@ class Points:
         return Matrix.rotate(angle)*self
 
     def __iter__(self):
-        return iter(self.points)
+        return (Vector(p) for p in self._array.tolist())
 
     def __len__(self):
-        return len(self.points)
+        return len(self._array)
 
     def __getitem__(self, index):
-        return self.points[index]
+        if isinstance(index, slice):
+            return Points(self._array[index])
+        return Vector(self._array[index].tolist())
 
     def __eq__(self, other):
         if len(self) != len(other):
             return False
+        if isinstance(other, Points):
+            return _array_isclose(self._array, other.array)
         return all([a == b for a, b in zip(self, other)])
 
     def __rmul__(self, other):
         if isinstance(other, Matrix):
-            return Points(Vector.matrix_premultiply(other, p) for p in self.points)
+            return Points(other.apply(self._array))
         return NotImplemented
 
     def __repr__(self):
-        return "Points(" + ", ".join((str(p) for p in self.points)) + ")"
+        return "Points(" + ", ".join((str(p) for p in self)) + ")"
 
     def __str__(self):
         return repr(self)
 
+
+class _VectorArrayBase:
+    """
+    Base class for `VectorArray` and `Vector3Array`. Holds an (N, dims) float64 array and implements the operations
+    that are common to 2D and 3D vectors. Operations are applied to every vector in a single NumPy operation.
+    """
+
+    dims = None
+    scalar_type = None
+
+    # Make NumPy defer to our reflected operators, so that `ndarray * vector_array` scales each vector
+    __array_ufunc__ = None
+
+    def __init__(self, vectors):
+        self._array = _to_array(vectors, self.dims, type(self).__name__)
+
+    def _new(self, array):
+        return type(self)(array)
+
+    def _operand(self, other):
+        # Convert other to something that will broadcast against self._array, or None if it is not supported
+        if isinstance(other, (_VectorArrayBase, Points)):
+            return other.array
+        if isinstance(other, self.scalar_type):
+            return np.array(other.coords, dtype=np.float64)
+        return None
+
+    @staticmethod
+    def _factor(factor):
+        # A scalar factor, or an array of N factors that applies one factor per vector
+        factor = np.asarray(factor, dtype=np.float64)
+        return factor[:, np.newaxis] if factor.ndim == 1 else factor
+
+    @property
+    def array(self):
+        """
+        Read-only property returns the vectors as an (N, dims) NumPy array. The array should not be modified.
+        """
+        return self._array
+
+    def lerp(self, other, factor):
+        """
+        Interpolate between each vector in this array and the corresponding vector in other.
+
+        The `factor` parameter works in the same way as for the scalar `lerp` method. It can be a single number, or an
+        array of N numbers giving a different factor for each vector.
+
+        Args:
+            other: vector array of the same length, or a single vector that every vector is interpolated towards.
+            factor: number or array of numbers - The interpolation amount.
+
+        Returns:
+            New vector array
+        """
+        factor = self._factor(factor)
+        return self._new((1 - factor) * self._array + factor * self._operand(other))
+
+    def dot(self, other):
+        """
+        Dot product of each vector in this array with the corresponding vector in other.
+
+        Args:
+            other: vector array of the same length, or a single vector.
+
+        Returns:
+            NumPy array of N dot products
+        """
+        return np.sum(self._array * self._operand(other), axis=1)
+
+    def __iter__(self):
+        return (self.scalar_type(v) for v in self._array.tolist())
+
+    def __len__(self):
+        return len(self._array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._new(self._array[index])
+        return self.scalar_type(self._array[index].tolist())
+
+    def __eq__(self, other):
+        if len(self) != len(other):
+            return False
+        if isinstance(other, _VectorArrayBase):
+            return _array_isclose(self._array, other.array)
+        return all([a == b for a, b in zip(self, other)])
+
+    def __neg__(self):
+        return self._new(-self._array)
+
+    def __add__(self, other):
+        other = self._operand(other)
+        if other is None:
+            return NotImplemented
+        return self._new(self._array + other)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        other = self._operand(other)
+        if other is None:
+            return NotImplemented
+        return self._new(self._array - other)
+
+    def __rsub__(self, other):
+        other = self._operand(other)
+        if other is None:
+            return NotImplemented
+        return self._new(other - self._array)
+
+    def __mul__(self, other):
+        # vector array * scalar, or vector array * array of N scalars
+        if isinstance(other, (numbers.Real, np.ndarray)):
+            return self._new(self._array * self._factor(other))
+        # vector array * vector gives the dot products
+        if self._operand(other) is not None:
+            return self.dot(other)
+        return NotImplemented
+
+    def __rmul__(self, other):
+        if isinstance(other, (numbers.Real, np.ndarray)):
+            return self.__mul__(other)
+        if isinstance(other, self.scalar_type):
+            return self.dot(other)
+        return NotImplemented
+
+    def __truediv__(self, other):
+        if isinstance(other, (numbers.Real, np.ndarray)):
+            return self._new(self._array / self._factor(other))
+        return NotImplemented
+
+    def __floordiv__(self, other):
+        if isinstance(other, (numbers.Real, np.ndarray)):
+            return self._new(self._array // self._factor(other))
+        return NotImplemented
+
+    @property
+    def x(self):
+        """
+        Read-only property returns array of x components.
+        """
+        return self._array[:, 0]
+
+    @property
+    def y(self):
+        """
+        Read-only property returns array of y components.
+        """
+        return self._array[:, 1]
+
+    @property
+    def length(self):
+        """
+        Read-only property returns array of vector lengths.
+        """
+        return np.sqrt(np.sum(self._array ** 2, axis=1))
+
+    @property
+    def unit(self):
+        """
+        Read-only property returns an array of unit vectors with the same directions as the vectors in this array
+        """
+        return self / self.length
+
+    def __repr__(self):
+        return type(self).__name__ + "(" + ", ".join((str(v) for v in self)) + ")"
+
+    def __str__(self):
+        return repr(self)
+
+
+class VectorArray(_VectorArrayBase):
+    """
+    Class to represent an array of 2-vectors, supporting the same operations as `Vector` applied to every vector at
+    once.
+
+    The vectors are held in an (N, 2) NumPy array of float64 values. Iterating over a `VectorArray`, or indexing it,
+    returns `Vector` objects.
+
+    A `VectorArray` can be created from a `Points` object, and vice versa. It can also be used anywhere a sequence of
+    points is expected, for example `Polygon.of_points`.
+
+    Operations between two vector arrays apply element by element. A single `Vector` can also be used as the other
+    operand, in which case it applies to every vector in the array.
+    """
+
+    dims = 2
+    scalar_type = Vector
+
+    @staticmethod
+    def polar(length, angle):
+        """
+        Create a vector array based on arrays of lengths and angles.
+
+        Args:
+            length: number or array - Length of each vector
+            angle: number or array - Angle of each vector in radians, measured counterclockwise from positive x
+                direction
+
+        Returns:
+            New vector array
+        """
+        length, angle = np.broadcast_arrays(np.asarray(length, dtype=np.float64), np.asarray(angle, dtype=np.float64))
+        return VectorArray(np.stack((length * np.cos(angle), length * np.sin(angle)), axis=-1).reshape(-1, 2))
+
+    @staticmethod
+    def matrix_premultiply(m, v):
+        """
+        Multiply a matrix (first) and each vector of a vector array (second)
+
+        Args:
+            m: matrix
+            v: vector array
+
+        Returns:
+            New vector array
+        """
+        return VectorArray(m.apply(v))
+
+    def transform(self, m):
+        """
+        Transform every vector by a matrix. Each vector is pre-multiplied by the matrix
+
+        Args:
+            m: matrix
+
+        Returns:
+            New transformed vector array
+        """
+        return m * self
+
+    def scale(self, scale_x, scale_y=None):
+        """
+        Scale every vector by a factor.
+
+        Args:
+            scale_x: scale factor in x direction.
+            scale_y: scale factor in y direction. If this is None, scale by scale_x in both directions.
+
+        Returns:
+            New scaled vector array
+        """
+        return Matrix.scale(scale_x, scale_y) * self
+
+    def translate(self, x, y):
+        """
+        Translate every vector by (x, y),
+
+        Args:
+            x: translation amount in x direction.
+            y: translation amount in y direction.
+
+        Returns:
+            New translated vector array
+        """
+        return Matrix.translate(x, y) * self
+
+    def rotate(self, angle):
+        """
+        Rotate every vector by an angle
+
+        Args:
+            angle: Angle in radians, measured counterclockwise from positive x direction
+
+        Returns:
+            New rotated vector array
+        """
+        return Matrix.rotate(angle) * self
+
+    def __rmul__(self, other):
+        if isinstance(other, Matrix):
+            return VectorArray.matrix_premultiply(other, self)
+        return super().__rmul__(other)
+
+    @property
+    def angle(self):
+        """
+        Read-only property returns array of vector angles.
+        """
+        return np.arctan2(self._array[:, 1], self._array[:, 0])
+
+
+class Vector3Array(_VectorArrayBase):
+    """
+    Class to represent an array of 3-vectors, supporting the same operations as `Vector3` applied to every vector at
+    once.
+
+    The vectors are held in an (N, 3) NumPy array of float64 values. Iterating over a `Vector3Array`, or indexing it,
+    returns `Vector3` objects.
+    """
+
+    dims = 3
+    scalar_type = Vector3
+
+    @property
+    def z(self):
+        """
+        Read-only property returns array of z components.
+        """
+        return self._array[:, 2]
+
+
+class SpatialIndex:
+    """
+    Spatial index for fast neighbour queries over a set of 2D points.
+
+    The index is a uniform grid. Each point is stored in the grid cell that contains it, so a query only needs to look
+    at the points in nearby cells rather than every point. This makes algorithms such as Poisson-disc sampling,
+    nearest-neighbour line drawing and circle packing roughly O(n) rather than O(n²).
+
+    Points can be added when the index is created, or inserted one at a time later. Each point is identified by its
+    index, which is the order in which it was added, starting from 0.
+
+    For best performance, `cell_size` should be similar to the typical query radius.
+    """
+
+    def __init__(self, cell_size, points=()):
+        """
+        Create a spatial index.
+
+        Args:
+            cell_size: number - the size of each grid cell, in the same units as the points.
+            points: (N, 2) array, `Points` object, or sequence of points - initial points to add to the index.
+        """
+        if cell_size <= 0:
+            raise ValueError("cell_size must be greater than zero")
+        self.cell_size = cell_size
+        self._array = np.empty((16, 2), dtype=np.float64)
+        self._count = 0
+        self._cells = {}
+        self._min_cell = None
+        self._max_cell = None
+        self.insert_many(points)
+
+    def _cell(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _reserve(self, count):
+        # Grow the point storage, doubling its size so that repeated inserts are amortised O(1)
+        if count > len(self._array):
+            array = np.empty((max(count, 2 * len(self._array)), 2), dtype=np.float64)
+            array[:self._count] = self._array[:self._count]
+            self._array = array
+
+    def _extend_bounds(self, low, high):
+        if self._min_cell is None:
+            self._min_cell, self._max_cell = low, high
+        else:
+            self._min_cell = (min(self._min_cell[0], low[0]), min(self._min_cell[1], low[1]))
+            self._max_cell = (max(self._max_cell[0], high[0]), max(self._max_cell[1], high[1]))
+
+    def insert(self, point):
+        """
+        Add a single point to the index.
+
+        Args:
+            point: (number, number) - the point to add.
+
+        Returns:
+            The index of the new point.
+        """
+        x, y = point
+        self._reserve(self._count + 1)
+        n = self._count
+        self._array[n] = (x, y)
+        self._count += 1
+        cell = self._cell(x, y)
+        self._cells.setdefault(cell, []).append(n)
+        self._extend_bounds(cell, cell)
+        return n
+
+    def insert_many(self, points):
+        """
+        Add several points to the index in a single operation.
+
+        Args:
+            points: (N, 2) array, `Points` object, or sequence of points - the points to add.
+
+        Returns:
+            NumPy array containing the index of each new point.
+        """
+        points = _to_array(points, 2, "SpatialIndex")
+        start = self._count
+        count = len(points)
+        if not count:
+            return np.arange(start, start)
+        self._reserve(start + count)
+        self._array[start:start + count] = points
+        self._count += count
+
+        # Group the new points by cell, so that each cell's list is extended once
+        keys = np.floor(points / self.cell_size).astype(np.int64)
+        order = np.lexsort((keys[:, 1], keys[:, 0]))
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.concatenate(([True], np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1))))
+        ends = np.append(starts[1:], count).tolist()
+        indices = (order + start).tolist()
+        cells = self._cells
+        for cell, i, j in zip(map(tuple, sorted_keys[starts].tolist()), starts.tolist(), ends):
+            if cell in cells:
+                cells[cell].extend(indices[i:j])
+            else:
+                cells[cell] = indices[i:j]
+        self._extend_bounds(tuple(keys.min(axis=0).tolist()), tuple(keys.max(axis=0).tolist()))
+        return np.arange(start, start + count)
+
+    def _cell_lists(self, low, high):
+        # Yield the point lists of the occupied cells in the range low to high inclusive. The range is clamped to the
+        # occupied cells, and if it still covers more cells than are occupied, the occupied cells are scanned instead,
+        # so the cost never depends on the size of an empty search area
+        if self._min_cell is None:
+            return
+        l0, l1 = max(low[0], self._min_cell[0]), max(low[1], self._min_cell[1])
+        h0, h1 = min(high[0], self._max_cell[0]), min(high[1], self._max_cell[1])
+        if l0 > h0 or l1 > h1:
+            return
+        cells = self._cells
+        if (h0 - l0 + 1) * (h1 - l1 + 1) > len(cells):
+            for (i, j), cell in cells.items():
+                if l0 <= i <= h0 and l1 <= j <= h1:
+                    yield cell
+        else:
+            for i in range(l0, h0 + 1):
+                for j in range(l1, h1 + 1):
+                    cell = cells.get((i, j))
+                    if cell:
+                        yield cell
+
+    def _candidates(self, low, high):
+        # List of the indices of all points in cells in the range low to high inclusive
+        result = []
+        for cell in self._cell_lists(low, high):
+            result.extend(cell)
+        return result
+
+    def query_radius(self, point, radius):
+        """
+        Find all points within a given distance of a point.
+
+        Args:
+            point: (number, number) - the centre of the search.
+            radius: number - the search radius. Points at exactly this distance are included.
+
+        Returns:
+            NumPy array containing the index of each point found, in ascending order.
+        """
+        x, y = point
+        low = self._cell(x - radius, y - radius)
+        high = self._cell(x + radius, y + radius)
+        candidates = np.array(self._candidates(low, high), dtype=np.int64)
+        if not len(candidates):
+            return candidates
+        d = self._array[candidates] - (x, y)
+        found = candidates[np.einsum('ij,ij->i', d, d) <= radius * radius]
+        found.sort()
+        return found
+
+    def any_within(self, point, radius):
+        """
+        Check whether any point lies within a given distance of a point. This is faster than `query_radius` when only
+        a yes/no answer is needed, for example when rejecting candidates in Poisson-disc sampling or circle packing.
+
+        Args:
+            point: (number, number) - the centre of the search.
+            radius: number - the search radius. Points at exactly this distance are included.
+
+        Returns:
+            True if there is at least one point within the radius, false otherwise.
+        """
+        x, y = point
+        r2 = radius * radius
+        low = self._cell(x - radius, y - radius)
+        high = self._cell(x + radius, y + radius)
+        array = self._array
+        for cell in self._cell_lists(low, high):
+            for n in cell:
+                dx = array[n, 0] - x
+                dy = array[n, 1] - y
+                if dx * dx + dy * dy <= r2:
+                    return True
+        return False
+
+    def query_nearest(self, point, k=1):
+        """
+        Find the k nearest points to a point.
+
+        The search starts at the first ring of cells around the point that reaches the occupied cells, and moves
+        outwards one ring of cells at a time, until the k nearest points are known.
+
+        Args:
+            point: (number, number) - the centre of the search.
+            k: int - the number of points to find. If the index holds fewer than k points, all the points are returned.
+
+        Returns:
+            NumPy array containing the index of each point found, nearest first.
+        """
+        k = min(k, self._count)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        x, y = point
+        cx, cy = self._cell(x, y)
+        # Furthest ring that could contain any points
+        max_ring = max(abs(cx - self._min_cell[0]), abs(cx - self._max_cell[0]),
+                       abs(cy - self._min_cell[1]), abs(cy - self._max_cell[1]))
+        # First ring that could contain any points, the inner rings are all empty
+        ring = max(self._min_cell[0] - cx, cx - self._max_cell[0], self._min_cell[1] - cy, cy - self._max_cell[1], 0)
+        candidates = []
+        while True:
+            if ring == 0:
+                candidates.extend(self._cells.get((cx, cy), ()))
+            else:
+                candidates.extend(self._candidates((cx - ring, cy - ring), (cx + ring, cy - ring)))
+                candidates.extend(self._candidates((cx - ring, cy + ring), (cx + ring, cy + ring)))
+                candidates.extend(self._candidates((cx - ring, cy - ring + 1), (cx - ring, cy + ring - 1)))
+                candidates.extend(self._candidates((cx + ring, cy - ring + 1), (cx + ring, cy + ring - 1)))
+            if len(candidates) >= k:
+                found = np.array(candidates, dtype=np.int64)
+                d = self._array[found] - (x, y)
+                dist2 = np.einsum('ij,ij->i', d, d)
+                # Any point outside the rings searched so far is at least ring*cell_size away
+                if ring >= max_ring or math.sqrt(np.partition(dist2, k - 1)[k - 1]) <= ring * self.cell_size:
+                    return found[np.argsort(dist2, kind='stable')[:k]]
+            ring += 1
+
+    @property
+    def points(self):
+        """
+        Read-only property returns all the points in the index, as a `Points` object.
+        """
+        return Points(self._array[:self._count])
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if not -self._count <= index < self._count:
+            raise IndexError("SpatialIndex index out of range")
+        return Vector(self._array[index % self._count].tolist())
+
+
+def simplify_polyline(points, tolerance):
+    """
+    Simplify a polyline using the Ramer–Douglas–Peucker algorithm.
+
+    Points are removed if the simplified line passes within `tolerance` of them, measured to the nearest point of the
+    simplified line segment. The first and last points are always kept. This works well for general curves, but for long noisy time series `decimate_polyline_columns` is faster.
+
+    Args:
+        points: (N, 2) array, `Points` object, or sequence of points - the polyline vertices.
+        tolerance: number - the maximum distance between a removed point and the simplified line.
+
+    Returns:
+        NumPy array containing the indices of the points to keep, in ascending order.
+    """
+    points = _to_array(points, 2, "simplify_polyline")
+    n = len(points)
+    if n < 3:
+        return np.arange(n)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        a, b = points[i], points[j]
+        d = points[i + 1:j] - a
+        chord = b - a
+        chord_length2 = chord[0] * chord[0] + chord[1] * chord[1]
+        if chord_length2 == 0:
+            distances = np.hypot(d[:, 0], d[:, 1])
+        else:
+            # Distance to the chord segment, so points beyond either end of the chord are measured to that end
+            t = np.clip((d[:, 0] * chord[0] + d[:, 1] * chord[1]) / chord_length2, 0, 1)
+            distances = np.hypot(d[:, 0] - t * chord[0], d[:, 1] - t * chord[1])
+        k = int(np.argmax(distances))
+        if distances[k] > tolerance:
+            k += i + 1
+            keep[k] = True
+            stack.append((i, k))
+            stack.append((k, j))
+    return np.flatnonzero(keep)
+
+
+def decimate_polyline_columns(points, column_width=1):
+    """
+    Decimate a polyline by keeping, for each run of consecutive points that fall in the same column, only the first,
+    last, lowest and highest points.
+
+    When the points are in device space and `column_width` is 1 pixel, this gives the same image as the full line for
+    time series data, but with at most 4 points per pixel column.
+
+    Args:
+        points: (N, 2) array, `Points` object, or sequence of points - the polyline vertices.
+        column_width: number - the width of each column.
+
+    Returns:
+        NumPy array containing the indices of the points to keep, in ascending order.
+    """
+    points = _to_array(points, 2, "decimate_polyline_columns")
+    n = len(points)
+    if n < 5:
+        return np.arange(n)
+    columns = np.floor(points[:, 0] / column_width)
+    starts = np.flatnonzero(np.concatenate(([True], columns[1:] != columns[:-1])))
+    ends = np.append(starts[1:], n) - 1
+    runs = np.cumsum(np.concatenate(([True], columns[1:] != columns[:-1]))) - 1
+    # Sort by run then y, so the first and last entries of each run are its lowest and highest points
+    order = np.lexsort((points[:, 1], runs))
+    return np.unique(np.concatenate((starts, ends, order[starts], order[ends])))
+
+
+def regular_polygons(sides, centres, radius=1, flat_base=True, angle=0):
+    """
+    Create the vertices of many regular polygons with the same number of sides, in a single operation.
+
+    Args:
+        sides: int - number of sides of each polygon.
+        centres: (N, 2) array, `Points` object, or sequence of points - the centre of each polygon.
+        radius: number or sequence of N numbers - Outer radius of every polygon, or of each polygon.
+        flat_base: bool - If true, the polygons will have a flat base. Otherwise, vertex 0 will be on +ve x-axis.
+        angle: number or sequence of N numbers - Angle to rotate every polygon, or each polygon, about its centre.
+
+    Returns:
+        (N, sides, 2) NumPy array of vertices.
+    """
+    centres = _to_array(centres, 2, "regular_polygons")
+    n = len(centres)
+    centre_angle = math.pi * 2 / sides
+    start = math.pi / 2 - centre_angle / 2 if flat_base else 0
+    angles = (np.broadcast_to(np.asarray(angle, dtype=np.float64), (n,))[:, np.newaxis]
+              + (start + centre_angle * np.arange(sides)))
+    radii = np.broadcast_to(np.asarray(radius, dtype=np.float64), (n,))[:, np.newaxis]
+    vertices = np.empty((n, sides, 2), dtype=np.float64)
+    vertices[:, :, 0] = centres[:, 0:1] + radii * np.cos(angles)
+    vertices[:, :, 1] = centres[:, 1:2] + radii * np.sin(angles)
+    return vertices
+
+
+def hex_grid(rows, columns, radius=1, origin=(0, 0)):
+    """
+    Create the centres of the cells of a hexagonal grid, for hexagons with a flat base, such as those created by
+    `regular_polygons(6, centres, radius)`.
+
+    Cells are ordered row by row. Each row is `sqrt(3)*radius` below the previous row, each column is `1.5*radius`
+    to the right of the previous column, and odd numbered columns are offset downwards by half a row.
+
+    Args:
+        rows: int - number of rows.
+        columns: int - number of columns.
+        radius: number - Outer radius of each hexagon.
+        origin: tuple - position of the centre of the first cell.
+
+    Returns:
+        (rows*columns, 2) NumPy array of cell centres.
+    """
+    row_height = math.sqrt(3) * radius
+    x = origin[0] + 1.5 * radius * np.arange(columns)
+    y = origin[1] + row_height * np.arange(rows)[:, np.newaxis] + (np.arange(columns) % 2) * (row_height / 2)
+    centres = np.empty((rows, columns, 2), dtype=np.float64)
+    centres[:, :, 0] = x
+    centres[:, :, 1] = y
+    return centres.reshape(-1, 2)
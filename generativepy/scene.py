@@ -0,0 +1,264 @@
+# Author:  Martin McBride
+# Created: 2026-10-19
+# Copyright (C) 2026, Martin McBride
+# License: MIT
+"""
+The scene module provides a retained mode alternative to drawing each animation frame from scratch.
+
+A `Scene` holds a list of `Node` objects. Each node holds a `geometry` shape, `Text` or `Image` object (or a drawing
+function) along with its fill and stroke styles. When a node is changed, or added to or removed from the scene, only
+the area of the image covered by the node before and after the change is redrawn. The rest of the previous frame is
+kept, so the cost of each frame depends on how much of the image has changed rather than on the size of the image.
+"""
+
+import math
+import cairo
+import numpy as np
+
+import generativepy.utils
+from generativepy.drawing import setup
+from generativepy.geometry import Shape, Image
+
+
+class Node:
+    """
+    A node holds one item in a `Scene`, along with the style used to draw it.
+
+    The item can be:
+
+    * Any `geometry.Shape` object, including `Text`. The shape is filled and/or stroked using the `fill` and `stroke`
+      styles.
+    * A `geometry.Image` object. The image is painted.
+    * A function that accepts a Pycairo context and draws on it.
+
+    Shape and image objects can be created with `None` in place of the context, because the scene supplies the
+    context when the node is drawn.
+
+    After changing a node, call `update` so that the scene knows to redraw it.
+    """
+
+    def __init__(self, item, fill=None, stroke=None):
+        """
+        Args:
+            item: Shape, Image, or function - the item to draw.
+            fill: `Color`, `Pattern` or `FillParameters` - the fill style for shapes, or None for no fill.
+            stroke: `Color`, `Pattern` or `StrokeParameters` - the stroke style for shapes, or None for no outline.
+
+        Returns:
+            self
+        """
+        self.item = item
+        self.fill = fill
+        self.stroke = stroke
+        self.dirty = True
+        self.recording = None
+        self.bounds = None
+
+    def update(self, item=None, fill=None, stroke=None):
+        """
+        Marks the node as changed, and optionally replaces its item and styles.
+
+        Args:
+            item: Shape, Image, or function - the new item to draw, or None to keep the existing item.
+            fill: the new fill style, or None to keep the existing style.
+            stroke: the new stroke style, or None to keep the existing style.
+
+        Returns:
+            self
+        """
+        if item is not None:
+            self.item = item
+        if fill is not None:
+            self.fill = fill
+        if stroke is not None:
+            self.stroke = stroke
+        self.dirty = True
+        return self
+
+    def draw(self, ctx):
+        """
+        Draw the node on a context.
+
+        Args:
+            ctx: Pycairo context - the context to draw on.
+        """
+        if isinstance(self.item, Shape):
+            self.item.ctx = ctx
+            self.item.added = False
+            if self.fill is not None:
+                self.item.fill(self.fill)
+            if self.stroke is not None:
+                self.item.stroke(self.stroke)
+            ctx.new_path()
+        elif isinstance(self.item, Image):
+            self.item.ctx = ctx
+            self.item.paint()
+        else:
+            self.item(ctx)
+
+
+class Scene:
+    """
+    A retained mode scene. Nodes are drawn in the order they were added, so later nodes appear on top of earlier nodes.
+
+    Each call to `render` creates the next frame. Only the regions of the image affected by nodes that have been
+    updated, added or removed since the previous frame are redrawn.
+    """
+
+    def __init__(self, width, height, channels=3, background=None):
+        """
+        Args:
+            width: int - The width of the image, in pixels.
+            height: int - The height of the image, in pixels.
+            channels: int - The number of colour channels. 3 for RGB, 4 for RGBA.
+            background: `Color` - Color of the background. None for black (RGB) or transparent (RGBA).
+
+        Returns:
+            self
+        """
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.background = background
+        self.nodes = []
+        self.setup_params = None
+        fmt = cairo.FORMAT_ARGB32 if channels == 4 else cairo.FORMAT_RGB24
+        self.surface = cairo.ImageSurface(fmt, width, height)
+        self.full_redraw = True
+        self.dirty_rects = []
+
+    def with_setup(self, width=None, height=None, startx=0, starty=0, flip=False):
+        """
+        Set the user space coordinates of the scene. The parameters are as described for `drawing.setup`.
+
+        Args:
+            width: number  - The user space width.
+            height: number  -  The user space height.
+            startx: number  - The x offset of the top left corner from the origin.
+            starty: number  - The y offset of the top left corner from the origin.
+            flip: bool  - If true, flips the page in the y direction.
+
+        Returns:
+            self
+        """
+        self.setup_params = dict(width=width, height=height, startx=startx, starty=starty, flip=flip)
+        for node in self.nodes:
+            node.dirty = True
+        self.full_redraw = True
+        return self
+
+    def add(self, node):
+        """
+        Add a node to the top of the scene.
+
+        Args:
+            node: `Node` - the node to add.
+
+        Returns:
+            The node
+        """
+        node.dirty = True
+        self.nodes.append(node)
+        return node
+
+    def remove(self, node):
+        """
+        Remove a node from the scene.
+
+        Args:
+            node: `Node` - the node to remove.
+        """
+        self.nodes.remove(node)
+        if node.bounds:
+            self.dirty_rects.append(node.bounds)
+
+    def _record(self, node):
+        """
+        Record the drawing operations of a node, and find its bounds in device space.
+        """
+        recording = cairo.RecordingSurface(cairo.CONTENT_COLOR_ALPHA, None)
+        ctx = cairo.Context(recording)
+        if self.setup_params is not None:
+            setup(ctx, self.width, self.height, **self.setup_params)
+        node.draw(ctx)
+        x, y, width, height = recording.ink_extents()
+        node.recording = recording
+        if width > 0 and height > 0:
+            # Whole pixel bounds, with a margin for antialiasing
+            x0 = max(math.floor(x) - 1, 0)
+            y0 = max(math.floor(y) - 1, 0)
+            x1 = min(math.ceil(x + width) + 1, self.width)
+            y1 = min(math.ceil(y + height) + 1, self.height)
+            node.bounds = (x0, y0, x1 - x0, y1 - y0) if x1 > x0 and y1 > y0 else None
+        else:
+            node.bounds = None
+        node.dirty = False
+
+    @staticmethod
+    def _intersects(a, b):
+        return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+    def render(self):
+        """
+        Render the next frame. Only the parts of the image that have changed since the previous frame are redrawn.
+
+        Returns:
+            A frame, a NumPy array with shape (height, width, channels).
+        """
+        dirty_rects = self.dirty_rects
+        for node in self.nodes:
+            if node.dirty:
+                if node.bounds:
+                    dirty_rects.append(node.bounds)
+                self._record(node)
+                if node.bounds:
+                    dirty_rects.append(node.bounds)
+
+        if self.full_redraw:
+            dirty_rects = [(0, 0, self.width, self.height)]
+            self.full_redraw = False
+
+        if dirty_rects:
+            ctx = cairo.Context(self.surface)
+            for rect in dirty_rects:
+                ctx.rectangle(*rect)
+            ctx.clip()
+
+            ctx.set_operator(cairo.OPERATOR_SOURCE)
+            if self.background:
+                ctx.set_source_rgba(*self.background)
+            else:
+                ctx.set_source_rgba(0, 0, 0, 0)
+            ctx.paint()
+            ctx.set_operator(cairo.OPERATOR_OVER)
+
+            for node in self.nodes:
+                if node.bounds and any(self._intersects(node.bounds, rect) for rect in dirty_rects):
+                    ctx.set_source_surface(node.recording, 0, 0)
+                    ctx.paint()
+        self.dirty_rects = []
+
+        self.surface.flush()
+        a = np.frombuffer(self.surface.get_data(), np.uint8).copy()
+        a.shape = (self.height, self.width, 4)
+        a = generativepy.utils.correct_pycairo_byte_order(a, self.channels)
+        return a[:, :, :self.channels]
+
+    def frames(self, update, count):
+        """
+        Create a sequence of frames. This is the scene equivalent of `drawing.make_image_frames`, and can be used
+        in the same way.
+
+        The update function is called before each frame is rendered. It should change the scene as required, for
+        example by updating nodes, and must have the signature `update(scene, frame_no, frame_count)`.
+
+        Args:
+            update: function - the update function.
+            count: int - the number of frames to create.
+
+        Yields:
+            A frame.
+        """
+        for i in range(count):
+            update(self, i, count)
+            yield self.render()
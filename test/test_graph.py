@@ -1,6 +1,12 @@
 import unittest
+import math
+import warnings
 import cairo
-from generativepy.graph import Axes
+import numpy as np
+from generativepy import graph
+from generativepy.graph import Axes, Plot, Scatter, SCATTER_STALK, get_divisions, get_subdivisions, nice_division
+from generativepy.geometry import EVEN_ODD
+from generativepy.color import Color
 from generativepy.math import Vector as V
 
 
@@ -38,6 +44,173 @@ class TestGraph(unittest.TestCase):
         t = axes.transform_from_graph(())
         self.assertEqual(len(t), 0)
 
+    def test_axes_points_array(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 200)
+        ctx = cairo.Context(surface)
+        axes = Axes(ctx, (20, 30), 400, 500).of_start((1, 2)).of_extent((4, 10))
+        t = axes.transform_from_graph(np.array([[2, 4], [4, 2]]))
+        self.assertIsInstance(t, np.ndarray)
+        np.testing.assert_allclose(t, [[120, 430], [320, 530]])
+
+    def test_plot_vectorized(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 200)
+        ctx = cairo.Context(surface)
+        axes = Axes(ctx, (20, 30), 400, 500).of_start((1, 2)).of_extent((4, 10))
+        p1 = Plot(axes).of_function(lambda x: x*x + 1, precision=50)
+        p2 = Plot(axes).of_function(lambda x: x*x + 1, precision=50, vectorized=True)
+        np.testing.assert_allclose(p1.points, p2.points)
+        p3 = Plot(axes).of_parametric_function(np.cos, lambda t: 2, precision=20, vectorized=True)
+        self.assertEqual(p3.points.shape, (20, 2))
+
+    def test_plot_vectorized_fallback(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 200)
+        ctx = cairo.Context(surface)
+        axes = Axes(ctx, (20, 30), 400, 500).of_start((1, 2)).of_extent((4, 10))
+        # math.sin doesn't accept arrays, so it is called once per sample
+        p1 = Plot(axes).of_function(math.sin, precision=50, vectorized=True)
+        p2 = Plot(axes).of_function(np.sin, precision=50, vectorized=True)
+        np.testing.assert_allclose(p1.points, p2.points)
+
+    def test_plot_adaptive(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 500, 500)
+        ctx = cairo.Context(surface)
+        axes = Axes(ctx, (0, 0), 500, 500).of_start((-5, -5)).of_extent((10, 10))
+        p = Plot(axes).of_function(np.sin, precision=50, vectorized=True, adaptive=True)
+        self.assertFalse(np.isnan(p.points).any())
+        p = Plot(axes).of_function(np.tan, precision=50, vectorized=True, adaptive=True)
+        breaks = np.flatnonzero(np.isnan(p.points[:, 0]))
+        self.assertEqual(len(breaks), 4)
+        np.testing.assert_allclose(p.points[breaks - 1, 0] / 50 - 5, [-3*np.pi/2, -np.pi/2, np.pi/2, 3*np.pi/2], atol=0.001)
+
+    def test_plot_adaptive_symmetric(self):
+        # A steep step that is symmetrical about the centre of the initial sample intervals
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 500, 500)
+        ctx = cairo.Context(surface)
+        axes = Axes(ctx, (0, 0), 500, 500).of_start((-5, -5)).of_extent((10, 10))
+
+        def fn(x):
+            return 4*np.tanh(50*x)
+
+        points = Plot(axes).of_function(fn, vectorized=True, adaptive=True).points
+        self.assertFalse(np.isnan(points).any())
+        # Perpendicular distance from the true curve to each segment of the plotted line, in device space
+        for a, b in zip(points[:-1], points[1:]):
+            x = np.linspace(a[0], b[0], 20) / 50 - 5
+            curve = axes.transform_from_graph(np.column_stack((x, fn(x))))
+            chord = b - a
+            t = np.clip((curve - a) @ chord / (chord @ chord), 0, 1)
+            self.assertLessEqual(np.max(np.hypot(*(curve - a - np.outer(t, chord)).T)), 0.5)
+
+        p = Plot(axes).of_function(lambda x: np.arctan(1e4*x), precision=50, vectorized=True, adaptive=True)
+        self.assertGreater(len(p.points), 99)
+
+    def test_plot_adaptive_no_warnings(self):
+        # Infinite and NaN values mark breaks in the curve, so don't cause warnings
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 500, 500)
+        ctx = cairo.Context(surface)
+        axes = Axes(ctx, (0, 0), 500, 500).of_start((-5, -5)).of_extent((10, 10))
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            p = Plot(axes).of_function(lambda x: np.where(np.abs(x - 1) < 0.5, np.inf, x), precision=50,
+                                       vectorized=True, adaptive=True)
+            self.assertTrue(np.isnan(p.points).any())
+            Plot(axes).of_function(lambda x: np.where(x > 2, np.nan, x), precision=50, vectorized=True, adaptive=True)
+
+    def test_scatter_batched(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 100)
+        ctx = cairo.Context(surface)
+        axes = Axes(ctx, (0, 0), 100, 100).of_start((0, 0)).of_extent((10, 10))
+        Scatter(axes).of_points([(5, 5), (2, 8)]).with_point_style(3, pattern=Color(1, 0, 0))\
+            .with_line_style(SCATTER_STALK, Color(0, 0, 1), 2).plot()
+        surface.flush()
+        data = surface.get_data()
+        stride = surface.get_stride()
+
+        def pixel(x, y):
+            return tuple(data[y*stride + x*4:y*stride + x*4 + 3])
+
+        # Pixels are stored in BGR order
+        self.assertEqual(pixel(50, 50), (0, 0, 255))
+        self.assertEqual(pixel(20, 20), (0, 0, 255))
+        self.assertEqual(pixel(35, 35), (0, 0, 0))
+        self.assertEqual(pixel(50, 80), (255, 0, 0))
+        self.assertEqual(list(ctx.copy_path()), [])
+
+    def test_scatter_even_odd(self):
+        # Overlapping points are filled solid whatever the fill rule
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 100)
+        ctx = cairo.Context(surface)
+        axes = Axes(ctx, (0, 0), 100, 100).of_start((0, 0)).of_extent((10, 10))
+        Scatter(axes).of_points([(5, 5), (5.2, 5)]).with_point_style(5, pattern=Color(1, 0, 0),
+                                                                     fill_rule=EVEN_ODD).plot()
+        surface.flush()
+        data = surface.get_data()
+        stride = surface.get_stride()
+        self.assertEqual(tuple(data[50*stride + 51*4:50*stride + 51*4 + 3]), (0, 0, 255))
+
+    def test_axes_static_layer_cache(self):
+        def draw(cached):
+            surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 200, 200)
+            ctx = cairo.Context(surface)
+            Axes(ctx, (10, 10), 180, 180).of_start((-2, -2)).of_extent((8, 8)).with_subdivisions((2, 2))\
+                .with_static_layer_cache(cached).draw()
+            surface.flush()
+            return np.frombuffer(surface.get_data(), np.uint8).astype(int)
+
+        graph.clear_static_layer_cache()
+        expected = draw(False)
+        self.assertEqual(len(graph._static_layer_cache), 0)
+        first = draw(True)
+        second = draw(True)
+        self.assertEqual(len(graph._static_layer_cache), 1)
+        # Compositing the cached layer can introduce small rounding differences
+        self.assertLessEqual(np.max(np.abs(first - expected)), 2)
+        self.assertTrue(np.array_equal(first, second))
+        graph.clear_static_layer_cache()
+
+    def test_axes_static_layer_cache_bounds(self):
+        # The cached layer only covers the axes and their labels, not the whole canvas
+        def draw(cached):
+            surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 800, 600)
+            ctx = cairo.Context(surface)
+            Axes(ctx, (300, 200), 150, 100).of_start((0, 0)).of_extent((3, 2))\
+                .with_static_layer_cache(cached).draw()
+            surface.flush()
+            return np.frombuffer(surface.get_data(), np.uint8).astype(int)
+
+        graph.clear_static_layer_cache()
+        expected = draw(False)
+        actual = draw(True)
+        layer, x0, y0, _ = next(iter(graph._static_layer_cache.values()))
+        self.assertLess(layer.get_width(), 300)
+        self.assertLess(layer.get_height(), 300)
+        self.assertGreater(x0, 200)
+        self.assertLessEqual(np.max(np.abs(actual - expected)), 2)
+        graph.clear_static_layer_cache()
+
+    def test_divisions(self):
+        self.assertEqual(get_divisions(-2, 8, 1), (-2, -1, 0, 1, 2, 3, 4, 5, 6))
+        self.assertEqual(get_divisions(-100, 500, 90), (-90, 0, 90, 180, 270, 360))
+        divs = get_divisions(0, 1000, 0.1)
+        self.assertEqual(len(divs), 10001)
+        self.assertAlmostEqual(divs[-1], 1000, places=12)
+
+    def test_subdivisions(self):
+        self.assertEqual(get_subdivisions(-100, 500, 90, 2), (-45, 45, 135, 225, 315))
+        subdivs = get_subdivisions(-1.1, 2.2, 0.5, 5)
+        self.assertEqual(len(subdivs), 18)
+        divs = get_divisions(-1.1, 2.2, 0.5)
+        for p in subdivs:
+            for d in divs:
+                self.assertGreater(abs(p - d), 0.01)
+
+    def test_nice_division(self):
+        self.assertEqual(nice_division(10), 1)
+        self.assertEqual(nice_division(7), 0.5)
+        self.assertEqual(nice_division(2500), 200)
+        self.assertEqual(nice_division(0.3), 0.02)
+        self.assertEqual(nice_division(100, 4), 20)
+
     def test_axes_error(self):
         surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 200)
         ctx = cairo.Context(surface)
@@ -0,0 +1,61 @@
+import unittest
+import cairo
+import numpy as np
+from PIL import Image as PILImage
+from generativepy.geometry import Image
+
+
+def pixels(surface):
+    surface.flush()
+    return np.frombuffer(surface.get_data(), np.uint32).reshape((surface.get_height(), surface.get_width()))
+
+
+class TestImageArray(unittest.TestCase):
+
+    def test_rgb(self):
+        array = np.zeros((2, 3, 3), dtype=np.uint8)
+        array[0, 1] = (10, 20, 30)
+        surface = Image.surface_from_array(array)
+        self.assertEqual(surface.get_format(), cairo.FORMAT_RGB24)
+        self.assertEqual((surface.get_width(), surface.get_height()), (3, 2))
+        self.assertEqual(pixels(surface)[0, 1] & 0xFFFFFF, 0x0A141E)
+
+    def test_grey(self):
+        array = np.full((2, 3), 100, dtype=np.uint8)
+        surface = Image.surface_from_array(array)
+        self.assertEqual(pixels(surface)[1, 2] & 0xFFFFFF, 0x646464)
+
+    def test_rgba(self):
+        array = np.zeros((2, 3, 4), dtype=np.uint8)
+        array[1, 0] = (255, 0, 0, 128)
+        surface = Image.surface_from_array(array)
+        self.assertEqual(surface.get_format(), cairo.FORMAT_ARGB32)
+        self.assertEqual(pixels(surface)[1, 0], 0x80800000)
+
+    def test_argb32_zero_copy(self):
+        array = np.zeros((2, 3), dtype=np.uint32)
+        surface = Image.surface_from_array(array)
+        array[0, 0] = 0xFF00FF00
+        self.assertEqual(pixels(surface)[0, 0], 0xFF00FF00)
+
+    def test_pil(self):
+        pil_image = PILImage.new('RGB', (3, 2), (10, 20, 30))
+        image = Image(None).of_file_position(pil_image, (0, 0))
+        self.assertEqual(pixels(image.image)[1, 2] & 0xFFFFFF, 0x0A141E)
+
+    def test_error(self):
+        with self.assertRaises(ValueError):
+            Image.surface_from_array(np.zeros((2, 3, 2), dtype=np.uint8))
+
+    def test_paint(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 10, 10)
+        ctx = cairo.Context(surface)
+        array = np.zeros((4, 4, 3), dtype=np.uint8)
+        array[:, :] = (0, 0, 255)
+        Image(ctx).of_file_position(array, (2, 2)).paint()
+        self.assertEqual(pixels(surface)[3, 3] & 0xFFFFFF, 0x0000FF)
+        self.assertEqual(pixels(surface)[8, 8] & 0xFFFFFF, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
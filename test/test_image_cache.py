@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+import cairo
+from generativepy import geometry
+from generativepy.geometry import Image
+
+
+class TestImageCache(unittest.TestCase):
+
+    def setUp(self):
+        geometry.clear_image_cache()
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'image.png')
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 64, 32)
+        ctx = cairo.Context(surface)
+        ctx.set_source_rgb(1, 0, 0)
+        ctx.paint()
+        surface.write_to_png(self.path)
+
+    def tearDown(self):
+        geometry.clear_image_cache()
+        self.folder.cleanup()
+
+    def create_context(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 100)
+        return cairo.Context(surface)
+
+    def test_cache(self):
+        ctx = self.create_context()
+        Image(ctx).of_file_position(self.path, (0, 0)).paint()
+        Image(ctx).of_file_position(self.path, (10, 10)).paint()
+        self.assertEqual(len(geometry._image_cache), 1)
+        self.assertEqual(geometry._image_cache_bytes, 64*4*32)
+
+        # Modifying the file reloads the image
+        mtime = os.path.getmtime(self.path)
+        os.utime(self.path, (mtime + 10, mtime + 10))
+        Image(ctx).of_file_position(self.path, (0, 0)).paint()
+        self.assertEqual(len(geometry._image_cache), 2)
+
+    def test_mip_levels(self):
+        ctx = self.create_context()
+        Image(ctx).of_file_position(self.path, (0, 0)).scale(0.2).paint()
+        levels = sorted(key[2] for key in geometry._image_cache)
+        self.assertEqual(levels, [0, 1, 2])
+        image = geometry._cached_image(self.path, 2)
+        self.assertEqual((image.get_width(), image.get_height()), (16, 8))
+
+    def test_cache_limit(self):
+        old_limit = geometry.IMAGE_CACHE_BYTES
+        geometry.IMAGE_CACHE_BYTES = 64*4*32
+        try:
+            ctx = self.create_context()
+            Image(ctx).of_file_position(self.path, (0, 0)).scale(0.4).paint()
+            self.assertEqual(len(geometry._image_cache), 1)
+        finally:
+            geometry.IMAGE_CACHE_BYTES = old_limit
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import math
+import unittest
+import numpy as np
+from generativepy import lsystem
+from generativepy.lsystem import LSystem
+from generativepy.geometry import _turtle_segments
+
+
+class TestLSystem(unittest.TestCase):
+
+    def naive_expand(self, axiom, rules, iterations):
+        s = axiom
+        for i in range(iterations):
+            s = ''.join(rules.get(c, c) for c in s)
+        return s
+
+    def test_string(self):
+        rules = {'X': 'F[+X][-X]FX', 'F': 'FF'}
+        system = LSystem('X', rules)
+        for i in range(6):
+            expected = self.naive_expand('X', rules, i)
+            self.assertEqual(system.string(i), expected)
+            self.assertEqual(system.length(i), len(expected))
+            self.assertEqual(''.join(system.expand(i)), expected)
+
+    def test_chunks(self):
+        rules = {'F': 'F+F--F+F'}
+        system = LSystem('F++F++F', rules)
+        old_size = lsystem.LSYSTEM_CHUNK_SIZE
+        lsystem.LSYSTEM_CHUNK_SIZE = 100
+        try:
+            chunks = list(LSystem('F++F++F', rules).chunks(5))
+        finally:
+            lsystem.LSYSTEM_CHUNK_SIZE = old_size
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(c) < 200 for c in chunks))
+        self.assertEqual(''.join(chunks), system.string(5))
+
+    def test_segments(self):
+        rules = {'X': 'F[+X][-X]FX', 'F': 'FF'}
+        system = LSystem('X', rules)
+        old_size = lsystem.LSYSTEM_CHUNK_SIZE
+        lsystem.LSYSTEM_CHUNK_SIZE = 50
+        try:
+            segments = system.segments(5, 2, math.pi/7, (10, 20), 1)
+        finally:
+            lsystem.LSYSTEM_CHUNK_SIZE = old_size
+        expected, _, _, _ = _turtle_segments(self.naive_expand('X', rules, 5), 10, 20, 1, 2, math.pi/7)
+        self.assertTrue(np.allclose(segments, expected))
+
+    def test_segments_empty(self):
+        self.assertEqual(LSystem('', {}).segments(3, 1, 1).shape, (0, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 import math
 
-from generativepy.math import Matrix
+from generativepy.math import Matrix, AffineMatrix
 
 class TestMatrix(unittest.TestCase):
 
@@ -112,3 +112,61 @@ class TestMatrix(unittest.TestCase):
         m = Matrix.rotate(math.radians(30))
         self.assertEqual(m==Matrix(0.8660254037, -0.5, 0, 0.5, 0.8660254037, 0), True)
 
+
+    def test_determinant(self):
+        m = Matrix(2, 3, 4, 5, 6, 7)
+        self.assertEqual(m.determinant, -3)
+
+    def test_inverse(self):
+        m = Matrix.translate(3, 4) * Matrix.rotate(0.5) * Matrix.scale(2, 3)
+        self.assertEqual(m * m.inverse(), Matrix.unit())
+        self.assertEqual(m.inverse() * m, Matrix.unit())
+        with self.assertRaises(ValueError):
+            Matrix(1, 2, 0, 2, 4, 0).inverse()
+
+    def test_apply(self):
+        m = Matrix(1, 2, 3, 4, 5, 6)
+        result = m.apply([[1, 2], [3, 4], [5, 6]])
+        self.assertEqual(result.shape, (3, 2))
+        self.assertEqual(result.tolist(), [[8, 20], [14, 38], [20, 56]])
+
+    def test_of_cairo(self):
+        # cairo.Matrix elements are ordered (xx, yx, xy, yy, x0, y0)
+        m = Matrix.of_cairo((2, 5, 3, 6, 4, 7))
+        self.assertEqual(m, Matrix(2, 3, 4, 5, 6, 7))
+
+
+class TestAffineMatrix(unittest.TestCase):
+
+    def test_create(self):
+        self.assertEqual(AffineMatrix(), Matrix.unit())
+        self.assertEqual(AffineMatrix.of_matrix(Matrix(2, 3, 4, 5, 6, 7)), Matrix(2, 3, 4, 5, 6, 7))
+
+    def test_compose(self):
+        m1 = Matrix(2, 3, 4, 5, 6, 7)
+        m2 = Matrix(20, 30, 40, 50, 60, 70)
+        a = AffineMatrix.of_matrix(m1)
+        self.assertIs(a.compose(m2), a)
+        self.assertEqual(a, m1 * m2)
+
+    def test_compose_chain(self):
+        a = AffineMatrix().compose_translate(3, 4).compose_rotate(0.5).compose_scale(2, 3)
+        self.assertEqual(a, Matrix.translate(3, 4) * Matrix.rotate(0.5) * Matrix.scale(2, 3))
+        self.assertEqual(a.reset(), Matrix.unit())
+
+    def test_invert(self):
+        a = AffineMatrix().compose_translate(3, 4).compose_rotate(0.5)
+        m = a.to_matrix()
+        a.invert()
+        self.assertEqual(a, m.inverse())
+        self.assertIsInstance(a * m, Matrix)
+        self.assertEqual(a * m, Matrix.unit())
+
+    def test_copy(self):
+        a = AffineMatrix(2, 3, 4, 5, 6, 7)
+        b = a.copy()
+        b.compose_translate(1, 1)
+        self.assertEqual(a, Matrix(2, 3, 4, 5, 6, 7))
+
+    def test_repr(self):
+        self.assertEqual(repr(AffineMatrix()), "AffineMatrix(1, 0, 0, 0, 1, 0)")
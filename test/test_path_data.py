@@ -0,0 +1,81 @@
+import pickle
+import unittest
+import cairo
+import numpy as np
+from generativepy.geometry import PathData, Path
+from generativepy.math import Matrix
+
+
+class RecordingContext():
+
+    def __init__(self):
+        self.calls = []
+
+    def new_path(self):
+        self.calls.append(('new_path',))
+
+    def move_to(self, x, y):
+        self.calls.append(('move_to', x, y))
+
+    def line_to(self, x, y):
+        self.calls.append(('line_to', x, y))
+
+    def curve_to(self, *args):
+        self.calls.append(('curve_to',) + args)
+
+    def close_path(self):
+        self.calls.append(('close_path',))
+
+
+class TestPathData(unittest.TestCase):
+
+    def create_path(self):
+        return PathData((cairo.PATH_MOVE_TO, cairo.PATH_LINE_TO, cairo.PATH_CURVE_TO, cairo.PATH_CLOSE_PATH),
+                        ((0, 0), (1, 0), (1, 1), (2, 1), (2, 2)))
+
+    def test_iter(self):
+        items = list(self.create_path())
+        self.assertEqual(items, [(cairo.PATH_MOVE_TO, (0, 0)), (cairo.PATH_LINE_TO, (1, 0)),
+                                 (cairo.PATH_CURVE_TO, (1, 1, 2, 1, 2, 2)), (cairo.PATH_CLOSE_PATH, ())])
+
+    def test_of_cairo_path(self):
+        path = self.create_path()
+        self.assertEqual(PathData.of_cairo_path(list(path)), path)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            PathData((cairo.PATH_MOVE_TO, cairo.PATH_CURVE_TO), ((0, 0), (1, 1)))
+        with self.assertRaises(ValueError):
+            PathData((9,), ((0, 0),))
+
+    def test_immutable(self):
+        path = self.create_path()
+        with self.assertRaises(ValueError):
+            path.points[0, 0] = 5
+
+    def test_pickle(self):
+        path = self.create_path()
+        copy = pickle.loads(pickle.dumps(path))
+        self.assertEqual(copy, path)
+        self.assertEqual(hash(copy), hash(path))
+        self.assertFalse(copy.points.flags.writeable)
+
+    def test_transformed(self):
+        path = self.create_path().transformed(Matrix.translate(10, 20))
+        self.assertTrue(np.array_equal(path.points[0], (10, 20)))
+        self.assertEqual(len(path), 4)
+
+    def test_replay(self):
+        ctx = RecordingContext()
+        self.create_path().replay(ctx, Matrix.scale(2))
+        self.assertEqual(ctx.calls, [('move_to', 0, 0), ('line_to', 2, 0), ('curve_to', 2, 2, 4, 2, 4, 4),
+                                     ('close_path',)])
+
+    def test_path_shape(self):
+        ctx = RecordingContext()
+        Path(ctx).of(self.create_path()).with_matrix(Matrix.translate(1, 0)).add()
+        self.assertEqual(ctx.calls[:3], [('new_path',), ('move_to', 1, 0), ('line_to', 2, 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
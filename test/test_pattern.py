@@ -0,0 +1,59 @@
+import unittest
+from generativepy.geometry import LinearGradient, RadialGradient, MeshGradient
+from generativepy.color import Color
+
+
+class TestPattern(unittest.TestCase):
+
+    def test_linear_equal(self):
+        a = LinearGradient().of_points((0, 1), (2, 3)).with_start_end(Color('red'), Color('blue'))
+        b = LinearGradient().of_points((0, 1), (2, 3)).with_start_end(Color('red'), Color('blue'))
+        self.assertEqual(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertEqual(len({a, b}), 1)
+
+    def test_linear_not_equal(self):
+        a = LinearGradient().of_points((0, 1), (2, 3)).with_start_end(Color('red'), Color('blue'))
+        self.assertNotEqual(a, a.of_points((0, 1), (2, 4)))
+        self.assertNotEqual(a, a.with_start_end(Color('red'), Color('green')))
+        self.assertNotEqual(a, a.with_stops(((0, Color('red')), (0.5, Color('blue')))))
+
+    def test_builders_return_new_objects(self):
+        a = LinearGradient()
+        b = a.of_points((0, 1), (2, 3))
+        self.assertIsNot(a, b)
+        self.assertEqual(a.start, (0, 0))
+        self.assertEqual(b.start, (0, 1))
+
+    def test_get_pattern_shared(self):
+        a = LinearGradient().of_points((0, 1), (2, 3)).with_start_end(Color('red'), Color('blue'))
+        b = LinearGradient().of_points((0, 1), (2, 3)).with_start_end(Color('red'), Color('blue'))
+        self.assertIs(a.get_pattern(), b.get_pattern())
+        mutable = a.get_pattern(mutable=True)
+        self.assertIsNot(mutable, a.get_pattern())
+        self.assertIsNot(mutable, a.get_pattern(mutable=True))
+
+    def test_radial(self):
+        a = RadialGradient().of_center_radius((1, 2), 3).with_start_end(Color(0), Color(1))
+        b = RadialGradient().of_circles((1, 2), 0, (1, 2), 3).with_start_end(Color(0), Color(1))
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, LinearGradient().with_start_end(Color(0), Color(1)))
+
+    def test_mesh(self):
+        a = MeshGradient().with_patch(((0, 0), (1, 0), (1, 1)), (Color('red'), Color('green'), Color('blue')))
+        b = MeshGradient().with_patch(((0, 0), (1, 0), (1, 1)), (Color('red'), Color('green'), Color('blue')))
+        self.assertEqual(a, b)
+        self.assertEqual(len(a.patches), 1)
+        c = a.with_patch(((0, 0), (1, 1), (0, 1)), (Color('red'), Color('blue'), Color('green')))
+        self.assertEqual(len(a.patches), 1)
+        self.assertEqual(len(c.patches), 2)
+
+    def test_mesh_invalid(self):
+        with self.assertRaises(ValueError):
+            MeshGradient().with_patch(((0, 0), (1, 0)), (Color('red'), Color('green')))
+        with self.assertRaises(ValueError):
+            MeshGradient().with_patch(((0, 0), (1, 0), (1, 1)), (Color('red'), Color('green')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 import math
+import numpy as np
 
 from generativepy.math import Matrix, Vector, Points
 
@@ -52,17 +53,57 @@ class TestPoints(unittest.TestCase):
 
     def test_str(self):
         p = Points([[1, 2], [3, 4], [5, 6]])
-        self.assertEqual(str(p), "Points(Vector(1, 2), Vector(3, 4), Vector(5, 6))")
+        self.assertEqual(str(p), "Points(Vector(1.0, 2.0), Vector(3.0, 4.0), Vector(5.0, 6.0))")
 
     def test_str(self):
         p = Points([[1, 2], [3, 4], [5, 6]])
-        self.assertEqual(repr(p), "Points(Vector(1, 2), Vector(3, 4), Vector(5, 6))")
+        self.assertEqual(repr(p), "Points(Vector(1.0, 2.0), Vector(3.0, 4.0), Vector(5.0, 6.0))")
+
+    def test_slice(self):
+        p = Points([[1, 2], [3, 4], [5, 6]])
+        self.assertEqual(p[1:], Points([[3, 4], [5, 6]]))
+
+    def test_array(self):
+        p = Points([[1, 2], [3, 4], [5, 6]])
+        self.assertEqual(p.array.shape, (3, 2))
+        self.assertEqual(p.array.dtype, np.float64)
+        self.assertEqual(Points(np.array([[1, 2], [3, 4], [5, 6]])), p)
+        self.assertEqual(Points([Vector(1, 2), Vector(3, 4), Vector(5, 6)]), p)
+        self.assertEqual(len(Points([])), 0)
+        with self.assertRaises(ValueError):
+            Points([[1, 2, 3]])
+
+    def test_scale(self):
+        p = Points([[1, 2], [3, 4]])
+        self.assertEqual(p.scale(2), Points([[2, 4], [6, 8]]))
+        self.assertEqual(p.scale(2, 3), Points([[2, 6], [6, 12]]))
+
+    def test_translate(self):
+        p = Points([[1, 2], [3, 4]])
+        self.assertEqual(p.translate(10, 20), Points([[11, 22], [13, 24]]))
+
+    def test_rotate(self):
+        p = Points([[1, 0], [0, 2]])
+        self.assertEqual(p.rotate(math.pi/2), Points([[0, 1], [-2, 0]]))
+
+    def test_points_property(self):
+        p = Points([(1, 2), (3, 4)])
+        self.assertEqual(p.points, (Vector(1, 2), Vector(3, 4)))
+
+    def test_scale_default(self):
+        p = Points([(1, 2), (3, 4)])
+        self.assertEqual(p.scale(2), Points([(2, 4), (6, 8)]))
 
     def test_regular_flat(self):
         p = Points.regular_polygon(4, (0, 0), 1)
         s = math.sqrt(2)/2
         self.assertEqual(p, Points([(s, s), (-s, s), (-s, -s), (s, -s)]))
 
+    def test_regular_angle(self):
+        p = Points.regular_polygon(4, (1, 2), 1, flat_base=False, angle=math.pi/2)
+        exp = Points([(1, 3), (0, 2), (1, 1), (2, 2)])
+        self.assertEqual(p, exp)
+
     def test_regular_not_flat(self):
         p = Points.regular_polygon(4, (0, 0), 1, flat_base=False)
         exp = Points([(1, 0), (0, 1), (-1, 0), (0, -1)])
@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+
+from generativepy.math import Points, simplify_polyline, decimate_polyline_columns
+
+
+class TestSimplifyPolyline(unittest.TestCase):
+
+    def test_straight_line(self):
+        points = np.column_stack((np.linspace(0, 100, 1000), np.linspace(0, 50, 1000)))
+        self.assertEqual(list(simplify_polyline(points, 0.5)), [0, 999])
+
+    def test_corner(self):
+        points = Points([(0, 0), (1, 0.1), (2, 0), (2, 1), (2, 2)])
+        self.assertEqual(list(simplify_polyline(points, 0.5)), [0, 2, 4])
+        self.assertEqual(list(simplify_polyline(points, 0.01)), [0, 1, 2, 4])
+
+    def test_tolerance(self):
+        x = np.linspace(0, 10, 10000)
+        points = np.column_stack((x, np.sin(x)))
+        kept = simplify_polyline(points, 0.01)
+        self.assertLess(len(kept), 200)
+        # Every original point is within tolerance of the simplified line. The slope of sin is at most 1, so the
+        # vertical error is at most sqrt(2) times the perpendicular error
+        y = np.interp(x, x[kept], points[kept, 1])
+        self.assertLess(np.max(np.abs(y - points[:, 1])), 0.01*np.sqrt(2))
+
+    def test_overshoot(self):
+        self.assertEqual(list(simplify_polyline([(0, 0), (100, 0), (50, 0)], 0.5)), [0, 1, 2])
+        self.assertEqual(list(simplify_polyline([(0, 0), (-10, 0), (50, 0)], 0.5)), [0, 1, 2])
+
+    def segment_distance(self, p, a, b):
+        chord = b - a
+        t = np.clip(np.dot(p - a, chord) / np.dot(chord, chord), 0, 1) if np.dot(chord, chord) else 0
+        return np.hypot(*(p - a - t * chord))
+
+    def test_removed_points_within_tolerance(self):
+        rng = np.random.default_rng(3)
+        # Noisy time series, plus a path that backtracks on itself
+        series = np.column_stack((np.linspace(0, 1000, 20000), np.cumsum(rng.normal(0, 1, 20000))))
+        t = np.linspace(0, 4 * np.pi, 5000)
+        backtrack = np.column_stack((100 * np.cos(t) + rng.normal(0, 0.2, len(t)), rng.normal(0, 0.2, len(t))))
+        for points in (series, backtrack):
+            kept = simplify_polyline(points, 0.5)
+            for start, end in zip(kept[:-1], kept[1:]):
+                for i in range(start + 1, end):
+                    self.assertLessEqual(self.segment_distance(points[i], points[start], points[end]), 0.5)
+
+    def test_short(self):
+        self.assertEqual(list(simplify_polyline([(0, 0), (1, 1)], 1)), [0, 1])
+        self.assertEqual(len(simplify_polyline([], 1)), 0)
+
+
+class TestDecimatePolylineColumns(unittest.TestCase):
+
+    def test_columns(self):
+        points = [(0, 0), (0.2, 5), (0.4, -5), (0.6, 1), (0.8, 2), (1.2, 3), (1.5, 3)]
+        self.assertEqual(list(decimate_polyline_columns(points)), [0, 1, 2, 4, 5, 6])
+
+    def test_extremes_kept(self):
+        rng = np.random.default_rng(2)
+        x = np.linspace(0, 100, 100000)
+        points = np.column_stack((x, rng.normal(0, 1, len(x))))
+        kept = decimate_polyline_columns(points, 1)
+        self.assertLessEqual(len(kept), 4 * 101)
+        columns = np.floor(x).astype(int)
+        for c in (0, 50, 99):
+            in_column = columns == c
+            self.assertIn(np.flatnonzero(in_column)[np.argmax(points[in_column, 1])], kept)
+            self.assertIn(np.flatnonzero(in_column)[np.argmin(points[in_column, 1])], kept)
@@ -0,0 +1,43 @@
+import unittest
+import cairo
+import numpy as np
+from generativepy.drawing import record, replay, make_image_frames
+from generativepy.geometry import Rectangle, Circle
+from generativepy.color import Color
+from generativepy.math import Matrix
+
+
+def draw_background(ctx, pixel_width, pixel_height, frame_no, frame_count):
+    Rectangle(ctx).of_corner_size((0, 0), 50, 50).fill(Color(1, 0, 0))
+
+
+def draw_circle(ctx, pixel_width, pixel_height, frame_no, frame_count):
+    Circle(ctx).of_center_radius((60 + 10*frame_no, 60), 5).fill(Color(0, 0, 1))
+
+
+class TestRecording(unittest.TestCase):
+
+    def test_replay(self):
+        recording = record(draw_background, 100, 100)
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 100)
+        ctx = cairo.Context(surface)
+        replay(ctx, recording, Matrix.translate(50, 50))
+        surface.flush()
+        a = np.frombuffer(surface.get_data(), np.uint8).reshape((100, 100, 4))
+        self.assertEqual(tuple(a[25, 25, :3]), (0, 0, 0))
+        self.assertEqual(tuple(a[75, 75, :3]), (0, 0, 255))
+
+    def test_make_image_frames_background(self):
+        def draw_all(ctx, pixel_width, pixel_height, frame_no, frame_count):
+            draw_background(ctx, pixel_width, pixel_height, frame_no, frame_count)
+            draw_circle(ctx, pixel_width, pixel_height, frame_no, frame_count)
+
+        expected = [f.copy() for f in make_image_frames(draw_all, 100, 100, 3)]
+        frames = [f.copy() for f in make_image_frames(draw_circle, 100, 100, 3, background_draw=draw_background)]
+        self.assertEqual(len(frames), 3)
+        for frame, expected_frame in zip(frames, expected):
+            self.assertTrue(np.array_equal(frame, expected_frame))
+
+
+if __name__ == '__main__':
+    unittest.main()
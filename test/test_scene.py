@@ -0,0 +1,64 @@
+import unittest
+import cairo
+from generativepy.scene import Scene, Node
+from generativepy.geometry import Circle, Rectangle
+from generativepy.color import Color
+
+
+class TestScene(unittest.TestCase):
+
+    def test_render(self):
+        scene = Scene(100, 100, background=Color(1))
+        circle = scene.add(Node(Circle(None).of_center_radius((20, 20), 5), fill=Color(1, 0, 0)))
+        scene.add(Node(Rectangle(None).of_corner_size((40, 40), 20, 20), fill=Color(0, 0, 1)))
+        frame = scene.render()
+        self.assertEqual(frame.shape, (100, 100, 3))
+        self.assertEqual(tuple(frame[20, 20]), (255, 0, 0))
+        self.assertEqual(tuple(frame[50, 50]), (0, 0, 255))
+        self.assertEqual(tuple(frame[80, 80]), (255, 255, 255))
+
+        circle.update(Circle(None).of_center_radius((50, 80), 5))
+        frame = scene.render()
+        self.assertEqual(tuple(frame[20, 20]), (255, 255, 255))
+        self.assertEqual(tuple(frame[80, 50]), (255, 0, 0))
+        self.assertEqual(tuple(frame[50, 50]), (0, 0, 255))
+
+    def test_dirty_region(self):
+        scene = Scene(100, 100, background=Color(1))
+        circle = scene.add(Node(Circle(None).of_center_radius((20, 20), 5), fill=Color(1, 0, 0)))
+        scene.render()
+
+        # Mark an area of the scene surface that is outside the changed region
+        ctx = cairo.Context(scene.surface)
+        ctx.rectangle(80, 0, 20, 20)
+        ctx.set_source_rgb(0, 1, 0)
+        ctx.fill()
+
+        circle.update(fill=Color(0, 0, 1))
+        frame = scene.render()
+        self.assertEqual(tuple(frame[20, 20]), (0, 0, 255))
+        self.assertEqual(tuple(frame[10, 90]), (0, 255, 0))
+
+    def test_remove(self):
+        scene = Scene(100, 100, background=Color(1))
+        circle = scene.add(Node(Circle(None).of_center_radius((20, 20), 5), fill=Color(1, 0, 0)))
+        scene.render()
+        scene.remove(circle)
+        frame = scene.render()
+        self.assertEqual(tuple(frame[20, 20]), (255, 255, 255))
+
+    def test_frames(self):
+        scene = Scene(100, 100)
+        circle = scene.add(Node(Circle(None).of_center_radius((20, 20), 5), fill=Color(1)))
+
+        def update(scene, frame_no, frame_count):
+            circle.update(Circle(None).of_center_radius((20 + 20*frame_no, 20), 5))
+
+        frames = list(scene.frames(update, 3))
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(tuple(frames[2][20, 60]), (255, 255, 255))
+        self.assertEqual(tuple(frames[2][20, 20]), (0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import cairo
+import numpy as np
+from generativepy.geometry import Circles, Rectangles, Lines, RegularPolygons, RegularPolygon
+from generativepy.color import Color
+from generativepy.math import Points
+
+
+class TestShapeBatch(unittest.TestCase):
+
+    def test_circles(self):
+        circles = Circles(None).of_centers_radii([(1, 2), (3, 4), (5, 6)], 2)
+        self.assertEqual(len(circles), 3)
+        self.assertTrue(np.array_equal(circles.radii, [2, 2, 2]))
+        circles = Circles(None).of_centers_radii(Points([(1, 2), (3, 4)]), [1, 2])
+        self.assertTrue(np.array_equal(circles.centers, [(1, 2), (3, 4)]))
+        self.assertTrue(np.array_equal(circles.radii, [1, 2]))
+
+    def test_circles_error(self):
+        with self.assertRaises(ValueError):
+            Circles(None).of_centers_radii([(1, 2), (3, 4)], [1, 2, 3])
+
+    def test_rectangles(self):
+        rects = Rectangles(None).of_rects(np.array([(1, 2, 3, 4), (5, 6, 7, 8)]))
+        self.assertEqual(len(rects), 2)
+        rects = Rectangles(None).of_corners_sizes([(1, 2), (5, 6)], 3, [4, 8])
+        self.assertTrue(np.array_equal(rects.rects, [(1, 2, 3, 4), (5, 6, 3, 8)]))
+
+    def test_regular_polygons(self):
+        polygons = RegularPolygons(None).of_centres_sides_radius([(1, 2), (3, 4)], 5, [1, 2], 0.5)
+        self.assertEqual(polygons.vertices.shape, (2, 5, 2))
+        single = RegularPolygon(None).of_centre_sides_radius((3, 4), 5, 2, 0.5)
+        self.assertTrue(np.allclose(polygons.vertices[1], single.vertex_array))
+
+    def test_hex_grid(self):
+        polygons = RegularPolygons(None).of_hex_grid((0, 0), 3, 4, 1)
+        self.assertEqual(len(polygons), 12)
+        # Neighbouring cells share vertices
+        self.assertTrue(np.allclose(polygons.vertices[0, 0], polygons.vertices[1, 2]))
+        self.assertTrue(np.allclose(polygons.vertices[0, 1], polygons.vertices[4, 3]))
+
+    def test_lines_error(self):
+        with self.assertRaises(ValueError):
+            Lines(None).of_starts_ends([(1, 2), (3, 4)], [(1, 2)])
+
+    def test_color_groups(self):
+        red = Color('red')
+        circles = Circles(None).of_centers_radii([(1, 2), (3, 4), (5, 6), (7, 8)], 1)
+        groups = circles._color_groups([red, Color(0), Color(1, 0, 0), Color(0)])
+        self.assertEqual(len(groups), 2)
+        self.assertIs(groups[0][0], red)
+        self.assertEqual(groups[0][1], [0, 2])
+        self.assertEqual(groups[1][1], [1, 3])
+        with self.assertRaises(ValueError):
+            circles._color_groups([red])
+
+    def test_fill(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 100)
+        ctx = cairo.Context(surface)
+        Circles(ctx).of_centers_radii([(20, 20), (70, 70)], 5).fill(Color(1))
+        Rectangles(ctx).of_rects([(60, 10, 20, 20)]).fill_by_color([Color(0, 0, 1)])
+        surface.flush()
+        data = surface.get_data()
+        stride = surface.get_stride()
+
+        def pixel(x, y):
+            return tuple(data[y*stride + x*4:y*stride + x*4 + 3])
+
+        self.assertEqual(pixel(20, 20), (255, 255, 255))
+        self.assertEqual(pixel(70, 70), (255, 255, 255))
+        self.assertEqual(pixel(45, 45), (0, 0, 0))
+        self.assertEqual(pixel(70, 20), (255, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+
+from generativepy.math import Points, Vector, SpatialIndex
+
+
+class TestSpatialIndex(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.array = rng.uniform(-50, 50, (500, 2))
+
+    def brute_radius(self, point, radius):
+        d = np.hypot(self.array[:, 0] - point[0], self.array[:, 1] - point[1])
+        return np.flatnonzero(d <= radius)
+
+    def test_create(self):
+        index = SpatialIndex(5, Points([(1, 2), (3, 4)]))
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index[1], Vector(3, 4))
+        self.assertEqual(index.points, Points([(1, 2), (3, 4)]))
+        with self.assertRaises(ValueError):
+            SpatialIndex(0)
+
+    def test_insert(self):
+        index = SpatialIndex(5)
+        self.assertEqual(index.insert((1, 2)), 0)
+        self.assertEqual(index.insert((3, 4)), 1)
+        self.assertEqual(list(index.insert_many([(5, 6), (7, 8)])), [2, 3])
+        self.assertEqual(index.points, Points([(1, 2), (3, 4), (5, 6), (7, 8)]))
+        self.assertEqual(list(index.query_radius((4, 5), 2)), [1, 2])
+
+    def test_query_radius(self):
+        index = SpatialIndex(7, self.array)
+        for point, radius in [((0, 0), 10), ((45, -45), 20), ((3.5, 2), 0.5), ((200, 200), 5)]:
+            np.testing.assert_array_equal(index.query_radius(point, radius), self.brute_radius(point, radius))
+
+    def test_query_radius_incremental(self):
+        index = SpatialIndex(3)
+        for p in self.array:
+            index.insert(p)
+        np.testing.assert_array_equal(index.query_radius((10, 10), 12), self.brute_radius((10, 10), 12))
+
+    def test_any_within(self):
+        index = SpatialIndex(5, [(0, 0), (10, 0)])
+        self.assertTrue(index.any_within((3, 4), 5))
+        self.assertFalse(index.any_within((5, 5), 5))
+        self.assertFalse(SpatialIndex(5).any_within((0, 0), 100))
+
+    def test_query_nearest(self):
+        index = SpatialIndex(4, self.array)
+        for point in [(0, 0), (49, 49), (-200, 0)]:
+            d = np.hypot(self.array[:, 0] - point[0], self.array[:, 1] - point[1])
+            np.testing.assert_array_equal(index.query_nearest(point, 5), np.argsort(d)[:5])
+        self.assertEqual(len(index.query_nearest((0, 0), 1000)), 500)
+        self.assertEqual(len(SpatialIndex(4).query_nearest((0, 0), 3)), 0)
+
+    def test_far_queries(self):
+        # The cost depends on the occupied cells, not on the size of the search area
+        array = self.array[:100]
+        index = SpatialIndex(1, array)
+        np.testing.assert_array_equal(index.query_radius((0, 0), 3000), np.arange(100))
+        self.assertTrue(index.any_within((2000, 0), 3000))
+        self.assertFalse(index.any_within((5000, 5000), 100))
+        point = (5000, -4000)
+        d = np.hypot(array[:, 0] - point[0], array[:, 1] - point[1])
+        np.testing.assert_array_equal(index.query_nearest(point, 3), np.argsort(d)[:3])
@@ -0,0 +1,121 @@
+import unittest
+import cairo
+import numpy as np
+from generativepy.geometry import StateTracking, Transform, Circle, Line, Rectangle, FillParameters, LinearGradient
+from generativepy.color import Color
+from generativepy.drawing import setup
+
+
+class CountingContext(cairo.Context):
+
+    def __init__(self, surface):
+        super().__init__()
+        self.source_count = 0
+        self.line_width_count = 0
+
+    def set_source_rgba(self, *args):
+        self.source_count += 1
+        super().set_source_rgba(*args)
+
+    def set_line_width(self, width):
+        self.line_width_count += 1
+        super().set_line_width(width)
+
+
+class TestStateTracking(unittest.TestCase):
+
+    def create_context(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 100)
+        return CountingContext(surface)
+
+    def test_untracked(self):
+        ctx = self.create_context()
+        for i in range(5):
+            Circle(ctx).of_center_radius((50, 50), 10).fill(Color('red'))
+        self.assertEqual(ctx.source_count, 5)
+
+    def test_tracked(self):
+        ctx = self.create_context()
+        with StateTracking(ctx):
+            for i in range(5):
+                Circle(ctx).of_center_radius((50, 50), 10).fill(Color('red'))
+                Line(ctx).of_start_end((0, 0), (50, 50)).stroke(Color('red'), line_width=2)
+            Circle(ctx).of_center_radius((50, 50), 10).fill(Color('blue'))
+        self.assertEqual(ctx.source_count, 2)
+        self.assertEqual(ctx.line_width_count, 1)
+
+        # Tracking ends at the end of the with block
+        FillParameters(Color('blue')).apply(ctx)
+        self.assertEqual(ctx.source_count, 3)
+
+    def test_tracked_transform(self):
+        ctx = self.create_context()
+        with StateTracking(ctx):
+            FillParameters(Color('red')).apply(ctx)
+            with Transform(ctx):
+                FillParameters(Color('red')).apply(ctx)
+                self.assertEqual(ctx.source_count, 1)
+                FillParameters(Color('blue')).apply(ctx)
+                self.assertEqual(ctx.source_count, 2)
+            # The restore reverts the source to red
+            self.assertEqual(ctx.get_source().get_rgba(), (1.0, 0.0, 0.0, 1.0))
+            FillParameters(Color('red')).apply(ctx)
+            self.assertEqual(ctx.source_count, 2)
+            FillParameters(Color('blue')).apply(ctx)
+            self.assertEqual(ctx.source_count, 3)
+
+    def test_nested(self):
+        ctx = self.create_context()
+        with StateTracking(ctx):
+            FillParameters(Color('red')).apply(ctx)
+            with StateTracking(ctx):
+                FillParameters(Color('blue')).apply(ctx)
+            FillParameters(Color('red')).apply(ctx)
+            self.assertEqual(ctx.source_count, 3)
+            self.assertEqual(ctx.get_source().get_rgba(), (1.0, 0.0, 0.0, 1.0))
+
+    def test_not_entered(self):
+        ctx = self.create_context()
+        with StateTracking(ctx):
+            FillParameters(Color('red')).apply(ctx)
+            StateTracking(ctx)
+            FillParameters(Color('red')).apply(ctx)
+            self.assertEqual(ctx.source_count, 1)
+
+    def test_setup_background(self):
+        ctx = self.create_context()
+        with StateTracking(ctx):
+            FillParameters(Color('red')).apply(ctx)
+            setup(ctx, 100, 100, background=Color('blue'))
+            FillParameters(Color('red')).apply(ctx)
+            self.assertEqual(ctx.get_source().get_rgba(), (1.0, 0.0, 0.0, 1.0))
+
+    def test_tracked_gradient_transform(self):
+        # A gradient is fixed to the user space that is current when it is set, so it must be set again after a
+        # transform even though it is unchanged
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 10)
+        ctx = cairo.Context(surface)
+        gradient = LinearGradient().of_points((0, 0), (10, 0)).with_start_end(Color(0), Color(1))
+        with StateTracking(ctx):
+            Rectangle(ctx).of_corner_size((0, 0), 10, 10).fill(gradient)
+            with Transform(ctx) as t:
+                t.translate(50, 0)
+                Rectangle(ctx).of_corner_size((0, 0), 10, 10).fill(gradient)
+        surface.flush()
+        a = np.frombuffer(surface.get_data(), np.uint8).reshape((10, 100, 4))
+        self.assertLess(a[5, 1, 1], 64)
+        self.assertLess(a[5, 51, 1], 64)
+        self.assertGreater(a[5, 58, 1], 192)
+
+    def test_invalidate(self):
+        ctx = self.create_context()
+        with StateTracking(ctx) as tracking:
+            FillParameters(Color('red')).apply(ctx)
+            ctx.set_source_rgba(0, 0, 1)
+            tracking.invalidate()
+            FillParameters(Color('red')).apply(ctx)
+            self.assertEqual(ctx.get_source().get_rgba(), (1.0, 0.0, 0.0, 1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
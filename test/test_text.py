@@ -1,5 +1,6 @@
 import unittest
 import cairo
+from generativepy import geometry
 from generativepy.geometry import Text
 
 
@@ -24,6 +25,70 @@ class TestText(unittest.TestCase):
         width, height = Text(ctx).of('abc', (0, 0)).get_size()
         self.assertAlmostEqual(width, 17)
         self.assertAlmostEqual(height, 7)
+    # Test text extents cache
+    def test_text_extents_cache(self):
+        geometry.clear_text_caches()
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 200)
+        ctx = cairo.Context(surface)
+        metrics = Text(ctx).of('abc', (0, 0)).get_metrics()
+        self.assertEqual(len(geometry._text_extents_cache), 1)
+        self.assertEqual(Text(ctx).of('abc', (0, 0)).get_metrics(), metrics)
+        self.assertEqual(len(geometry._text_extents_cache), 1)
+        width, height = Text(ctx).of('abc', (0, 0)).size(20).get_size()
+        self.assertEqual(len(geometry._text_extents_cache), 2)
+        self.assertGreater(width, metrics[2])
+        ctx.scale(2, 2)
+        self.assertAlmostEqual(Text(ctx).of('abc', (0, 0)).get_metrics()[2], metrics[2], delta=1)
+        self.assertEqual(len(geometry._text_extents_cache), 3)
+
+    # Test text extents cache depends on font options, and always selects the font
+    def test_text_extents_cache_font_options(self):
+        geometry.clear_text_caches()
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 200)
+        Text(cairo.Context(surface)).of('abc', (0, 0)).get_metrics()
+        ctx = cairo.Context(surface)
+        Text(ctx).of('abc', (0, 0)).get_metrics()
+        self.assertEqual(len(geometry._text_extents_cache), 1)
+        self.assertEqual(ctx.get_font_face().get_family(), 'Arial')
+        options = cairo.FontOptions()
+        options.set_hint_metrics(cairo.HINT_METRICS_OFF)
+        ctx.set_font_options(options)
+        Text(ctx).of('abc', (0, 0)).get_metrics()
+        self.assertEqual(len(geometry._text_extents_cache), 2)
+        Text(cairo.Context(cairo.SVGSurface(None, 100, 200))).of('abc', (0, 0)).get_metrics()
+        self.assertEqual(len(geometry._text_extents_cache), 3)
+
+    # Test text path cache
+    def test_text_path_cache(self):
+        geometry.clear_text_caches()
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 200)
+        ctx = cairo.Context(surface)
+        geometry.FontParameters().apply(ctx)
+        ctx.move_to(10, 20)
+        ctx.text_path('abc')
+        expected = ctx.path_extents()
+        ctx.new_path()
+        Text(ctx).of('abc', (0, 0)).add()
+        self.assertEqual(len(geometry._text_path_cache), 1)
+        Text(ctx).of('abc', (10, 20)).add()
+        self.assertEqual(len(geometry._text_path_cache), 1)
+        for a, b in zip(ctx.path_extents(), expected):
+            self.assertAlmostEqual(a, b)
+
+    # Test text path cache depends on font options
+    def test_text_path_cache_font_options(self):
+        geometry.clear_text_caches()
+        ctx = cairo.Context(cairo.SVGSurface(None, 100, 200))
+        geometry.FontParameters().apply(ctx)
+        ctx.move_to(10, 20)
+        ctx.text_path('abc')
+        expected = ctx.path_extents()
+        ctx.new_path()
+        Text(cairo.Context(cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 200))).of('abc', (10, 20)).add()
+        Text(ctx).of('abc', (10, 20)).add()
+        self.assertEqual(len(geometry._text_path_cache), 2)
+        for a, b in zip(ctx.path_extents(), expected):
+            self.assertAlmostEqual(a, b)
 
 if __name__ == '__main__':
     unittest.main()
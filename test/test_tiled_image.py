@@ -0,0 +1,74 @@
+import io
+import unittest
+import zlib
+import numpy as np
+from PIL import Image
+from generativepy.drawing import (make_image, make_tiled_image, setup, _PngWriter, _compress_rows, _adler32_combine,
+                                  _unpremultiply)
+from generativepy.geometry import Circle, Rectangle
+from generativepy.color import Color
+from generativepy.utils import temp_file
+
+
+def draw(ctx, pixel_width, pixel_height, frame_no, frame_count):
+    # Drawing functions for make_tiled_image must be top level functions
+    setup(ctx, pixel_width, pixel_height, width=10)
+    Rectangle(ctx).of_corner_size((1, 1), 8, 2).fill(Color(0.2, 0.4, 0.6, 0.5))
+    Circle(ctx).of_center_radius((5, 5), 3.3).fill(Color('orange')).stroke(Color(0, 0, 1, 0.7), 0.3)
+
+
+class TestTiledImage(unittest.TestCase):
+
+    def write_png(self, a, tile_height):
+        f = io.BytesIO()
+        writer = _PngWriter(f, a.shape[1], a.shape[0], a.shape[2])
+        for y in range(0, a.shape[0], tile_height):
+            writer.write(_compress_rows(a[y:y + tile_height]))
+        writer.close()
+        f.seek(0)
+        return f
+
+    def check_make_tiled_image(self, channels):
+        expected = temp_file('tiled-expected-{}.png'.format(channels))
+        actual = temp_file('tiled-actual-{}.png'.format(channels))
+        make_image(expected, draw, 40, 30, channels)
+        # The tile height doesn't divide the image height, so the last tile is shorter
+        make_tiled_image(actual, draw, 40, 30, channels, tile_height=7, processes=1)
+        expected_image = Image.open(expected)
+        actual_image = Image.open(actual)
+        self.assertEqual(actual_image.mode, expected_image.mode)
+        self.assertTrue(np.array_equal(np.asarray(actual_image), np.asarray(expected_image)))
+
+    def test_make_tiled_image_rgb(self):
+        self.check_make_tiled_image(3)
+
+    def test_make_tiled_image_rgba(self):
+        self.check_make_tiled_image(4)
+
+    def test_adler32_combine(self):
+        a = b'generative'
+        b = b'art' * 30000
+        self.assertEqual(_adler32_combine(zlib.adler32(a), zlib.adler32(b), len(b)), zlib.adler32(a + b))
+
+    def test_png_rgb(self):
+        a = np.random.default_rng(1).integers(0, 256, (37, 23, 3), dtype=np.uint8)
+        image = Image.open(self.write_png(a, 8))
+        image.load()
+        self.assertEqual(image.mode, 'RGB')
+        self.assertTrue(np.array_equal(np.asarray(image), a))
+
+    def test_png_rgba(self):
+        a = np.random.default_rng(2).integers(0, 256, (10, 30, 4), dtype=np.uint8)
+        image = Image.open(self.write_png(a, 3))
+        image.load()
+        self.assertEqual(image.mode, 'RGBA')
+        self.assertTrue(np.array_equal(np.asarray(image), a))
+
+    def test_unpremultiply(self):
+        a = np.array([[[64, 32, 0, 128], [10, 20, 30, 0], [255, 255, 255, 255]]], dtype=np.uint8)
+        _unpremultiply(a)
+        self.assertEqual(a.tolist(), [[[128, 64, 0, 128], [10, 20, 30, 0], [255, 255, 255, 255]]])
+
+
+if __name__ == '__main__':
+    unittest.main()
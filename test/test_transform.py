@@ -1,6 +1,7 @@
 import unittest
 import cairo
 from generativepy.geometry import Transform
+from generativepy.math import Matrix, Vector
 
 
 class TestTransform(unittest.TestCase):
@@ -68,6 +69,14 @@ class TestTransform(unittest.TestCase):
                     # a generativepy.math.Matrix.
                     self.assertEqual([10.0, 0.0, 0.0, 20.0, 51.0, 122.0], list(ctx.get_matrix()))
 
+    def test_matrix_to_cairo(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 200)
+        ctx = cairo.Context(surface)
+        m = Matrix.translate(3, 4) * Matrix.rotate(0.5) * Matrix(1, 0.5, 0, 0, 1, 0)
+        ctx.transform(m.to_cairo())
+        self.assertEqual(Vector(ctx.user_to_device(10, 20)), m * Vector(10, 20))
+        self.assertEqual(Matrix.of_cairo(ctx.get_matrix()), m)
+
 
 if __name__ == '__main__':
     unittest.main()
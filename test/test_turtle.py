@@ -0,0 +1,71 @@
+import math
+import unittest
+import cairo
+import numpy as np
+from generativepy.geometry import Turtle, Transform, _turtle_segments
+from generativepy.color import Color
+
+
+class TestTurtle(unittest.TestCase):
+
+    def create_context(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 100, 100)
+        return cairo.Context(surface)
+
+    def test_segments(self):
+        segments, x, y, heading = _turtle_segments('F+F', 0, 0, 0, 1, math.pi/2)
+        self.assertTrue(np.allclose(segments, [(0, 0, 1, 0), (1, 0, 1, -1)]))
+        self.assertAlmostEqual(x, 1)
+        self.assertAlmostEqual(y, -1)
+        self.assertAlmostEqual(heading, -math.pi/2)
+
+    def test_segments_push_pop(self):
+        segments, x, y, heading = _turtle_segments('F[-F]fXF', 0, 0, 0, 1, math.pi/2)
+        self.assertTrue(np.allclose(segments, [(0, 0, 1, 0), (1, 0, 1, 1), (2, 0, 3, 0)]))
+        self.assertAlmostEqual(x, 3)
+        self.assertAlmostEqual(y, 0)
+        self.assertAlmostEqual(heading, 0)
+
+    def test_segments_error(self):
+        with self.assertRaises(ValueError):
+            _turtle_segments('F]', 0, 0, 0, 1, 1)
+
+    def test_buffered(self):
+        ctx = self.create_context()
+        with Turtle(ctx).set_buffered() as turtle:
+            turtle.move_to(10, 10).forward(20).right(1).forward(20)
+            self.assertEqual(len(turtle.buffer), 2)
+            turtle.push().set_style(Color(1, 0, 0), line_width=2).forward(10)
+            self.assertEqual(len(turtle.buffer), 1)
+            turtle.pop().forward(10)
+            self.assertEqual(len(turtle.buffer), 1)
+        self.assertEqual(len(turtle.buffer), 0)
+
+    def draw_transformed(self, buffered):
+        ctx = self.create_context()
+        ctx.set_source_rgb(1, 1, 1)
+        ctx.paint()
+        turtle = Turtle(ctx).set_buffered(buffered).move_to(10, 10)
+        with Transform(ctx).translate(0, 40):
+            turtle.forward(30)
+        turtle.forward(30)
+        if buffered:
+            self.assertEqual(len(turtle.buffer), 1)
+        turtle.flush()
+        ctx.get_target().flush()
+        return np.frombuffer(ctx.get_target().get_data(), np.uint8)
+
+    def test_buffered_transform(self):
+        # Lines buffered inside a Transform must not move when the transform ends before they are drawn
+        self.assertTrue(np.array_equal(self.draw_transformed(True), self.draw_transformed(False)))
+
+    def test_execute(self):
+        ctx = self.create_context()
+        turtle = Turtle(ctx).move_to(10, 50)
+        turtle.execute('F[+F]F', 20, math.pi/4)
+        self.assertAlmostEqual(turtle.x, 50)
+        self.assertAlmostEqual(turtle.y, 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
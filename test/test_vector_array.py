@@ -0,0 +1,104 @@
+import unittest
+import math
+import numpy as np
+
+from generativepy.math import Vector, Vector3, Matrix, Points, VectorArray, Vector3Array
+
+
+class TestVectorArray(unittest.TestCase):
+
+    def test_create(self):
+        a = VectorArray([(1, 2), (3, 4)])
+        self.assertEqual(len(a), 2)
+        self.assertEqual(a[0], Vector(1, 2))
+        self.assertEqual(a[-1], Vector(3, 4))
+        self.assertEqual(list(a), [Vector(1, 2), Vector(3, 4)])
+        self.assertEqual(VectorArray(np.array([[1, 2], [3, 4]])), a)
+        self.assertEqual(VectorArray([Vector(1, 2), Vector(3, 4)]), a)
+        with self.assertRaises(ValueError):
+            VectorArray([(1, 2, 3)])
+
+    def test_points(self):
+        a = VectorArray([(1, 2), (3, 4)])
+        self.assertEqual(Points(a), Points([(1, 2), (3, 4)]))
+        self.assertEqual(VectorArray(Points([(1, 2), (3, 4)])), a)
+
+    def test_polar(self):
+        a = VectorArray.polar([2, 3], [math.radians(30), -math.radians(45)])
+        self.assertEqual(a[0], Vector.polar(2, math.radians(30)))
+        self.assertEqual(a[1], Vector.polar(3, -math.radians(45)))
+
+    def test_properties(self):
+        a = VectorArray([(3, 4), (0, 2)])
+        np.testing.assert_allclose(a.x, [3, 0])
+        np.testing.assert_allclose(a.y, [4, 2])
+        np.testing.assert_allclose(a.length, [5, 2])
+        np.testing.assert_allclose(a.angle, [math.atan2(4, 3), math.pi/2])
+        self.assertEqual(a.unit, VectorArray([(0.6, 0.8), (0, 1)]))
+
+    def test_lerp(self):
+        a = VectorArray([(0, 0), (2, 2)])
+        b = VectorArray([(10, 20), (4, 6)])
+        self.assertEqual(a.lerp(b, 0.5), VectorArray([(5, 10), (3, 4)]))
+        self.assertEqual(a.lerp(b, [0, 1]), VectorArray([(0, 0), (4, 6)]))
+        self.assertEqual(a.lerp(Vector(2, 4), 0.5), VectorArray([(1, 2), (2, 3)]))
+
+    def test_arithmetic(self):
+        a = VectorArray([(1, 2), (3, 4)])
+        b = VectorArray([(10, 20), (30, 40)])
+        self.assertEqual(a + b, VectorArray([(11, 22), (33, 44)]))
+        self.assertEqual(b - a, VectorArray([(9, 18), (27, 36)]))
+        self.assertEqual(-a, VectorArray([(-1, -2), (-3, -4)]))
+        self.assertEqual(a + Vector(1, 1), VectorArray([(2, 3), (4, 5)]))
+        self.assertEqual(Vector(1, 1) - a, VectorArray([(0, -1), (-2, -3)]))
+        self.assertEqual(a * 2, VectorArray([(2, 4), (6, 8)]))
+        self.assertEqual(2 * a, VectorArray([(2, 4), (6, 8)]))
+        self.assertEqual(a * np.array([2, 3]), VectorArray([(2, 4), (9, 12)]))
+        self.assertEqual(b / 10, VectorArray([(1, 2), (3, 4)]))
+        self.assertEqual(b // 7, VectorArray([(1, 2), (4, 5)]))
+        # NumPy scalars, as produced by vectorised code
+        self.assertEqual(a * np.int64(2), VectorArray([(2, 4), (6, 8)]))
+        self.assertEqual(np.float64(2) * a, VectorArray([(2, 4), (6, 8)]))
+        self.assertEqual(b / np.float64(10), VectorArray([(1, 2), (3, 4)]))
+        self.assertEqual(b // np.int64(7), VectorArray([(1, 2), (4, 5)]))
+
+    def test_dot(self):
+        a = VectorArray([(1, 2), (3, 4)])
+        b = VectorArray([(10, 20), (30, 40)])
+        np.testing.assert_allclose(a * b, [50, 250])
+        np.testing.assert_allclose(a.dot(Vector(1, 1)), [3, 7])
+        np.testing.assert_allclose(Vector(1, 1) * a, [3, 7])
+
+    def test_transform(self):
+        m = Matrix(1, 2, 3, 4, 5, 6)
+        a = VectorArray([(1, 2), (3, 4), (5, 6)])
+        self.assertEqual(m * a, VectorArray([(8, 20), (14, 38), (20, 56)]))
+        self.assertEqual(a.translate(1, 2), VectorArray([(2, 4), (4, 6), (6, 8)]))
+        self.assertEqual(VectorArray([(1, 0)]).rotate(math.pi/2), VectorArray([(0, 1)]))
+
+    def test_str(self):
+        a = VectorArray([(1, 2)])
+        self.assertEqual(str(a), "VectorArray(Vector(1.0, 2.0))")
+
+
+class TestVector3Array(unittest.TestCase):
+
+    def test_create(self):
+        a = Vector3Array([(1, 2, 3), (4, 5, 6)])
+        self.assertEqual(len(a), 2)
+        self.assertEqual(a[1], Vector3(4, 5, 6))
+        np.testing.assert_allclose(a.z, [3, 6])
+        with self.assertRaises(ValueError):
+            Vector3Array([(1, 2)])
+
+    def test_lerp(self):
+        a = Vector3Array([(0, 0, 0), (2, 2, 2)])
+        b = Vector3Array([(10, 20, 30), (4, 6, 8)])
+        self.assertEqual(a.lerp(b, [0.5, 1]), Vector3Array([(5, 10, 15), (4, 6, 8)]))
+
+    def test_arithmetic(self):
+        a = Vector3Array([(1, 2, 3), (4, 5, 6)])
+        self.assertEqual(a + Vector3(1, 1, 1), Vector3Array([(2, 3, 4), (5, 6, 7)]))
+        self.assertEqual(a * 2, Vector3Array([(2, 4, 6), (8, 10, 12)]))
+        np.testing.assert_allclose(a * a, [14, 77])
+        np.testing.assert_allclose(Vector3Array([(2, 3, 6)]).length, [7])